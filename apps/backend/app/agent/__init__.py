@@ -4,6 +4,32 @@
 # * Else we fallback to a local Ollama model.
 # * If neither is available, we raise -> ProviderError.
 
-from .manager import AgentManager, EmbeddingManager
+from .admission import Priority, admission_stats, get_admission_controller, request_priority
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .hedging import provider_target_stats
+from .metrics import MetricsRegistry, agent_metrics, get_metrics_registry
+from .response_cache import ResponseCache, get_response_cache
+from .manager import AgentManager, EmbeddingManager, warm_up_providers
+from .registry import ProviderRegistry, get_provider_registry
+from .structured_output import structured_output_stats
 
-__all__ = ["AgentManager", "EmbeddingManager"]
+__all__ = [
+    "AgentManager",
+    "EmbeddingManager",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "ResponseCache",
+    "get_response_cache",
+    "ProviderRegistry",
+    "get_provider_registry",
+    "warm_up_providers",
+    "Priority",
+    "request_priority",
+    "get_admission_controller",
+    "admission_stats",
+    "structured_output_stats",
+    "provider_target_stats",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "agent_metrics",
+]
@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from typing import AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from ..core import settings
+from .exceptions import ProviderOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission class of a provider call; lower values are served first"""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("provider_priority", default=Priority.NORMAL)
+_deadline: ContextVar[Optional[float]] = ContextVar("provider_deadline", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority, timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Run the enclosed provider calls (including tasks and threadpool work
+    started inside the block) at ``priority``. ``timeout`` sets a deadline,
+    in seconds from now, for getting a provider slot; nested blocks can only
+    shorten an enclosing deadline.
+    """
+    priority_token = _priority.set(priority)
+    deadline_token = None
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        current = _deadline.get()
+        deadline_token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        if deadline_token is not None:
+            _deadline.reset(deadline_token)
+        _priority.reset(priority_token)
+
+
+def current_admission() -> Tuple[Priority, Optional[float]]:
+    """Priority and deadline that apply to provider calls made here"""
+    return _priority.get(), _deadline.get()
+
+
+@dataclass
+class AdmissionStats:
+    name: str
+    limit: int
+    in_flight: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    expired: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        return round(self.wait_seconds * 1000 / self.admitted, 2) if self.admitted else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "mean_wait_ms": self.mean_wait_ms}
+
+
+class AdmissionController:
+    """
+    Concurrency limit and bounded priority queue in front of one provider
+    endpoint.
+
+    At most ``limit`` calls run at once (0 disables the limit). Further calls
+    wait in a heap ordered by (priority, arrival), so interactive calls
+    overtake queued bulk work but calls of one class stay FIFO. A call is
+    rejected with ProviderOverloadedError when its deadline passes before a
+    slot frees up, or when ``max_queue`` calls are already waiting; a full
+    queue first makes room by rejecting its newest lower-priority waiter.
+    A released slot is handed straight to the next waiter, so late arrivals
+    cannot jump the queue.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self._in_flight = 0
+        self._queued = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats = AdmissionStats(name=name, limit=limit)
+
+    async def acquire(self, priority: Optional[Priority] = None, deadline: Optional[float] = None) -> None:
+        priority = _priority.get() if priority is None else priority
+        deadline = _deadline.get() if deadline is None else deadline
+        if deadline is None:
+            deadline = time.monotonic() + settings.PROVIDER_QUEUE_TIMEOUT
+
+        if self.limit <= 0 or (self._in_flight < self.limit and not self._queued):
+            self._in_flight += 1
+            self._record_admission(0.0)
+            return
+        if self._queued >= self.max_queue and not self._evict_below(priority):
+            self._stats.rejected += 1
+            raise ProviderOverloadedError(f"{self.name}: {self._queued} calls already queued")
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            self._stats.expired += 1
+            raise ProviderOverloadedError(f"{self.name}: deadline passed before the call was queued")
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self._queued += 1
+        self._stats.max_queued = max(self._stats.max_queued, self._queued)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # The slot was handed over just as this call gave up on it
+                self._release()
+            if isinstance(e, ProviderOverloadedError):
+                self._stats.rejected += 1
+            elif isinstance(e, asyncio.TimeoutError):
+                self._stats.expired += 1
+                raise ProviderOverloadedError(
+                    f"{self.name}: no slot within {timeout:.1f}s ({priority.name.lower()} priority)"
+                ) from None
+            raise
+        finally:
+            self._queued -= 1
+        self._record_admission(time.monotonic() - started)
+
+    def _evict_below(self, priority: Priority) -> bool:
+        """Reject the newest waiter of the lowest class below ``priority``"""
+        waiting = [entry for entry in self._waiters if not entry[2].done()]
+        if not waiting:
+            return False
+        victim = max(waiting, key=lambda entry: entry[:2])
+        if victim[0] <= priority:
+            return False
+        victim[2].set_exception(
+            ProviderOverloadedError(f"{self.name}: queue full, displaced by a higher-priority call")
+        )
+        return True
+
+    def _record_admission(self, waited: float) -> None:
+        self._stats.admitted += 1
+        self._stats.wait_seconds += waited
+        self._stats.max_wait_seconds = max(self._stats.max_wait_seconds, waited)
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def release(self) -> None:
+        if self.limit <= 0:
+            self._in_flight -= 1
+            return
+        self._release()
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold one of the provider's slots for the duration of the block"""
+        await self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            **{
+                **asdict(self._stats),
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+            }
+        )
+
+
+_controllers: Dict[Tuple[Hashable, ...], AdmissionController] = {}
+
+
+def get_admission_controller(provider: Optional[str], endpoint: Optional[str] = None) -> AdmissionController:
+    """
+    Admission controller shared by every LLM and embedding call to one
+    provider endpoint, so that e.g. generation and embeddings against the
+    same Ollama server count against one limit.
+    """
+    key = (provider, endpoint)
+    controller = _controllers.get(key)
+    if controller is None:
+        limit = settings.PROVIDER_CONCURRENCY_LIMITS.get(provider or "", settings.PROVIDER_MAX_CONCURRENCY)
+        name = f"{provider}@{endpoint}" if endpoint else str(provider)
+        controller = _controllers[key] = AdmissionController(name, limit, settings.PROVIDER_MAX_QUEUE)
+        logger.info(f"Provider admission for {name}: {limit or 'unlimited'} concurrent calls")
+    return controller
+
+
+def admission_stats() -> List[AdmissionStats]:
+    return [controller.stats() for controller in _controllers.values()]
@@ -0,0 +1,108 @@
+import asyncio
+import weakref
+from typing import Dict, List, Optional, Set
+
+from ..core import settings
+from .admission import AdmissionController, Priority, current_admission
+from .exceptions import ProviderError
+from .providers.base import EmbeddingProvider
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests for one provider into shared
+    provider batches.
+
+    Texts submitted by any coroutine are held for up to ``window`` seconds
+    after the first one arrives, or until ``max_items`` distinct texts are
+    waiting, and then sent as one ``embed_batch`` call; each caller's future
+    gets its own vectors back. Identical texts from different callers in the
+    same window are embedded once. A batch runs under one admission slot at
+    the most urgent priority and earliest deadline of the requests in it.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        admission: AdmissionController,
+        window: float,
+        max_items: int,
+    ) -> None:
+        self._provider = provider
+        self._admission = admission
+        self._window = window
+        self._max_items = max(1, min(max_items or provider.max_batch_size, provider.max_batch_size))
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._priority = Priority.BULK
+        self._deadline: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        priority, deadline = current_admission()
+        futures: List[asyncio.Future] = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.setdefault(text, []).append(future)
+            futures.append(future)
+            self._priority = min(self._priority, priority)
+            if deadline is not None:
+                self._deadline = deadline if self._deadline is None else min(self._deadline, deadline)
+            if len(self._pending) >= self._max_items:
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, priority, deadline = self._pending, self._priority, self._deadline
+        self._pending, self._priority, self._deadline = {}, Priority.BULK, None
+        task = asyncio.get_running_loop().create_task(self._run(batch, priority, deadline))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[str, List[asyncio.Future]], priority: Priority, deadline: Optional[float]) -> None:
+        texts = list(batch)
+        try:
+            async with self._admission.slot(priority, deadline):
+                vectors = await self._provider.embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise ProviderError(f"Provider returned {len(vectors)} embeddings for {len(texts)} texts")
+        except BaseException as e:
+            for waiters in batch.values():
+                for future in waiters:
+                    if future.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for text, vector in zip(texts, vectors):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(vector)
+
+
+_batchers: "weakref.WeakKeyDictionary[EmbeddingProvider, EmbeddingBatcher]" = weakref.WeakKeyDictionary()
+
+
+def get_embedding_batcher(provider: EmbeddingProvider, admission: AdmissionController) -> EmbeddingBatcher:
+    """Batcher shared by every EmbeddingManager using ``provider``"""
+    batcher = _batchers.get(provider)
+    if batcher is None:
+        batcher = _batchers[provider] = EmbeddingBatcher(
+            provider,
+            admission,
+            window=settings.EMBEDDING_BATCH_WINDOW_MS / 1000,
+            max_items=settings.EMBEDDING_BATCH_MAX_ITEMS,
+        )
+    return batcher
@@ -0,0 +1,100 @@
+"""
+Chunking and pooling for long-document embeddings
+
+Texts over the token budget are split at Markdown headings first, so
+that each resume section becomes its own chunk and editing one section
+leaves the others' text (and cache keys) unchanged. Sections over the
+budget are split at paragraphs, then lines, then words. Chunk embeddings
+are pooled back into one vector; texts within the budget are embedded
+whole.
+"""
+import re
+from typing import List, Sequence
+
+import numpy as np
+
+POOLING_MODES = ("mean", "weighted")
+
+# Rough size of a token in English text; used to turn token budgets into
+# character budgets without loading the model's tokenizer
+CHARS_PER_TOKEN = 4
+
+_HEADING = re.compile(r"^ {0,3}#{1,6}\s", re.MULTILINE)
+_SEPARATORS = (
+    (re.compile(r"\n\s*\n"), "\n\n"),
+    (re.compile(r"\n"), "\n"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def split_sections(text: str) -> List[str]:
+    """Split Markdown at headings; each section keeps its heading line"""
+    starts = [match.start() for match in _HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = zip(starts, starts[1:] + [len(text)])
+    return [section for section in (text[start:end].strip() for start, end in bounds) if section]
+
+
+def _split(text: str, max_chars: int, level: int = 0) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    if level == len(_SEPARATORS):
+        return [text[start:start + max_chars] for start in range(0, len(text), max_chars)]
+
+    pattern, joiner = _SEPARATORS[level]
+    chunks: List[str] = []
+    current = ""
+    for unit in filter(None, (unit.strip() for unit in pattern.split(text))):
+        if len(unit) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split(unit, max_chars, level + 1))
+            continue
+        candidate = f"{current}{joiner}{unit}" if current else unit
+        if len(candidate) > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split ``text`` into chunks of at most about ``max_tokens`` tokens,
+    one or more per Markdown section. Text within the budget is returned
+    whole, so it gets the same embedding as before chunking existed.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    max_chars = max(1, max_tokens) * CHARS_PER_TOKEN
+    return [chunk for section in split_sections(text) for chunk in _split(section, max_chars)]
+
+
+def pool_embeddings(vectors: Sequence[Sequence[float]], weights: Sequence[float], pooling: str) -> List[float]:
+    """
+    Pool chunk embeddings into one L2-normalised vector
+
+    ``mean`` weighs every chunk equally; ``weighted`` weighs each by
+    ``weights`` (chunk length in tokens), so a one-line section does not
+    count as much as a page of experience.
+    """
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unsupported pooling {pooling!r}, expected one of {', '.join(POOLING_MODES)}")
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    if pooling == "weighted":
+        pooled = np.average(matrix, axis=0, weights=np.asarray(weights, dtype=np.float32))
+    else:
+        pooled = matrix.mean(axis=0)
+    norm = float(np.linalg.norm(pooled))
+    return (pooled / norm if norm > 0 else pooled).tolist()
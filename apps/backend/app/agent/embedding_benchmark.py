@@ -0,0 +1,59 @@
+"""
+Measure embedding throughput of the configured provider
+
+Sends batches of 1 to 256 resume-like texts straight to the provider,
+bypassing the embedding cache, and prints texts per second per batch size:
+
+    python -m app.agent.embedding_benchmark [--texts 256]
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List, Sequence
+
+from app.agent import EmbeddingManager
+from app.core import settings
+
+BATCH_SIZES = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+_WORDS = (
+    "python java kubernetes docker aws azure sql postgresql react typescript "
+    "led designed built migrated improved reduced latency team customers data "
+    "pipeline services platform analytics reporting stakeholders delivered "
+    "machine learning models training deployment monitoring testing agile"
+).split()
+
+
+def sample_texts(count: int, seed: int = 0) -> List[str]:
+    """Deterministic resume-like sentences of 8-40 words"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_WORDS, k=rng.randint(8, 40))) for _ in range(count)]
+
+
+async def measure_throughput(
+    texts: Sequence[str], batch_sizes: Sequence[int] = BATCH_SIZES
+) -> Dict[int, float]:
+    """Texts per second of ``embed_batch`` for each batch size"""
+    provider = await EmbeddingManager()._get_embedding_provider()
+    await provider.embed_batch(list(texts[:1]))  # warm-up
+    results: Dict[int, float] = {}
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        for start in range(0, len(texts), batch_size):
+            await provider.embed_batch(list(texts[start:start + batch_size]))
+        results[batch_size] = len(texts) / (time.perf_counter() - started)
+    return results
+
+
+async def main(count: int) -> None:
+    print(f"{settings.EMBEDDING_PROVIDER}/{settings.EMBEDDING_MODEL}, {count} texts per batch size")
+    print(f"{'batch':>6} {'texts/s':>10}")
+    for batch_size, rate in (await measure_throughput(sample_texts(count))).items():
+        print(f"{batch_size:>6} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=256, help="Texts embedded per batch size")
+    asyncio.run(main(parser.parse_args().texts))
@@ -0,0 +1,266 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core import settings
+from .quantization import check_dtype, decode_vector, encode_vector
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost on top of the vector itself
+_ENTRY_OVERHEAD_BYTES = 96
+# Keys per SELECT ... IN (...), well below SQLite's bound-parameter limit
+_SQL_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    UNIQUE (provider, model)
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    model_id INTEGER NOT NULL REFERENCES models(id),
+    key BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model_id, key)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC with collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()[:16]
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+    memory_entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by (provider, model, normalized text).
+
+    An in-memory LRU bounded by ``max_memory_bytes`` sits in front of a
+    SQLite table of vector blobs, both holding vectors encoded as ``dtype``
+    (float32, float16 or scaled int8). Each (provider, model) pair is
+    recorded with the version the provider reports and the storage dtype;
+    when either changes, the pair's stored vectors are dropped so a re-pulled
+    or upgraded model never serves stale embeddings. ``path=None`` keeps the
+    cache in memory only.
+
+    Disk methods block and are meant to run in the threadpool.
+    """
+
+    def __init__(self, path: Optional[Path], max_memory_bytes: int, dtype: str = "float32"):
+        self.path = Path(path) if path else None
+        self.max_memory_bytes = max_memory_bytes
+        self.dtype = check_dtype(dtype)
+        self._memory: "OrderedDict[Tuple[int, bytes], bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._model_ids: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._stats = EmbeddingCacheStats()
+        # Memory tier and stats; never held across disk I/O so event-loop
+        # lookups don't wait on SQLite
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache store unavailable, using memory only: {e}")
+                self._conn = None
+        self._next_memory_model_id = -1
+
+    def known_model_id(self, provider: str, model: str, version: str) -> Optional[int]:
+        """Namespace for an already-resolved (provider, model, version), without I/O"""
+        known = self._model_ids.get((provider, model))
+        return known[0] if known is not None and known[1] == version else None
+
+    def model_id(self, provider: str, model: str, version: str) -> int:
+        """
+        Resolve the namespace for a (provider, model), invalidating stored
+        embeddings when the model version changed.
+        """
+        with self._db_lock:
+            known = self._model_ids.get((provider, model))
+            if known is not None and known[1] == version:
+                return known[0]
+            model_id = self._resolve_model_id(provider, model, f"{version}#{self.dtype}")
+            if known is not None:
+                with self._lock:
+                    self._evict_model(known[0])
+            self._model_ids[(provider, model)] = (model_id, version)
+            return model_id
+
+    def _resolve_model_id(self, provider: str, model: str, version: str) -> int:
+        if self._conn is None:
+            model_id = self._next_memory_model_id
+            self._next_memory_model_id -= 1
+            return model_id
+
+        row = self._conn.execute(
+            "SELECT id, version FROM models WHERE provider = ? AND model = ?",
+            (provider, model),
+        ).fetchone()
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO models (provider, model, version) VALUES (?, ?, ?)",
+                (provider, model, version),
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+        model_id, stored_version = row
+        if stored_version != version:
+            deleted = self._conn.execute(
+                "DELETE FROM embeddings WHERE model_id = ?", (model_id,)
+            ).rowcount
+            self._conn.execute("UPDATE models SET version = ? WHERE id = ?", (version, model_id))
+            self._conn.commit()
+            logger.info(
+                f"Embedding model {provider}/{model} changed version "
+                f"({stored_version!r} -> {version!r}); dropped {deleted} cached vectors"
+            )
+        return model_id
+
+    def _evict_model(self, model_id: int) -> None:
+        for key in [key for key in self._memory if key[0] == model_id]:
+            self._memory_bytes -= len(self._memory.pop(key)) + _ENTRY_OVERHEAD_BYTES
+
+    def _remember(self, key: Tuple[int, bytes], blob: bytes) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous) + _ENTRY_OVERHEAD_BYTES
+        self._memory[key] = blob
+        self._memory_bytes += len(blob) + _ENTRY_OVERHEAD_BYTES
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted) + _ENTRY_OVERHEAD_BYTES
+
+    def get_memory(self, model_id: int, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look texts up in the in-memory tier only; cheap enough for the event loop"""
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = (model_id, text_key(text))
+                blob = self._memory.get(key)
+                vector = None
+                if blob is not None:
+                    self._memory.move_to_end(key)
+                    vector = decode_vector(blob, self.dtype)
+                    self._stats.memory_hits += 1
+                    self._stats.bytes_saved += vector.nbytes
+                found.append(vector)
+        return found
+
+    def get_disk(self, model_id: int, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look texts up on disk, promoting hits to memory; counts misses"""
+        keys = [text_key(text) for text in texts]
+        rows: Dict[bytes, bytes] = {}
+        with self._db_lock:
+            if self._conn is not None:
+                for start in range(0, len(keys), _SQL_BATCH):
+                    chunk = keys[start:start + _SQL_BATCH]
+                    rows.update(
+                        self._conn.execute(
+                            f"SELECT key, vector FROM embeddings "
+                            f"WHERE model_id = ? AND key IN ({','.join('?' * len(chunk))})",
+                            (model_id, *chunk),
+                        ).fetchall()
+                    )
+
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                blob = rows.get(key)
+                if blob is None:
+                    self._stats.misses += 1
+                    found.append(None)
+                    continue
+                vector = decode_vector(blob, self.dtype)
+                self._remember((model_id, key), blob)
+                self._stats.disk_hits += 1
+                self._stats.bytes_saved += vector.nbytes
+                found.append(vector)
+        return found
+
+    def put(self, model_id: int, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store freshly computed embeddings in both tiers"""
+        entries = [
+            (text_key(text), encode_vector(vector, self.dtype))
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, blob in entries:
+                self._remember((model_id, key), blob)
+        with self._db_lock:
+            if self._conn is not None and entries:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model_id, key, vector) VALUES (?, ?, ?)",
+                    [(model_id, key, blob) for key, blob in entries],
+                )
+                self._conn.commit()
+
+    def stats(self) -> EmbeddingCacheStats:
+        with self._lock:
+            return EmbeddingCacheStats(
+                memory_hits=self._stats.memory_hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                bytes_saved=self._stats.bytes_saved,
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_bytes,
+            )
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get singleton embedding cache, or None when caching is disabled"""
+    global _embedding_cache
+    if _embedding_cache is None and settings.EMBEDDING_CACHE_ENABLED:
+        _embedding_cache = EmbeddingCache(
+            Path(settings.EMBEDDING_CACHE_PATH) if settings.EMBEDDING_CACHE_PATH else None,
+            settings.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024,
+            settings.EMBEDDING_CACHE_DTYPE,
+        )
+    return _embedding_cache
@@ -4,3 +4,7 @@ class ProviderError(RuntimeError):
 
 class StrategyError(RuntimeError):
     """Raised when a Strategy cannot parse/return expected output"""
+
+
+class ProviderOverloadedError(ProviderError):
+    """Raised when a provider call is not admitted: queue full or deadline passed"""
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from ..core import settings
+from .exceptions import ProviderError, ProviderOverloadedError
+from .metrics import report_retry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Latencies kept per (target, prompt type), and how many are needed before
+# their p95 replaces the configured SLO as the hedge delay
+_WINDOW = 200
+_MIN_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def parse_targets(entries: Sequence[str]) -> List[Tuple[str, str]]:
+    """``"provider/model"`` entries as (provider, model) pairs"""
+    targets = []
+    for entry in entries:
+        provider, sep, model = entry.partition("/")
+        if not sep or not provider or not model:
+            raise ValueError(f"LLM fallback {entry!r} must look like 'provider/model'")
+        targets.append((provider, model))
+    return targets
+
+
+def latency_slo(prompt_type: str) -> float:
+    slos = settings.LLM_LATENCY_SLO_SECONDS
+    return slos.get(prompt_type, slos.get("default", 30.0))
+
+
+@dataclass
+class TargetStats:
+    name: str
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    calls: int = 0
+    wins: int = 0
+    failures: int = 0
+    slow: int = 0
+    hedged: int = 0
+    opened: int = 0
+    p95_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ProviderTarget:
+    """
+    Latency history and circuit breaker for one LLM provider/model.
+
+    The breaker opens after ``failure_threshold`` consecutive strikes (an
+    error, or a call still running when its hedge deadline passed and
+    beaten by another provider). While open the target is skipped; after
+    ``cooldown`` seconds one trial call is let through (half-open), and
+    its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cooldown: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._stats = TargetStats(name)
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now; claims the trial when half-open"""
+        state = self.state
+        if state == CLOSED or self.failure_threshold <= 0:
+            return True
+        if state == HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def hedge_delay(self, prompt_type: str) -> float:
+        """Seconds to wait for this target before trying the next one"""
+        slo = latency_slo(prompt_type)
+        p95 = self.p95(prompt_type)
+        return slo if p95 is None else min(p95, slo)
+
+    def p95(self, prompt_type: str) -> Optional[float]:
+        samples = self._latencies.get(prompt_type)
+        if not samples or len(samples) < _MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def record_call(self, hedge: bool) -> None:
+        self._stats.calls += 1
+        self._stats.hedged += hedge
+
+    def record_success(self, prompt_type: str, seconds: float) -> None:
+        self._latencies.setdefault(prompt_type, deque(maxlen=_WINDOW)).append(seconds)
+        self._stats.wins += 1
+        self._stats.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_strike(self, slow: bool) -> None:
+        if slow:
+            self._stats.slow += 1
+        else:
+            self._stats.failures += 1
+        self._stats.consecutive_failures += 1
+        half_open = self._trial_running
+        self._trial_running = False
+        if self.failure_threshold > 0 and (
+            half_open or self._stats.consecutive_failures >= self.failure_threshold
+        ):
+            if self._opened_at is None or half_open:
+                self._stats.opened += 1
+                logger.warning(f"Circuit opened for LLM provider {self.name}")
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """A call ended without a verdict on the provider (e.g. cancelled)"""
+        self._trial_running = False
+
+    def stats(self) -> TargetStats:
+        stats = TargetStats(**asdict(self._stats))
+        stats.state = self.state
+        stats.p95_seconds = {
+            prompt_type: round(p95, 3)
+            for prompt_type in self._latencies
+            if (p95 := self.p95(prompt_type)) is not None
+        }
+        return stats
+
+
+_targets: Dict[str, ProviderTarget] = {}
+
+
+def get_provider_target(name: str) -> ProviderTarget:
+    target = _targets.get(name)
+    if target is None:
+        target = _targets[name] = ProviderTarget(
+            name, settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN_SECONDS
+        )
+    return target
+
+
+def provider_target_stats() -> List[TargetStats]:
+    return [target.stats() for target in _targets.values()]
+
+
+def _is_strike(error: BaseException) -> bool:
+    # Local queueing and malformed output say nothing about provider health
+    return isinstance(error, ProviderError) and not isinstance(error, ProviderOverloadedError)
+
+
+async def hedged_call(
+    calls: Sequence[Tuple[ProviderTarget, Callable[[], Awaitable[T]]]],
+    prompt_type: str,
+) -> T:
+    """
+    Run ``calls`` (in preference order) as a hedged request.
+
+    The first target whose breaker allows it is called; if it has not
+    answered within its hedge delay (the p95 latency for ``prompt_type``,
+    capped by the SLO), or it fails, the next one is started as well. The
+    first successful result wins and the calls still running are
+    cancelled. If every call fails, the error of the most preferred
+    target is raised. When no breaker lets a call through, the targets are
+    tried in order anyway rather than failing outright.
+    """
+    forced = not any(target.state != OPEN for target, _ in calls)
+    running: Dict[asyncio.Future, Tuple[int, ProviderTarget, float]] = {}
+    errors: Dict[int, BaseException] = {}
+    next_index = 0
+    hedge_at: Optional[float] = None
+
+    def launch() -> bool:
+        nonlocal next_index, hedge_at
+        while next_index < len(calls):
+            index, (target, call) = next_index, calls[next_index]
+            next_index += 1
+            if forced or target.allow():
+                target.record_call(hedge=bool(running))
+                if running or errors:
+                    report_retry()
+                started = time.monotonic()
+                running[asyncio.ensure_future(call())] = (index, target, started)
+                hedge_at = started + target.hedge_delay(prompt_type)
+                return True
+        hedge_at = None
+        return False
+
+    try:
+        if not launch():
+            # Every breaker is open or already running its trial call
+            forced, next_index = True, 0
+            launch()
+        while running:
+            timeout = None if hedge_at is None or next_index >= len(calls) else max(0.0, hedge_at - time.monotonic())
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(f"LLM call for {prompt_type} past its hedge delay; trying the next provider")
+                launch()
+                continue
+            for task in done:
+                index, target, started = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    target.record_success(prompt_type, time.monotonic() - started)
+                    for _, other, other_started in running.values():
+                        # Beaten by another provider while already past its hedge delay
+                        if time.monotonic() - other_started >= other.hedge_delay(prompt_type):
+                            other.record_strike(slow=True)
+                    return task.result()
+                errors[index] = error
+                if _is_strike(error):
+                    target.record_strike(slow=False)
+                else:
+                    target.release()
+                logger.warning(f"LLM provider {target.name} failed: {error}")
+            if not running:
+                launch()
+        raise errors[min(errors)]
+    finally:
+        for task, (_, target, _) in running.items():
+            task.cancel()
+            target.release()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -1,15 +1,37 @@
-import os
-from typing import Dict, Any
+import copy
+import logging
+from functools import partial
+from typing import Dict, Any, List, Optional, Type, Union
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 
 from ..core import settings
+from .admission import AdmissionController, get_admission_controller
+from .batching import get_embedding_batcher
+from .chunking import chunk_text, estimate_tokens, pool_embeddings
+from .embedding_cache import get_embedding_cache, normalize_text
+from .hedging import get_provider_target, hedged_call, parse_targets
+from .metrics import report_coalesced, report_served_by, report_usage, track_call
+from .response_cache import get_response_cache, response_key
+from .single_flight import SingleFlight
 from .strategies.wrapper import JSONWrapper, MDWrapper
 from .providers.base import Provider, EmbeddingProvider
+from .registry import get_provider_registry, provider_key
+
+logger = logging.getLogger(__name__)
+
+# Concurrent identical LLM calls / embedding texts share one provider call
+_llm_flights = SingleFlight()
+_embedding_flights = SingleFlight()
 
 class AgentManager:
     def __init__(self,
                  strategy: str | None = None,
                  model: str = settings.LL_MODEL,
-                 model_provider: str = settings.LLM_PROVIDER
+                 model_provider: str = settings.LLM_PROVIDER,
+                 fallbacks: Optional[List[str]] = None,
                  ) -> None:
         match strategy:
             case "md":
@@ -20,41 +42,153 @@ class AgentManager:
                 self.strategy = JSONWrapper()
         self.model = model
         self.model_provider = model_provider
+        # Providers hedged behind this one, in order (LLM_FALLBACKS)
+        self._fallbacks = [
+            AgentManager(strategy, model=fallback_model, model_provider=fallback_provider, fallbacks=[])
+            for fallback_provider, fallback_model in parse_targets(
+                settings.LLM_FALLBACKS if fallbacks is None else fallbacks
+            )
+            if (fallback_provider, fallback_model) != (model_provider, model)
+        ]
 
     async def _get_provider(self, **kwargs: Any) -> Provider:
         # Default options for any LLM. Not all can handle them
         # (e.g. OpenAI doesn't take top_k) but each provider can make
-        # best effort.
-        opts = {}
-        opts.update(kwargs)
+        # best effort. Per-call sampling args reach the provider as
+        # generation args instead, so they don't key a new instance.
+        opts = {key: value for key, value in kwargs.items() if key not in Provider.PER_CALL_ARGS}
+        registry = get_provider_registry()
         match self.model_provider:
             case 'openai':
                 from .providers.openai import OpenAIProvider
                 api_key = opts.get("llm_api_key", settings.LLM_API_KEY)
-                return OpenAIProvider(model_name=self.model,
-                                      api_key=api_key,
-                                      opts=opts)
+                return await registry.get(
+                    provider_key("llm", "openai", self.model, api_key=api_key, opts=opts),
+                    lambda: OpenAIProvider(model_name=self.model,
+                                           api_key=api_key,
+                                           opts=opts),
+                )
             case 'ollama':
                 from .providers.ollama import OllamaProvider
                 model = opts.get("model", self.model)
-                return OllamaProvider(model_name=model,
-                                      opts=opts)
+                return await registry.get(
+                    provider_key("llm", "ollama", model, settings.LLM_BASE_URL, opts=opts),
+                    lambda: OllamaProvider(model_name=model,
+                                           opts=opts),
+                )
             case _:
                 from .providers.llama_index import LlamaIndexProvider
                 llm_api_key = opts.get("llm_api_key", settings.LLM_API_KEY)
                 llm_api_base_url = opts.get("llm_base_url", settings.LLM_BASE_URL)
-                return LlamaIndexProvider(api_key=llm_api_key,
-                                          model_name=self.model,
-                                          api_base_url=llm_api_base_url,
-                                          provider=self.model_provider,
-                                          opts=opts)
+                return await registry.get(
+                    provider_key("llm", self.model_provider, self.model, llm_api_base_url,
+                                 api_key=llm_api_key, opts=opts),
+                    lambda: LlamaIndexProvider(api_key=llm_api_key,
+                                               model_name=self.model,
+                                               api_base_url=llm_api_base_url,
+                                               provider=self.model_provider,
+                                               opts=opts),
+                )
 
-    async def run(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+    async def run(
+        self,
+        prompt: str,
+        use_cache: bool = True,
+        response_model: Optional[Type[BaseModel]] = None,
+        prompt_type: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Union[Dict[str, Any], BaseModel]:
         """
         Run the agent with the given prompt and generation arguments.
+
+        With a ``response_model`` the JSON strategy constrains generation to
+        its schema where the provider allows and returns a validated
+        instance; ``prompt_type`` labels the call in structured output stats
+        and selects its latency SLO. With fallback providers configured, a
+        provider that is slower than its p95 for the prompt type, or fails,
+        is hedged with the next one (see hedging.hedged_call).
+
+        Parsed responses are cached by (provider, model, strategy, prompt,
+        arguments), and concurrent identical calls share one provider call.
+        Pass ``use_cache=False`` where a fresh sample is wanted for the same
+        prompt, e.g. retries; that skips both.
+
+        Every call is recorded in the agent metrics (metrics.track_call).
         """
+        async with track_call("llm", self.model_provider, self.model, prompt_type) as usage:
+            if not use_cache:
+                return await self._generate(prompt, response_model, prompt_type, **kwargs)
+
+            options = kwargs if response_model is None else {**kwargs, "response_model": response_model.__name__}
+            key = response_key(self.model_provider, self.model, type(self.strategy).__name__, prompt, options)
+            cache = get_response_cache()
+            if cache is not None:
+                cached = cache.get_memory(key)
+                if cached is None:
+                    cached = await run_in_threadpool(cache.get_disk, key)
+                if cached is not None:
+                    usage.outcome = "cached"
+                    return cached if response_model is None else response_model.model_validate(cached)
+
+            owner = False
+
+            async def generate_and_store() -> Union[Dict[str, Any], BaseModel]:
+                nonlocal owner
+                owner = True
+                response = await self._generate(prompt, response_model, prompt_type, **kwargs)
+                if cache is not None:
+                    stored = (
+                        response.model_dump(mode="json", by_alias=True)
+                        if isinstance(response, BaseModel)
+                        else response
+                    )
+                    await run_in_threadpool(cache.put, key, stored)
+                return response
+
+            # Waiters share the result object; give each its own copy
+            response = await _llm_flights.do(key, generate_and_store)
+            if not owner:
+                report_coalesced()
+            if isinstance(response, BaseModel):
+                return response.model_copy(deep=True)
+            return copy.deepcopy(response)
+
+    async def _generate(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None,
+        prompt_type: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Union[Dict[str, Any], BaseModel]:
+        if not self._fallbacks:
+            return await self._generate_with(prompt, response_model, prompt_type, **kwargs)
+        return await hedged_call(
+            [
+                (
+                    get_provider_target(f"{manager.model_provider}/{manager.model}"),
+                    partial(manager._generate_with, prompt, response_model, prompt_type, **kwargs),
+                )
+                for manager in [self, *self._fallbacks]
+            ],
+            prompt_type or "untyped",
+        )
+
+    async def _generate_with(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None,
+        prompt_type: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Union[Dict[str, Any], BaseModel]:
         provider = await self._get_provider(**kwargs)
-        return await self.strategy(prompt, provider, **kwargs)
+        endpoint = None if self.model_provider == "openai" else kwargs.get("llm_base_url", settings.LLM_BASE_URL)
+        strategy_args: Dict[str, Any] = {"prompt_type": prompt_type}
+        if response_model is not None:
+            strategy_args["response_model"] = response_model
+        async with get_admission_controller(self.model_provider, endpoint).slot():
+            response = await self.strategy(prompt, provider, **strategy_args, **kwargs)
+        report_served_by(self.model_provider, self.model)
+        return response
 
 class EmbeddingManager:
     def __init__(self,
@@ -66,25 +200,199 @@ class EmbeddingManager:
     async def _get_embedding_provider(
         self, **kwargs: Any
     ) -> EmbeddingProvider:
+        registry = get_provider_registry()
         match self._model_provider:
             case 'openai':
                 from .providers.openai import OpenAIEmbeddingProvider
                 api_key = kwargs.get("openai_api_key", settings.EMBEDDING_API_KEY)
-                return OpenAIEmbeddingProvider(api_key=api_key, embedding_model=self._model)
+                return await registry.get(
+                    provider_key("embedding", "openai", self._model, api_key=api_key),
+                    lambda: OpenAIEmbeddingProvider(api_key=api_key, embedding_model=self._model),
+                )
             case 'ollama':
                 from .providers.ollama import OllamaEmbeddingProvider
                 model = kwargs.get("embedding_model", self._model)
-                return OllamaEmbeddingProvider(embedding_model=model)
+                return await registry.get(
+                    provider_key("embedding", "ollama", model, settings.EMBEDDING_BASE_URL),
+                    lambda: OllamaEmbeddingProvider(embedding_model=model),
+                )
+            case 'onnx':
+                from .providers.onnx import OnnxEmbeddingProvider
+                model = kwargs.get("embedding_model", self._model)
+                return await registry.get(
+                    provider_key("embedding", "onnx", model),
+                    lambda: OnnxEmbeddingProvider(embedding_model=model),
+                )
+            case 'hashing':
+                from .providers.hashing import HashingEmbeddingProvider
+                return await registry.get(
+                    provider_key("embedding", "hashing", str(settings.HASHING_EMBEDDING_DIM)),
+                    HashingEmbeddingProvider,
+                )
             case _:
                 from .providers.llama_index import LlamaIndexEmbeddingProvider
                 embed_api_key = kwargs.get("embedding_api_key", settings.EMBEDDING_API_KEY)
-                return LlamaIndexEmbeddingProvider(api_key=embed_api_key,
-                                                   provider=self._model_provider,
-                                                   embedding_model=self._model)
+                return await registry.get(
+                    provider_key("embedding", self._model_provider, self._model,
+                                 settings.EMBEDDING_BASE_URL, api_key=embed_api_key),
+                    lambda: LlamaIndexEmbeddingProvider(api_key=embed_api_key,
+                                                        provider=self._model_provider,
+                                                        embedding_model=self._model),
+                )
 
     async def embed(self, text: str, **kwargs: Any) -> list[float]:
         """
         Get the embedding for the given text.
         """
-        provider = await self._get_embedding_provider(**kwargs)
-        return await provider.embed(text)
+        return (await self.embed_many([text], **kwargs))[0]
+
+    async def embed_document(
+        self,
+        text: str,
+        max_tokens: Optional[int] = None,
+        pooling: Optional[str] = None,
+        **kwargs: Any,
+    ) -> list[float]:
+        """
+        Get one embedding for a text that may exceed the model's context.
+
+        The text is split by section and token budget, the chunks are
+        embedded in one batch (each cached under its own text, so an edit
+        re-embeds only the chunks it touches) and pooled with ``mean`` or
+        ``weighted`` pooling. Texts that fit one chunk get a plain embedding.
+        """
+        chunks = chunk_text(text, max_tokens or settings.EMBEDDING_CHUNK_TOKENS)
+        if len(chunks) <= 1:
+            return await self.embed(text, **kwargs)
+        vectors = await self.embed_many(chunks, **kwargs)
+        return pool_embeddings(
+            vectors,
+            [estimate_tokens(chunk) for chunk in chunks],
+            pooling or settings.EMBEDDING_CHUNK_POOLING,
+        )
+
+    async def embed_many(
+        self, texts: List[str], prompt_type: Optional[str] = None, **kwargs: Any
+    ) -> List[list[float]]:
+        """
+        Get embeddings for several texts, in input order, using as few
+        provider requests as its batch limit allows. Texts already in the
+        embedding cache are not sent to the provider; the rest share provider
+        batches with concurrent calls (EMBEDDING_BATCH_WINDOW_MS).
+
+        Calls are recorded in the agent metrics under ``prompt_type`` and
+        the model the provider resolved, with the estimated tokens of the
+        texts this call had embedded. Texts joined to a concurrent call's
+        request are counted on that call only.
+        """
+        if not texts:
+            return []
+        model = kwargs.get("embedding_model", self._model)
+        async with track_call("embedding", self._model_provider, model, prompt_type) as usage:
+            provider = await self._get_embedding_provider(**kwargs)
+            report_served_by(self._model_provider, provider.model_name or model)
+            cache = get_embedding_cache()
+            if cache is None:
+                return await self._embed_coalesced(provider, texts)
+
+            version = provider.model_version
+            model_id = cache.known_model_id(self._model_provider, model, version)
+            if model_id is None:
+                model_id = await run_in_threadpool(cache.model_id, self._model_provider, model, version)
+
+            vectors: List[Optional[Any]] = cache.get_memory(model_id, texts)
+            pending = [i for i, vector in enumerate(vectors) if vector is None]
+            if pending:
+                from_disk = await run_in_threadpool(cache.get_disk, model_id, [texts[i] for i in pending])
+                for i, vector in zip(pending, from_disk):
+                    vectors[i] = vector
+                pending = [i for i in pending if vectors[i] is None]
+
+            if pending:
+                # Texts equal up to normalisation share one embedding; the
+                # provider is sent the first original spelling, never the
+                # normalised cache key
+                unique: Dict[str, str] = {}
+                for i in pending:
+                    unique.setdefault(normalize_text(texts[i]), texts[i])
+                computed = await self._embed_coalesced(provider, list(unique.values()), model_id)
+                by_key = dict(zip(unique, computed))
+                for i in pending:
+                    vectors[i] = by_key[normalize_text(texts[i])]
+            else:
+                usage.outcome = "cached"
+
+            return [
+                vector.tolist() if isinstance(vector, np.ndarray) else vector
+                for vector in vectors
+            ]
+
+    async def _embed_coalesced(
+        self, provider: EmbeddingProvider, texts: List[str], model_id: Optional[int] = None
+    ) -> List[list[float]]:
+        """
+        Embed texts, joining any a concurrent call is already embedding with
+        the same provider; new embeddings are cached under ``model_id``.
+        With the cache, texts are joined on their normalised cache key,
+        otherwise only on identical text. Tokens are reported for the texts
+        this call embeds itself; a call that joined others for all of its
+        texts is marked coalesced.
+        """
+        admission = self._admission()
+        cache = get_embedding_cache() if model_id is not None else None
+        keys = [(provider, normalize_text(text) if cache is not None else text) for text in texts]
+        originals = dict(zip(keys, texts))
+
+        owner = False
+
+        async def compute(missing_keys: List[Any]) -> List[list[float]]:
+            nonlocal owner
+            owner = True
+            missing = [originals[key] for key in missing_keys]
+            # Runs in this call's context, so the tokens are counted once
+            report_usage(sum(estimate_tokens(text) for text in missing))
+            vectors = await self._embed_uncached(provider, missing, admission)
+            if cache is not None:
+                await run_in_threadpool(cache.put, model_id, missing, vectors)
+            return vectors
+
+        vectors = await _embedding_flights.do_many(keys, compute)
+        if not owner:
+            report_coalesced()
+        return vectors
+
+    def _admission(self) -> AdmissionController:
+        endpoint = None if self._model_provider in ("openai", "onnx", "hashing") else settings.EMBEDDING_BASE_URL
+        return get_admission_controller(self._model_provider, endpoint)
+
+    @staticmethod
+    async def _embed_uncached(
+        provider: EmbeddingProvider, texts: List[str], admission: AdmissionController
+    ) -> List[list[float]]:
+        if settings.EMBEDDING_BATCH_WINDOW_MS > 0:
+            # Shares provider batches with concurrent callers
+            return await get_embedding_batcher(provider, admission).embed(texts)
+        # One slot per provider batch, so interactive calls can get in
+        # between the batches of a bulk embedding run
+        size = max(1, provider.max_batch_size)
+        embeddings: List[list[float]] = []
+        for start in range(0, len(texts), size):
+            async with admission.slot():
+                embeddings.extend(await provider.embed_batch(texts[start:start + size]))
+        return embeddings
+
+
+async def warm_up_providers() -> None:
+    """
+    Build the default LLM and embedding providers so that client creation
+    and model availability checks happen at startup rather than on the
+    first request. Failures are logged; the request path retries them.
+    """
+    for name, factory in (
+        ("LLM", AgentManager()._get_provider),
+        ("embedding", EmbeddingManager()._get_embedding_provider),
+    ):
+        try:
+            await factory()
+        except Exception as e:
+            logger.warning(f"Default {name} provider unavailable at startup: {e}")
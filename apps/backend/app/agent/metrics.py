@@ -0,0 +1,283 @@
+import asyncio
+import contextvars
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict, astuple, fields
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..core import settings
+
+logger = logging.getLogger(__name__)
+
+# Recent latencies kept per (kind, provider, model, prompt) for percentiles
+_LATENCY_WINDOW = 500
+
+# Records buffered before they are written to the SQLite sink
+_SINK_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_calls (
+    timestamp REAL NOT NULL,
+    kind TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    latency_ms REAL NOT NULL,
+    retries INTEGER NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agent_calls_timestamp ON agent_calls (timestamp);
+"""
+
+
+@dataclass
+class CallUsage:
+    """What one agent call consumed; filled in by providers while it runs"""
+
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    retries: int = 0
+    outcome: str = "ok"
+    provider: Optional[str] = None
+    model: Optional[str] = None
+
+
+_current_usage: contextvars.ContextVar[Optional[CallUsage]] = contextvars.ContextVar(
+    "agent_call_usage", default=None
+)
+
+
+def report_usage(input_tokens: Optional[int], output_tokens: Optional[int] = None) -> None:
+    """Add provider-reported token counts to the call being tracked, if any"""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    if input_tokens is not None:
+        usage.input_tokens = (usage.input_tokens or 0) + input_tokens
+    if output_tokens is not None:
+        usage.output_tokens = (usage.output_tokens or 0) + output_tokens
+
+
+def report_retry() -> None:
+    """Count another provider attempt (hedge or failover) for the tracked call"""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.retries += 1
+
+
+def report_coalesced() -> None:
+    """Mark the tracked call as having joined an identical call in flight"""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.outcome = "coalesced"
+
+
+def report_served_by(provider: str, model: str) -> None:
+    """Name the provider whose response the tracked call used"""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.provider, usage.model = provider, model
+
+
+@dataclass
+class CallRecord:
+    timestamp: float
+    kind: str
+    provider: str
+    model: str
+    prompt: str
+    input_tokens: Optional[int]
+    output_tokens: Optional[int]
+    latency_ms: float
+    retries: int
+    outcome: str
+
+
+@dataclass
+class CallStats:
+    kind: str
+    provider: str
+    model: str
+    prompt: str
+    calls: int = 0
+    errors: int = 0
+    cached: int = 0
+    coalesced: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    retries: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    latency_ms_p50: float = 0.0
+    latency_ms_p95: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 2)
+
+
+class MetricsRegistry:
+    """
+    In-process accounting of LLM and embedding calls.
+
+    Each call is aggregated per (kind, provider, model, prompt): counts,
+    errors, cache hits, token totals, retries and latency percentiles over
+    the last few hundred calls. With a ``sink_path`` every record is also
+    appended to a SQLite table for offline analysis; records are written in
+    the threadpool in batches, and the rest on flush()/close().
+    """
+
+    def __init__(self, sink_path: Optional[Path] = None) -> None:
+        self._stats: Dict[Tuple[str, str, str, str], CallStats] = {}
+        self._latencies: Dict[Tuple[str, str, str, str], Deque[float]] = {}
+        self._pending: List[CallRecord] = []
+        self._flushes: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if sink_path is not None:
+            try:
+                Path(sink_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(sink_path, check_same_thread=False)
+                self._conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                logger.warning(f"Agent metrics sink unavailable: {e}")
+                self._conn = None
+
+    def record(self, record: CallRecord) -> None:
+        key = (record.kind, record.provider, record.model, record.prompt)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CallStats(*key)
+            self._latencies[key] = deque(maxlen=_LATENCY_WINDOW)
+        stats.calls += 1
+        stats.errors += record.outcome.startswith("error")
+        stats.cached += record.outcome == "cached"
+        stats.coalesced += record.outcome == "coalesced"
+        stats.input_tokens += record.input_tokens or 0
+        stats.output_tokens += record.output_tokens or 0
+        stats.retries += record.retries
+        stats.latency_ms_total += record.latency_ms
+        stats.latency_ms_max = max(stats.latency_ms_max, record.latency_ms)
+        self._latencies[key].append(record.latency_ms)
+
+        if self._conn is None:
+            return
+        self._pending.append(record)
+        if len(self._pending) >= _SINK_BATCH:
+            batch, self._pending = self._pending, []
+            try:
+                task = asyncio.get_running_loop().create_task(run_in_threadpool(self._write, batch))
+            except RuntimeError:
+                self._write(batch)
+                return
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    def _write(self, batch: List[CallRecord]) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO agent_calls VALUES ({', '.join('?' * len(fields(CallRecord)))})",
+                    [astuple(record) for record in batch],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write {len(batch)} agent metrics records: {e}")
+
+    def stats(self) -> List[CallStats]:
+        result = []
+        for key, stats in self._stats.items():
+            ordered = sorted(self._latencies[key])
+            result.append(
+                CallStats(
+                    **{
+                        **asdict(stats),
+                        "latency_ms_total": round(stats.latency_ms_total, 2),
+                        "latency_ms_max": round(stats.latency_ms_max, 2),
+                        "latency_ms_p50": _percentile(ordered, 0.5),
+                        "latency_ms_p95": _percentile(ordered, 0.95),
+                    }
+                )
+            )
+        return result
+
+    def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_metrics_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get singleton agent metrics registry"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        path = settings.AGENT_METRICS_DB_PATH
+        _metrics_registry = MetricsRegistry(Path(path) if path else None)
+    return _metrics_registry
+
+
+def agent_metrics() -> List[CallStats]:
+    return get_metrics_registry().stats()
+
+
+@asynccontextmanager
+async def track_call(kind: str, provider: str, model: str, prompt: Optional[str]) -> AsyncIterator[CallUsage]:
+    """
+    Record one agent call. Providers report tokens into the yielded usage
+    (via report_usage); the caller may mark it ``cached`` or ``coalesced``
+    or name the provider that actually served it. A coalesced call shares
+    another call's provider request, whose record carries the tokens.
+    """
+    usage = CallUsage()
+    token = _current_usage.set(usage)
+    started = time.perf_counter()
+    try:
+        yield usage
+    except asyncio.CancelledError:
+        usage.outcome = "cancelled"
+        raise
+    except Exception as e:
+        usage.outcome = f"error:{type(e).__name__}"
+        raise
+    finally:
+        _current_usage.reset(token)
+        get_metrics_registry().record(
+            CallRecord(
+                timestamp=time.time(),
+                kind=kind,
+                provider=usage.provider or provider,
+                model=usage.model or model,
+                prompt=prompt or "-",
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                latency_ms=round((time.perf_counter() - started) * 1000, 2),
+                retries=usage.retries,
+                outcome=usage.outcome,
+            )
+        )
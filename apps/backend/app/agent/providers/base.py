@@ -1,20 +1,78 @@
-from typing import Any
+from typing import Any, List
 from abc import ABC, abstractmethod
 
+from fastapi.concurrency import run_in_threadpool
+
 
 class Provider(ABC):
     """
     Abstract base class for providers.
     """
 
+    # Accepts a ``json_schema`` generation arg and constrains its output to it
+    supports_json_schema: bool = False
+
+    # Generation args that may change from call to call; they are passed
+    # with each call and never baked into a provider instance
+    PER_CALL_ARGS = frozenset(
+        {"temperature", "top_p", "top_k", "seed", "num_predict", "max_output_tokens", "json_schema"}
+    )
+
     @abstractmethod
     async def __call__(self, prompt: str, **generation_args: Any) -> str: ...
 
+    def close(self) -> None:
+        """
+        Release client resources such as HTTP connection pools.
+        """
+
+    async def aclose(self) -> None:
+        """
+        Release sync and async client resources. Providers holding async
+        clients override this; the default runs close() in the threadpool.
+        """
+        await run_in_threadpool(self.close)
+
 
 class EmbeddingProvider(ABC):
     """
     Abstract base class for embedding providers.
     """
 
+    # Most inputs accepted by a single batch request
+    max_batch_size: int = 1
+
     @abstractmethod
     async def embed(self, text: str) -> list[float]: ...
+
+    @property
+    def model_name(self) -> str:
+        """Model this provider resolved to, as recorded in the agent metrics"""
+        return getattr(self, "_model", None) or ""
+
+    @property
+    def model_version(self) -> str:
+        """
+        Identifies the exact model behind this provider. Cached embeddings
+        recorded under a different version are discarded.
+        """
+        return self.model_name
+
+    async def embed_batch(self, texts: List[str]) -> List[list[float]]:
+        """
+        Embed up to ``max_batch_size`` texts in one request. Providers
+        without a batch API fall back to one request per text.
+        """
+        return [await self.embed(text) for text in texts]
+
+    def close(self) -> None:
+        """
+        Release client resources such as HTTP connection pools.
+        """
+
+    async def aclose(self) -> None:
+        """
+        Release sync and async client resources. Providers holding async
+        clients override this; the default runs close() in the threadpool.
+        """
+        await run_in_threadpool(self.close)
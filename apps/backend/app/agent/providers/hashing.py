@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from .base import EmbeddingProvider
+from ...core import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Local CPU embeddings by feature hashing, with no model server.
+
+    Word unigrams and bigrams are hashed (CRC32, signed) into ``dim``
+    buckets with sublinear term frequency. Terms that occur in the skill
+    taxonomy's names and aliases are weighted by their inverse document
+    frequency over that vocabulary, so rare skill terms dominate; other words
+    keep weight 1. Vectors are L2-normalised and deterministic across
+    processes, which makes them usable for cheap scoring, tests and
+    benchmarks; they only capture lexical overlap, not meaning.
+    """
+
+    max_batch_size = 4096
+
+    TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+    STOPWORDS = frozenset(
+        "a an and are as at be by for from has have in is it of on or that the "
+        "this to was were will with".split()
+    )
+
+    def __init__(self, dim: int = settings.HASHING_EMBEDDING_DIM, use_taxonomy: bool = True):
+        self.dim = dim
+        self._model = f"hashing-{dim}"
+        self._idf: Dict[str, float] = self._taxonomy_idf() if use_taxonomy else {}
+        digest = hashlib.sha256(
+            "\n".join(f"{term}\t{weight:.6f}" for term, weight in sorted(self._idf.items())).encode("utf-8")
+        ).hexdigest()[:12]
+        self._version = f"{self._model}@{digest}"
+
+    @property
+    def model_version(self) -> str:
+        return self._version
+
+    @classmethod
+    def _tokens(cls, text: str) -> List[str]:
+        tokens = (token.rstrip(".") for token in cls.TOKEN_PATTERN.findall(text.lower()))
+        return [token for token in tokens if token not in cls.STOPWORDS]
+
+    @classmethod
+    def _taxonomy_idf(cls) -> Dict[str, float]:
+        """Smoothed IDF of every unigram/bigram over taxonomy names and aliases"""
+        try:
+            from app.skills import get_taxonomy_mapper
+
+            taxonomy_mapper = get_taxonomy_mapper()
+        except Exception as e:
+            logger.warning(f"Hashing embeddings without taxonomy weighting: {e}")
+            return {}
+
+        document_frequency: Counter = Counter()
+        documents = 0
+        for mapping, aliases in taxonomy_mapper.iter_mappings_with_aliases():
+            for name in [mapping["skill_name"], *aliases]:
+                document_frequency.update(cls._terms(cls._tokens(name)).keys())
+                documents += 1
+        if not documents:
+            return {}
+        return {
+            term: math.log((1 + documents) / (1 + frequency)) + 1.0
+            for term, frequency in document_frequency.items()
+        }
+
+    @staticmethod
+    def _terms(tokens: List[str]) -> Counter:
+        terms = Counter(tokens)
+        terms.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return terms
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for term, count in self._terms(self._tokens(text)).items():
+            bucket = zlib.crc32(term.encode("utf-8"))
+            # Top bit picks the sign so colliding terms tend to cancel out
+            sign = -1.0 if bucket & 0x80000000 else 1.0
+            vector[bucket % self.dim] += sign * (1.0 + math.log(count)) * self._idf.get(term, 1.0)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Generate an embedding for the given text.
+        """
+        return self._vector(text)
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts.
+        """
+        return [self._vector(text) for text in texts]
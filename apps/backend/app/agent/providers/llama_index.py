@@ -4,6 +4,7 @@ from typing import Any, Dict, List
 from fastapi.concurrency import run_in_threadpool
 from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.base.llms.base import BaseLLM
+from llama_index.core.llms.custom import CustomLLM
 
 from ..exceptions import ProviderError
 from .base import Provider, EmbeddingProvider
@@ -61,6 +62,11 @@ class LlamaIndexProvider(Provider):
         kwargs_for_provider['context_window'] = \
             kwargs_for_provider['max_tokens'] = kwargs_for_provider.get('num_ctx', 20000)
         self._client = provider_obj(**kwargs_for_provider)
+        # CustomLLM.acomplete just calls the blocking complete(); only use
+        # acomplete where the integration implements it
+        self._native_async = (
+            settings.PROVIDER_ASYNC_CLIENTS and type(self._client).acomplete is not CustomLLM.acomplete
+        )
 
     def _generate_sync(self, prompt: str, **options) -> str:
         """
@@ -76,9 +82,18 @@ class LlamaIndexProvider(Provider):
     async def __call__(self, prompt: str, **generation_args: Any) -> str:
         if generation_args:
             logger.warning(f"LlamaIndexProvider ignoring generation_args: {generation_args}")
-        return await run_in_threadpool(self._generate_sync, prompt)
+        if not self._native_async:
+            return await run_in_threadpool(self._generate_sync, prompt)
+        try:
+            cr = await self._client.acomplete(prompt)
+            return cr.text
+        except Exception as e:
+            logger.error(f"llama_index async error: {e}")
+            raise ProviderError(f"llama_index - Error generating response: {e}") from e
 
 class LlamaIndexEmbeddingProvider(EmbeddingProvider):
+    max_batch_size = 100
+
     def __init__(
         self,
         embedding_model: str = settings.EMBEDDING_MODEL,
@@ -109,13 +124,34 @@ class LlamaIndexEmbeddingProvider(EmbeddingProvider):
             kwargs_for_provider["max_tokens"] = kwargs_for_provider.get('num_ctx', 20000)
 
         self._client = provider_obj(**kwargs_for_provider)
+        # BaseEmbedding's async methods fall back to the blocking sync ones;
+        # only use them where the integration implements them
+        self._native_async = (
+            settings.PROVIDER_ASYNC_CLIENTS
+            and type(self._client)._aget_text_embedding is not BaseEmbedding._aget_text_embedding
+        )
 
     async def embed(self, text: str) -> List[float]:
         """
         Generate an embedding for the given text.
         """
         try:
+            if self._native_async:
+                return await self._client.aget_text_embedding(text)
             return await run_in_threadpool(self._client.get_text_embedding, text)
         except Exception as e:
             logger.error(f"llama_index embedding error: {e}")
             raise ProviderError(f"llama_index - Error generating embedding: {e}") from e
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts; LlamaIndex splits them into
+        requests of its own ``embed_batch_size``.
+        """
+        try:
+            if self._native_async:
+                return await self._client.aget_text_embedding_batch(texts)
+            return await run_in_threadpool(self._client.get_text_embedding_batch, texts)
+        except Exception as e:
+            logger.error(f"llama_index batch embedding error: {e}")
+            raise ProviderError(f"llama_index - Error generating embeddings: {e}") from e
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 from fastapi.concurrency import run_in_threadpool
 
 from ..exceptions import ProviderError
+from ..metrics import report_usage
 from .base import Provider, EmbeddingProvider
 from ...core import settings
 
@@ -54,7 +55,44 @@ class OllamaBaseProvider:
                 f"`ollama pull {model_name}`, then retry."
             ) from e
 
+    def _model_digest(self, model_name: str) -> str:
+        """Digest of an installed model, so re-pulled tags are told apart"""
+        try:
+            for model in self._client.list().models:
+                if model.model == model_name:
+                    return model.digest or ""
+        except Exception as e:
+            logger.warning(f"Could not read digest of ollama model {model_name}: {e}")
+        return ""
+
+    @staticmethod
+    def _make_async_client(host: Optional[str]) -> Optional[ollama.AsyncClient]:
+        if not settings.PROVIDER_ASYNC_CLIENTS:
+            return None
+        return ollama.AsyncClient(host=host) if host else ollama.AsyncClient()
+
+    async def _request(self, method: str, **kwargs: Any) -> Any:
+        """
+        Call a client method on the async client, or on the sync client in
+        the threadpool when async clients are disabled.
+        """
+        if self._async_client is not None:
+            return await getattr(self._async_client, method)(**kwargs)
+        return await run_in_threadpool(getattr(self._client, method), **kwargs)
+
+    def close(self) -> None:
+        # ollama.Client has no public close; its httpx client holds the pool
+        self._client._client.close()
+
+    async def aclose(self) -> None:
+        await run_in_threadpool(self.close)
+        if self._async_client is not None:
+            await self._async_client._client.aclose()
+
 class OllamaProvider(Provider, OllamaBaseProvider):
+    supports_json_schema = True
+    SAMPLING_OPTIONS = Provider.PER_CALL_ARGS - {"max_output_tokens", "json_schema"}
+
     def __init__(self,
                  model_name: str = settings.LL_MODEL,
                  api_base_url: Optional[str] = settings.LLM_BASE_URL,
@@ -64,30 +102,35 @@ class OllamaProvider(Provider, OllamaBaseProvider):
         self.opts = opts
         self.model = model_name
         self._client = ollama.Client(host=api_base_url) if api_base_url else ollama.Client()
+        self._async_client = self._make_async_client(api_base_url)
         self._ensure_model_pulled(model_name)
 
-    def _generate_sync(self, prompt: str, options: Dict[str, Any]) -> str:
-        """
-        Generate a response from the model.
-        """
+    async def __call__(
+        self, prompt: str, json_schema: Optional[Dict[str, Any]] = None, **generation_args: Any
+    ) -> str:
+        # Sampling options given per call go into the model options
+        sampling = {key: generation_args.pop(key) for key in self.SAMPLING_OPTIONS & generation_args.keys()}
+        if generation_args:
+            logger.warning(f"OllamaProvider ignoring generation_args {generation_args}")
+        myopts = {**self.opts, **sampling} # Ollama can handle all the options manager.py passes in.
         try:
-            response = self._client.generate(
+            response = await self._request(
+                "generate",
                 prompt=prompt,
                 model=self.model,
-                options=options,
+                options=myopts,
+                # Structured outputs: decoding is restricted to the schema
+                **({"format": json_schema} if json_schema else {}),
             )
+            report_usage(response.get("prompt_eval_count"), response.get("eval_count"))
             return response["response"].strip()
         except Exception as e:
-            logger.error(f"ollama sync error: {e}")
+            logger.error(f"ollama error: {e}")
             raise ProviderError(f"Ollama - Error generating response: {e}") from e
 
-    async def __call__(self, prompt: str, **generation_args: Any) -> str:
-        if generation_args:
-            logger.warning(f"OllamaProvider ignoring generation_args {generation_args}")
-        myopts = self.opts # Ollama can handle all the options manager.py passes in.
-        return await run_in_threadpool(self._generate_sync, prompt, myopts)
-
 class OllamaEmbeddingProvider(EmbeddingProvider, OllamaBaseProvider):
+    max_batch_size = 64
+
     def __init__(
         self,
         embedding_model: str = settings.EMBEDDING_MODEL,
@@ -95,15 +138,21 @@ class OllamaEmbeddingProvider(EmbeddingProvider, OllamaBaseProvider):
     ):
         self._model = embedding_model
         self._client = ollama.Client(host=api_base_url) if api_base_url else ollama.Client()
+        self._async_client = self._make_async_client(api_base_url)
         self._ensure_model_pulled(embedding_model)
+        self._digest = self._model_digest(embedding_model)
+
+    @property
+    def model_version(self) -> str:
+        return f"{self._model}@{self._digest}" if self._digest else self._model
 
     async def embed(self, text: str) -> List[float]:
         """
         Generate an embedding for the given text.
         """
         try:
-            response = await run_in_threadpool(
-                self._client.embed,
+            response = await self._request(
+                "embed",
                 input=text,
                 model=self._model,
             )
@@ -116,3 +165,23 @@ class OllamaEmbeddingProvider(EmbeddingProvider, OllamaBaseProvider):
         except Exception as e:
             logger.error(f"ollama embedding error: {e}")
             raise ProviderError(f"Ollama - Error generating embedding: {e}") from e
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one request.
+        """
+        try:
+            response = await self._request(
+                "embed",
+                input=texts,
+                model=self._model,
+            )
+        except Exception as e:
+            logger.error(f"ollama batch embedding error: {e}")
+            raise ProviderError(f"Ollama - Error generating embeddings: {e}") from e
+        embeddings = list(getattr(response, "embeddings", None) or [])
+        if len(embeddings) != len(texts):
+            raise ProviderError(
+                f"Ollama - Expected {len(texts)} embeddings, got {len(embeddings)}"
+            )
+        return embeddings
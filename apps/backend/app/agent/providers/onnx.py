@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import onnxruntime as ort
+from fastapi.concurrency import run_in_threadpool
+from tokenizers import Tokenizer
+
+from ..exceptions import ProviderError
+from .base import EmbeddingProvider
+from ...core import settings
+
+logger = logging.getLogger(__name__)
+
+# Where sentence-transformers / Optimum exports put the graph
+_MODEL_CANDIDATES = ("model.onnx", "onnx/model.onnx")
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    In-process embeddings from a local sentence-embedding ONNX model.
+
+    ``embedding_model`` is a directory holding ``tokenizer.json`` and
+    ``model.onnx`` (or ``onnx/model.onnx``), as exported by
+    sentence-transformers or Optimum. Token states are pooled with the
+    attention mask (``mean``, ``cls`` or ``last`` token) and L2-normalised;
+    models that already output a pooled 2-D embedding are only normalised.
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = settings.EMBEDDING_MODEL,
+        threads: int = settings.ONNX_EMBEDDING_THREADS,
+        max_length: int = settings.ONNX_EMBEDDING_MAX_LENGTH,
+        pooling: str = settings.ONNX_EMBEDDING_POOLING,
+        batch_size: int = settings.ONNX_EMBEDDING_BATCH_SIZE,
+    ):
+        if pooling not in ("mean", "cls", "last"):
+            raise ValueError(f"Unsupported pooling {pooling!r}, expected mean, cls or last")
+        model_dir = Path(embedding_model).expanduser()
+        model_file = next(
+            (model_dir / name for name in _MODEL_CANDIDATES if (model_dir / name).is_file()), None
+        )
+        tokenizer_file = model_dir / "tokenizer.json"
+        if model_file is None or not tokenizer_file.is_file():
+            raise ProviderError(
+                f"ONNX - {model_dir} must contain tokenizer.json and model.onnx (or onnx/model.onnx)"
+            )
+
+        self._model = embedding_model
+        self._pooling = pooling
+        self.max_batch_size = batch_size
+        self._digest = self._file_digest(model_file)
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            str(model_file), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {model_input.name for model_input in self._session.get_inputs()}
+
+        self._tokenizer = Tokenizer.from_file(str(tokenizer_file))
+        self._tokenizer.enable_truncation(max_length)
+        if self._tokenizer.padding is None:
+            pad_token = next(
+                (token for token in ("[PAD]", "<pad>", "<|endoftext|>") if self._tokenizer.token_to_id(token) is not None),
+                None,
+            )
+            self._tokenizer.enable_padding(
+                pad_id=self._tokenizer.token_to_id(pad_token) if pad_token else 0,
+                pad_token=pad_token or "[PAD]",
+            )
+        else:
+            # Pad to the longest text of each batch, never to a fixed length
+            padding = dict(self._tokenizer.padding)
+            padding.pop("length", None)
+            self._tokenizer.enable_padding(**padding)
+        self._left_padded = self._tokenizer.padding["direction"] == "left"
+        logger.info(
+            f"Loaded ONNX embedding model {model_file} "
+            f"({options.intra_op_num_threads or os.cpu_count()} threads, {pooling} pooling)"
+        )
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()[:12]
+
+    @property
+    def model_version(self) -> str:
+        return f"{self._model}@{self._digest}"
+
+    def _pool(self, states: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if states.ndim == 2:
+            return states
+        if self._pooling == "cls":
+            return states[:, 0]
+        if self._pooling == "last":
+            if self._left_padded:
+                return states[:, -1]
+            last = mask.sum(axis=1) - 1
+            return states[np.arange(len(states)), last]
+        weights = mask[:, :, None].astype(states.dtype)
+        return (states * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+
+    def _embed_sync(self, texts: List[str]) -> List[List[float]]:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds: Dict[str, np.ndarray] = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+
+        states = self._session.run(None, feeds)[0]
+        pooled = self._pool(states, attention_mask).astype(np.float32)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return np.divide(pooled, norms, out=np.zeros_like(pooled), where=norms > 0).tolist()
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Generate an embedding for the given text.
+        """
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one inference run.
+        """
+        try:
+            return await run_in_threadpool(self._embed_sync, texts)
+        except Exception as e:
+            logger.error(f"onnx embedding error: {e}")
+            raise ProviderError(f"ONNX - Error generating embeddings: {e}") from e
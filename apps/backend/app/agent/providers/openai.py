@@ -1,11 +1,12 @@
 import os
 import logging
 
-from openai import OpenAI
-from typing import Any, Dict
+from openai import AsyncOpenAI, OpenAI
+from typing import Any, Dict, List, Optional
 from fastapi.concurrency import run_in_threadpool
 
 from ..exceptions import ProviderError
+from ..metrics import report_usage
 from .base import Provider, EmbeddingProvider
 from ...core import settings
 
@@ -13,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 
 class OpenAIProvider(Provider):
+    supports_json_schema = True
+
     def __init__(self, api_key: str | None = None, model_name: str = settings.LL_MODEL,
                  opts: Dict[str, Any] = None):
         if opts is None:
@@ -21,6 +24,7 @@ class OpenAIProvider(Provider):
         if not api_key:
             raise ProviderError("OpenAI API key is missing")
         self._client = OpenAI(api_key=api_key)
+        self._async_client = AsyncOpenAI(api_key=api_key) if settings.PROVIDER_ASYNC_CLIENTS else None
         self.model = model_name
         self.opts = opts
         self.instructions = ""
@@ -33,13 +37,42 @@ class OpenAIProvider(Provider):
                 input=prompt,
                 **options,
             )
-            return response.output_text
         except Exception as e:
             raise ProviderError(f"OpenAI - error generating response: {e}") from e
+        return self._output_text(response)
+
+    async def _generate(self, prompt: str, options: Dict[str, Any]) -> str:
+        if self._async_client is None:
+            return await run_in_threadpool(self._generate_sync, prompt, options)
+        try:
+            response = await self._async_client.responses.create(
+                model=self.model,
+                instructions=self.instructions,
+                input=prompt,
+                **options,
+            )
+        except Exception as e:
+            raise ProviderError(f"OpenAI - error generating response: {e}") from e
+        return self._output_text(response)
+
+    @staticmethod
+    def _output_text(response: Any) -> str:
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            report_usage(usage.input_tokens, usage.output_tokens)
+        return response.output_text
 
-    async def __call__(self, prompt: str, **generation_args: Any) -> str:
-        if generation_args:
-            logger.warning(f"OpenAIProvider - generation_args not used {generation_args}")
+    def close(self) -> None:
+        self._client.close()
+
+    async def aclose(self) -> None:
+        await run_in_threadpool(self.close)
+        if self._async_client is not None:
+            await self._async_client.close()
+
+    async def __call__(
+        self, prompt: str, json_schema: Optional[Dict[str, Any]] = None, **generation_args: Any
+    ) -> str:
         allowed = {
             "temperature",
             "top_p",
@@ -49,16 +82,33 @@ class OpenAIProvider(Provider):
             "grammar",
             "extra_headers",
         }
+        unused = {k: v for k, v in generation_args.items() if k not in allowed}
+        if unused:
+            logger.warning(f"OpenAIProvider - generation_args not used {unused}")
         myopts = {}
         for key in allowed:
             value = self.opts.get(key)
             if value is not None:
                 myopts[key] = value
         myopts.update({k: v for k, v in generation_args.items() if k in allowed and v is not None})
-        return await run_in_threadpool(self._generate_sync, prompt, myopts)
+        if json_schema:
+            # Structured outputs; not strict, as that requires every field
+            # to be required and closed to additional properties
+            myopts["text"] = {
+                "format": {
+                    "type": "json_schema",
+                    "name": json_schema.get("title", "response"),
+                    "schema": json_schema,
+                    "strict": False,
+                }
+            }
+        return await self._generate(prompt, myopts)
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
+    # The API accepts up to 2048 inputs per request
+    max_batch_size = 2048
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -68,13 +118,35 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         if not api_key:
             raise ProviderError("OpenAI API key is missing")
         self._client = OpenAI(api_key=api_key)
+        self._async_client = AsyncOpenAI(api_key=api_key) if settings.PROVIDER_ASYNC_CLIENTS else None
         self._model = embedding_model
 
+    async def _create_embeddings(self, input: str | List[str]) -> Any:
+        if self._async_client is None:
+            return await run_in_threadpool(
+                self._client.embeddings.create, input=input, model=self._model
+            )
+        return await self._async_client.embeddings.create(input=input, model=self._model)
+
     async def embed(self, text: str) -> list[float]:
         try:
-            response = await run_in_threadpool(
-                self._client.embeddings.create, input=text, model=self._model
-            )
+            response = await self._create_embeddings(text)
             return response.data[0].embedding
         except Exception as e:
             raise ProviderError(f"OpenAI - error generating embedding: {e}") from e
+
+    async def embed_batch(self, texts: List[str]) -> List[list[float]]:
+        try:
+            response = await self._create_embeddings(texts)
+        except Exception as e:
+            raise ProviderError(f"OpenAI - error generating embeddings: {e}") from e
+        # Results carry their input index; don't rely on response order
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def aclose(self) -> None:
+        await run_in_threadpool(self.close)
+        if self._async_client is not None:
+            await self._async_client.close()
@@ -0,0 +1,58 @@
+"""
+Compare memory use and score error of the embedding storage formats
+
+Uses the configured model's vectors from the embedding cache when there are
+any, otherwise random vectors:
+
+    python -m app.agent.quantization_report
+"""
+import sqlite3
+from typing import Optional
+
+import numpy as np
+
+from app.agent.quantization import decode_vector, quantization_report
+from app.core import settings
+
+
+def _cached_vectors(limit: int = 20000) -> Optional[np.ndarray]:
+    """Embeddings of the configured model from the on-disk embedding cache"""
+    if not settings.EMBEDDING_CACHE_PATH:
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{settings.EMBEDDING_CACHE_PATH}?mode=ro", uri=True)
+        row = conn.execute(
+            "SELECT id, version FROM models WHERE provider = ? AND model = ?",
+            (settings.EMBEDDING_PROVIDER, settings.EMBEDDING_MODEL),
+        ).fetchone()
+        if row is None:
+            return None
+        dtype = row[1].rpartition("#")[2] if "#" in row[1] else "float32"
+        blobs = conn.execute(
+            "SELECT vector FROM embeddings WHERE model_id = ? LIMIT ?", (row[0], limit)
+        ).fetchall()
+        conn.close()
+    except sqlite3.Error:
+        return None
+    if len(blobs) < 2:
+        return None
+    return np.stack([decode_vector(blob, dtype) for blob, in blobs])
+
+
+if __name__ == "__main__":
+    vectors = _cached_vectors()
+    if vectors is None:
+        print("No cached embeddings found, using 10000 random 1024-d vectors")
+        vectors = np.random.default_rng(0).normal(size=(10000, 1024)).astype(np.float32)
+    else:
+        print(f"Using {len(vectors)} cached {vectors.shape[1]}-d embeddings")
+
+    report = quantization_report(vectors)
+    baseline = report["float32"]["bytes"]
+    print(f"{'format':<8} {'bytes':>12} {'vs f32':>7} {'mean err':>9} {'max err':>9} {'recall@10':>9}")
+    for name, row in report.items():
+        print(
+            f"{name:<8} {row['bytes']:>12,} {row['bytes'] / baseline:>7.2f} "
+            f"{row.get('mean_abs_error', 0):>9.5f} {row.get('max_abs_error', 0):>9.5f} "
+            f"{row.get('recall_at_k', 1):>9.3f}"
+        )
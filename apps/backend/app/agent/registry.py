@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def provider_key(
+    kind: str,
+    provider: Optional[str],
+    model: Optional[str],
+    endpoint: Optional[str] = None,
+    api_key: Optional[str] = None,
+    opts: Optional[Dict[str, Any]] = None,
+) -> Tuple[Hashable, ...]:
+    """
+    Registry key for a provider instance.
+
+    The API key is only kept as a digest, and options are serialised so
+    that providers built with different generation options don't share an
+    instance.
+    """
+    key_digest = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else None
+    opts_repr = json.dumps(opts, sort_keys=True, default=str) if opts else ""
+    return kind, provider, model, endpoint, key_digest, opts_repr
+
+
+class ProviderRegistry:
+    """
+    Process-wide cache of LLM and embedding providers.
+
+    Providers own their SDK clients (and with them the HTTP connection
+    pools), so building each one once per (provider, model, endpoint)
+    avoids reconnecting and, for Ollama, re-checking the model on every
+    call. Construction runs in the threadpool because it may block on the
+    network; concurrent first calls for the same key wait for one build.
+    """
+
+    def __init__(self) -> None:
+        self._providers: Dict[Tuple[Hashable, ...], Any] = {}
+        self._locks: Dict[Tuple[Hashable, ...], asyncio.Lock] = {}
+
+    async def get(self, key: Tuple[Hashable, ...], factory: Callable[[], T]) -> T:
+        provider = self._providers.get(key)
+        if provider is not None:
+            return provider
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                provider = await run_in_threadpool(factory)
+                self._providers[key] = provider
+                logger.info(f"Created {type(provider).__name__} for {key[1]}/{key[2]}")
+        return provider
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    async def discard(self, kind: str, provider: str) -> int:
+        """
+        Close and forget the cached providers of one kind and provider, so
+        the next call builds them afresh; returns how many were dropped.
+        Callers still holding a dropped instance can finish with it.
+        """
+        keys = [key for key in self._providers if key[:2] == (kind, provider)]
+        for key in keys:
+            instance = self._providers.pop(key)
+            self._locks.pop(key, None)
+            try:
+                await instance.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing {type(instance).__name__}: {e}")
+        return len(keys)
+
+    async def close(self) -> None:
+        """Close every cached provider and forget them"""
+        providers = list(self._providers.values())
+        self._providers.clear()
+        self._locks.clear()
+        for provider in providers:
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing {type(provider).__name__}: {e}")
+
+
+_provider_registry: Optional[ProviderRegistry] = None
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get singleton provider registry"""
+    global _provider_registry
+    if _provider_registry is None:
+        _provider_registry = ProviderRegistry()
+    return _provider_registry
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..core import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost on top of the response text
+_ENTRY_OVERHEAD_BYTES = 128
+
+# Generation kwargs that select credentials or endpoints rather than the output
+_UNKEYED_ARGS = frozenset({"llm_api_key"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def response_key(provider: str, model: str, strategy: str, prompt: str, options: Dict[str, Any]) -> bytes:
+    """Digest of everything that determines an LLM response"""
+    keyed = {name: value for name, value in options.items() if name not in _UNKEYED_ARGS}
+    payload = json.dumps(
+        [provider, model, strategy, prompt, keyed], sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).digest()[:16]
+
+
+@dataclass
+class ResponseCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    memory_entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class ResponseCache:
+    """
+    Two-tier cache of parsed LLM responses keyed by response_key().
+
+    Values are stored as JSON, so every hit returns a fresh copy callers may
+    modify. An in-memory LRU bounded by ``max_memory_bytes`` sits in front of
+    a SQLite table holding at most ``max_entries`` rows; the least recently
+    used rows are pruned beyond that. Entries older than ``ttl_seconds``
+    (0 = never) are treated as misses and deleted. ``path=None`` keeps the
+    cache in memory only.
+
+    Disk methods block and are meant to run in the threadpool.
+    """
+
+    def __init__(self, path: Optional[Path], max_memory_bytes: int, max_entries: int, ttl_seconds: float):
+        self.path = Path(path) if path else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = ResponseCacheStats()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache store unavailable, using memory only: {e}")
+                self._conn = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def _remember(self, key: bytes, value: str, created: float) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[0]) + _ENTRY_OVERHEAD_BYTES
+        self._memory[key] = (value, created)
+        self._memory_bytes += len(value) + _ENTRY_OVERHEAD_BYTES
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted) + _ENTRY_OVERHEAD_BYTES
+
+    def get_memory(self, key: bytes) -> Optional[Any]:
+        """Look a response up in the in-memory tier only; cheap enough for the event loop"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if self._expired(created, time.time()):
+                self._memory_bytes -= len(self._memory.pop(key)[0]) + _ENTRY_OVERHEAD_BYTES
+                return None
+            self._memory.move_to_end(key)
+            self._stats.memory_hits += 1
+        return json.loads(value)
+
+    def get_disk(self, key: bytes) -> Optional[Any]:
+        """Look a response up on disk, promoting hits to memory; counts misses"""
+        now = time.time()
+        row = None
+        with self._db_lock:
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    with self._lock:
+                        self._stats.expired += 1
+                    row = None
+                elif row is not None:
+                    self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+
+        with self._lock:
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self._stats.disk_hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: bytes, response: Any) -> None:
+        """Store a parsed response in both tiers"""
+        value = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        with self._db_lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.max_entries > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> ResponseCacheStats:
+        with self._lock:
+            return ResponseCacheStats(
+                **{
+                    **asdict(self._stats),
+                    "memory_entries": len(self._memory),
+                    "memory_bytes": self._memory_bytes,
+                }
+            )
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get singleton LLM response cache, or None when caching is disabled"""
+    global _response_cache
+    if _response_cache is None and settings.LLM_CACHE_ENABLED:
+        _response_cache = ResponseCache(
+            Path(settings.LLM_CACHE_PATH) if settings.LLM_CACHE_PATH else None,
+            settings.LLM_CACHE_MEMORY_MB * 1024 * 1024,
+            settings.LLM_CACHE_MAX_ENTRIES,
+            settings.LLM_CACHE_TTL_HOURS * 3600,
+        )
+    return _response_cache
@@ -0,0 +1,76 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, List, Sequence, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same result instead of repeating it. Errors
+    reach every waiter. The work is shielded from its waiters: cancelling
+    one (e.g. a client disconnecting) never cancels the shared call, which
+    runs to completion for the others. Keys are forgotten as soon as their
+    call finishes, so nothing is cached here.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Result of ``factory()``, shared with concurrent callers of ``key``"""
+
+        async def run(_: List[Hashable]) -> List[T]:
+            return [await factory()]
+
+        return (await self.do_many([key], run))[0]
+
+    async def do_many(
+        self,
+        keys: Sequence[Hashable],
+        factory: Callable[[List[Hashable]], Awaitable[List[T]]],
+    ) -> List[T]:
+        """
+        Results for ``keys``, in order. Keys already in flight are joined;
+        the rest are computed together by one ``factory(missing_keys)``
+        call, which must return one result per key.
+        """
+        loop = asyncio.get_running_loop()
+        owned: Dict[Hashable, asyncio.Future] = {}
+        for key in keys:
+            if key not in self._inflight:
+                owned[key] = self._inflight[key] = loop.create_future()
+        futures = [self._inflight[key] for key in keys]
+        if owned:
+            task = loop.create_task(factory(list(owned)))
+            self._tasks.add(task)
+            task.add_done_callback(partial(self._settle, owned))
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def _settle(self, owned: Dict[Hashable, asyncio.Future], task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        for key, future in owned.items():
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if task.cancelled():
+            for future in owned.values():
+                future.cancel()
+            return
+        error = task.exception()
+        results = task.result() if error is None else []
+        if error is None and len(results) != len(owned):
+            error = RuntimeError(f"Expected {len(owned)} results, got {len(results)}")
+        if error is not None:
+            for future in owned.values():
+                future.set_exception(error)
+            return
+        for future, result in zip(owned.values(), results):
+            future.set_result(result)
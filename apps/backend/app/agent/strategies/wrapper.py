@@ -1,11 +1,22 @@
 import json
 import logging
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, ValidationError
 
 from .base import Strategy
 from ..providers.base import Provider
 from ..exceptions import StrategyError
+from ..structured_output import (
+    INVALID,
+    PARSE_FAILED,
+    PARSED,
+    REPAIRED,
+    record_structured_output,
+    response_schema,
+)
+from ...core import settings
 
 
 logger = logging.getLogger(__name__)
@@ -16,18 +27,68 @@ FENCE_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
 
 class JSONWrapper(Strategy):
     async def __call__(
-        self, prompt: str, provider: Provider, **generation_args: Any
-    ) -> Dict[str, Any]:
+        self,
+        prompt: str,
+        provider: Provider,
+        response_model: Optional[Type[BaseModel]] = None,
+        prompt_type: Optional[str] = None,
+        **generation_args: Any,
+    ) -> Union[Dict[str, Any], BaseModel]:
         """
         Wrapper strategy to format the prompt as JSON with the help of LLM.
+
+        With a ``response_model``, providers that support constrained
+        decoding are given its JSON schema, and the response is validated
+        straight into the model (raising pydantic's ValidationError if it
+        does not conform). Responses that are not bare JSON are repaired
+        where possible. Outcomes are counted per ``prompt_type``.
         """
+        constrained = (
+            response_model is not None
+            and settings.LLM_CONSTRAINED_JSON
+            and provider.supports_json_schema
+        )
+        if constrained:
+            generation_args["json_schema"] = response_schema(response_model)
         response = await provider(prompt, **generation_args)
         response = response.strip()
         logger.info(f"provider response: {response}")
 
+        prompt_type = prompt_type or (response_model.__name__ if response_model else "untyped")
+        if response_model is not None:
+            try:
+                result = response_model.model_validate_json(response)
+            except ValidationError as e:
+                if e.errors()[0]["type"] != "json_invalid":
+                    record_structured_output(prompt_type, INVALID, constrained)
+                    raise
+            else:
+                record_structured_output(prompt_type, PARSED, constrained)
+                return result
+
+        try:
+            data, repaired = self._parse(response)
+        except StrategyError:
+            record_structured_output(prompt_type, PARSE_FAILED, constrained)
+            raise
+        if response_model is not None:
+            try:
+                data = response_model.model_validate(data)
+            except ValidationError:
+                record_structured_output(prompt_type, INVALID, constrained)
+                raise
+        record_structured_output(prompt_type, REPAIRED if repaired else PARSED, constrained)
+        return data
+
+    @staticmethod
+    def _parse(response: str) -> Tuple[Any, bool]:
+        """
+        Parse the JSON in a response; the flag is set when it had to be
+        dug out of surrounding text.
+        """
         # 1) Try direct parse first
         try:
-            return json.loads(response)
+            return json.loads(response), False
         except json.JSONDecodeError:
             pass
 
@@ -36,7 +97,7 @@ class JSONWrapper(Strategy):
         for fence_match in FENCE_PATTERN.finditer(response):
             fenced = fence_match.group(1).strip()
             try:
-                return json.loads(fenced)
+                return json.loads(fenced), True
             except json.JSONDecodeError:
                 continue
 
@@ -49,11 +110,11 @@ class JSONWrapper(Strategy):
 
         for _, candidate in candidates:
             try:
-                return json.loads(candidate)
+                return json.loads(candidate), True
             except json.JSONDecodeError:
                 candidate2 = candidate.replace("```", "").strip()
                 try:
-                    return json.loads(candidate2)
+                    return json.loads(candidate2), True
                 except json.JSONDecodeError:
                     continue
 
@@ -75,10 +136,16 @@ class JSONWrapper(Strategy):
 
 class MDWrapper(Strategy):
     async def __call__(
-        self, prompt: str, provider: Provider, **generation_args: Any
+        self,
+        prompt: str,
+        provider: Provider,
+        prompt_type: Optional[str] = None,
+        **generation_args: Any,
     ) -> Dict[str, Any]:
         """
         Wrapper strategy to format the prompt as Markdown with the help of LLM.
+
+        ``prompt_type`` is accepted for parity with JSONWrapper and unused.
         """
         logger.info(f"prompt given to provider: \n{prompt}")
         response = await provider(prompt, **generation_args)
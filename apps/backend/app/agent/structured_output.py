@@ -0,0 +1,59 @@
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel
+
+# How a JSON response was turned into the target model
+PARSED = "parsed"  # Valid JSON as returned
+REPAIRED = "repaired"  # Needed fence stripping or brace slicing first
+PARSE_FAILED = "parse_failed"  # No JSON object could be recovered
+INVALID = "invalid"  # JSON did not validate against the model
+OUTCOMES = (PARSED, REPAIRED, PARSE_FAILED, INVALID)
+
+
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema of a response model, built once per model"""
+    return model.model_json_schema()
+
+
+@dataclass
+class StructuredOutputStats:
+    prompt_type: str
+    calls: int = 0
+    constrained: int = 0
+    parsed: int = 0
+    repaired: int = 0
+    parse_failed: int = 0
+    invalid: int = 0
+
+    @property
+    def failure_rate(self) -> float:
+        return round((self.parse_failed + self.invalid) / self.calls, 4) if self.calls else 0.0
+
+    @property
+    def repair_rate(self) -> float:
+        return round(self.repaired / self.calls, 4) if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "failure_rate": self.failure_rate, "repair_rate": self.repair_rate}
+
+
+_stats: Dict[str, StructuredOutputStats] = {}
+
+
+def record_structured_output(prompt_type: str, outcome: str, constrained: bool) -> None:
+    """Count one JSON generation for ``prompt_type``"""
+    if outcome not in OUTCOMES:
+        raise ValueError(f"Unknown structured output outcome {outcome!r}")
+    stats = _stats.get(prompt_type)
+    if stats is None:
+        stats = _stats[prompt_type] = StructuredOutputStats(prompt_type)
+    stats.calls += 1
+    stats.constrained += constrained
+    setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+
+def structured_output_stats() -> List[StructuredOutputStats]:
+    return [StructuredOutputStats(**asdict(stats)) for stats in _stats.values()]
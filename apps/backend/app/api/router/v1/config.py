@@ -3,8 +3,29 @@ from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, status
 
+from app.agent import (
+    admission_stats,
+    agent_metrics,
+    get_embedding_cache,
+    get_response_cache,
+    provider_target_stats,
+    structured_output_stats,
+)
 from app.core.config import settings
-from app.schemas.pydantic import LLMApiKeyResponse, LLMApiKeyUpdate
+from app.schemas.pydantic import (
+    EmbeddingCacheStatsResponse,
+    LLMApiKeyResponse,
+    LLMCacheStatsResponse,
+    LLMApiKeyUpdate,
+    ProviderQueueStats,
+    ProviderQueuesResponse,
+    PromptOutputStats,
+    StructuredOutputStatsResponse,
+    LLMProviderHealth,
+    LLMProvidersResponse,
+    AgentCallStats,
+    AgentMetricsResponse,
+)
 
 
 config_router = APIRouter(prefix="/config", tags=["config"])
@@ -54,3 +75,46 @@ async def update_llm_api_key(payload: LLMApiKeyUpdate) -> LLMApiKeyResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to persist API key.",
         ) from exc
+
+
+@config_router.get("/embedding-cache", response_model=EmbeddingCacheStatsResponse)
+async def get_embedding_cache_stats() -> EmbeddingCacheStatsResponse:
+    cache = get_embedding_cache()
+    if cache is None:
+        return EmbeddingCacheStatsResponse(enabled=False)
+    return EmbeddingCacheStatsResponse(enabled=True, **cache.stats().to_dict())
+
+
+@config_router.get("/llm-cache", response_model=LLMCacheStatsResponse)
+async def get_llm_cache_stats() -> LLMCacheStatsResponse:
+    cache = get_response_cache()
+    if cache is None:
+        return LLMCacheStatsResponse(enabled=False)
+    return LLMCacheStatsResponse(enabled=True, **cache.stats().to_dict())
+
+@config_router.get("/provider-queues", response_model=ProviderQueuesResponse)
+async def get_provider_queue_stats() -> ProviderQueuesResponse:
+    return ProviderQueuesResponse(
+        providers=[ProviderQueueStats(**stats.to_dict()) for stats in admission_stats()]
+    )
+
+@config_router.get("/llm-providers", response_model=LLMProvidersResponse)
+async def get_llm_provider_health() -> LLMProvidersResponse:
+    return LLMProvidersResponse(
+        fallbacks=settings.LLM_FALLBACKS,
+        providers=[LLMProviderHealth(**stats.to_dict()) for stats in provider_target_stats()],
+    )
+
+@config_router.get("/agent-metrics", response_model=AgentMetricsResponse)
+async def get_agent_metrics() -> AgentMetricsResponse:
+    return AgentMetricsResponse(
+        sink=settings.AGENT_METRICS_DB_PATH,
+        calls=[AgentCallStats(**stats.to_dict()) for stats in agent_metrics()],
+    )
+
+@config_router.get("/structured-output", response_model=StructuredOutputStatsResponse)
+async def get_structured_output_stats() -> StructuredOutputStatsResponse:
+    return StructuredOutputStatsResponse(
+        constrained_decoding=settings.LLM_CONSTRAINED_JSON,
+        prompts=[PromptOutputStats(**stats.to_dict()) for stats in structured_output_stats()],
+    )
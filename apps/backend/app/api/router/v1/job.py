@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Request, status, Query
 from fastapi.responses import JSONResponse
 
 from app.core import get_db_session
+from app.agent.exceptions import ProviderOverloadedError
 from app.services import JobService, JobNotFoundError
 from app.schemas.pydantic.job import JobUploadRequest
 
@@ -55,6 +56,10 @@ async def upload_job(
             detail=str(e),
         )
 
+    except ProviderOverloadedError:
+        # Answered with 503 and Retry-After by the app-wide exception handler
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
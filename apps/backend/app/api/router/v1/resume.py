@@ -17,6 +17,7 @@ from fastapi import (
 )
 
 from app.core import get_db_session
+from app.agent.exceptions import ProviderOverloadedError
 from app.services import (
     ResumeService,
     ScoreImprovementService,
@@ -113,6 +114,9 @@ async def upload_resume(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e),
         )
+    except ProviderOverloadedError:
+        # Answered with 503 and Retry-After by the app-wide exception handler
+        raise
     except Exception as e:
         logger.error(
             f"Error processing file: {str(e)} - traceback: {traceback.format_exc()}"
@@ -222,6 +226,9 @@ async def score_and_improve(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e),
         )
+    except ProviderOverloadedError:
+        # Answered with 503 and Retry-After by the app-wide exception handler
+        raise
     except Exception as e:
         logger.error(f"Error: {str(e)} - traceback: {traceback.format_exc()}")
         raise HTTPException(
@@ -3,14 +3,20 @@ import logging
 import csv
 import io
 import json
+import time
+from dataclasses import asdict
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core import get_db_session
+from app.agent import Priority, request_priority
 from app.services.skill_service import SkillExtractionService
 from app.services.job_matching_service import JobMatchingService
+from app.services.skill_search_service import SkillSearchService
+from app.services.candidate_search_service import get_candidate_index_service
+from app.services import TaxonomyReloadError, get_taxonomy_reload_service
 from app.schemas.pydantic.skill_profile import (
     SkillProfileModel,
     SkillActionRequest,
@@ -18,6 +24,13 @@ from app.schemas.pydantic.skill_profile import (
     JobMatchRequest,
     JobMatchResponse,
     SkillItem,
+    TaxonomyReloadResponse,
+    SkillSearchRequest,
+    SkillSearchResponse,
+    SkillCollectionSummary,
+    CandidateSearchRequest,
+    CandidateSearchResponse,
+    CandidateReindexResponse,
 )
 
 skills_router = APIRouter()
@@ -137,11 +150,128 @@ async def match_job(
         JobMatchResponse with match score, matched skills, and missing skills
     """
     service = JobMatchingService(db)
-    result = await service.match_job(request)
+    with request_priority(Priority.INTERACTIVE):
+        result = await service.match_job(request)
 
     return result
 
 
+@skills_router.post(
+    "/search",
+    response_model=SkillSearchResponse,
+    summary="Find profiles by skills and confidence"
+)
+async def search_profiles(
+    request: SkillSearchRequest,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Search the skill index for profiles having all (AND) or any (OR) of the
+    given skills above a confidence threshold
+
+    Args:
+        request: SkillSearchRequest with skills, operator, thresholds and paging
+
+    Returns:
+        SkillSearchResponse with the total hit count and the requested page
+    """
+    service = SkillSearchService(db)
+    return await service.search(request)
+
+
+@skills_router.get(
+    "/collections/summary",
+    response_model=SkillCollectionSummary,
+    summary="Share of digital, green and other ESCO collection skills across profiles"
+)
+async def collection_summary(
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Aggregate ESCO collection shares over every indexed skill profile
+
+    Returns:
+        SkillCollectionSummary with the mean per-profile share per collection
+    """
+    service = SkillSearchService(db)
+    return await service.collection_summary()
+
+
+@skills_router.post(
+    "/candidates/search",
+    response_model=CandidateSearchResponse,
+    summary="Find the profiles that best fit a job description"
+)
+async def search_candidates(
+    request: CandidateSearchRequest,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Shortlist profiles from the approximate resume and skill indexes and
+    rank them by similarity to the job text
+
+    Args:
+        request: CandidateSearchRequest with job_text, top_k and rerank
+
+    Returns:
+        CandidateSearchResponse with the ranked candidates
+    """
+    with request_priority(Priority.INTERACTIVE):
+        return await get_candidate_index_service().search(db, request)
+
+
+@skills_router.post(
+    "/candidates/reindex",
+    response_model=CandidateReindexResponse,
+    summary="Rebuild the candidate index from stored profiles"
+)
+async def reindex_candidates(
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Re-embed every stored resume and skill profile, e.g. after changing the
+    embedding model
+
+    Returns:
+        CandidateReindexResponse with the number of profiles indexed
+    """
+    started = time.perf_counter()
+    profiles = await get_candidate_index_service().rebuild(db)
+    return CandidateReindexResponse(
+        profiles=profiles,
+        duration_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+
+
+@skills_router.post(
+    "/taxonomy/reload",
+    response_model=TaxonomyReloadResponse,
+    summary="Reload the skill taxonomy without restarting"
+)
+async def reload_taxonomy(
+    force: bool = Query(False, description="Apply the new taxonomy even if it drops many skills")
+):
+    """
+    Rebuild the taxonomy mapper and matcher index from taxonomy_map.json and
+    swap them in. Requests already in flight finish on the previous taxonomy.
+
+    Args:
+        force: Skip the shrinkage safety check
+
+    Returns:
+        TaxonomyReloadResponse describing the installed taxonomy
+    """
+    try:
+        result = await get_taxonomy_reload_service().reload(force=force)
+    except TaxonomyReloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    return TaxonomyReloadResponse(**asdict(result))
+
+
 @skills_router.get(
     "/export/{profile_id}",
     summary="Export skill profile in various formats"
@@ -1,4 +1,5 @@
 import os
+import logging
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
@@ -15,15 +16,43 @@ from .core import (
     custom_http_exception_handler,
     validation_exception_handler,
     unhandled_exception_handler,
+    provider_overloaded_exception_handler,
+)
+from .agent.exceptions import ProviderOverloadedError
+from .agent import (
+    get_embedding_cache,
+    get_metrics_registry,
+    get_provider_registry,
+    get_response_cache,
+    warm_up_providers,
 )
 from .models import Base
+from .services import get_candidate_index_service, get_taxonomy_reload_service
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    taxonomy_reloader = get_taxonomy_reload_service()
+    taxonomy_reloader.start_watching()
+    if settings.PROVIDER_WARMUP:
+        await warm_up_providers()
     yield
+    await taxonomy_reloader.stop_watching()
+    await get_provider_registry().close()
+    embedding_cache = get_embedding_cache()
+    if embedding_cache is not None:
+        logger.info(f"Embedding cache: {embedding_cache.stats().to_dict()}")
+        embedding_cache.close()
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        logger.info(f"LLM response cache: {response_cache.stats().to_dict()}")
+        response_cache.close()
+    get_candidate_index_service().close()
+    get_metrics_registry().close()
     await async_engine.dispose()
 
 
@@ -54,6 +83,7 @@ def create_app() -> FastAPI:
 
     app.add_exception_handler(HTTPException, custom_http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(ProviderOverloadedError, provider_overloaded_exception_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
 
     if os.path.exists(settings.FRONTEND_PATH):
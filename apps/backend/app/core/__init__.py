@@ -4,6 +4,7 @@ from .exceptions import (
     custom_http_exception_handler,
     validation_exception_handler,
     unhandled_exception_handler,
+    provider_overloaded_exception_handler,
 )
 
 
@@ -17,4 +18,5 @@ __all__ = [
     "custom_http_exception_handler",
     "validation_exception_handler",
     "unhandled_exception_handler",
+    "provider_overloaded_exception_handler",
 ]
@@ -2,7 +2,7 @@ import os
 import sys
 import logging
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 
 _BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
@@ -28,6 +28,46 @@ class Settings(BaseSettings):
     EMBEDDING_API_KEY: Optional[str] = None
     EMBEDDING_BASE_URL: Optional[str] = None
     EMBEDDING_MODEL: Optional[str] = "dengcao/Qwen3-Embedding-0.6B:Q8_0"
+    HASHING_EMBEDDING_DIM: int = 1024  # Vector size of the offline "hashing" embedding provider
+    ONNX_EMBEDDING_THREADS: int = 0  # Intra-op threads of the "onnx" embedding provider; 0 lets ONNX Runtime decide
+    ONNX_EMBEDDING_MAX_LENGTH: int = 512  # Tokens kept per text before truncation
+    ONNX_EMBEDDING_POOLING: str = "mean"  # mean, cls or last (e.g. last for Qwen3-Embedding)
+    ONNX_EMBEDDING_BATCH_SIZE: int = 32  # Texts per inference run
+    SCORING_EMBEDDING_PROVIDER: Optional[str] = None  # e.g. "hashing" for fast resume/job keyword scores; defaults to EMBEDDING_PROVIDER
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: Optional[str] = os.path.join(_BACKEND_ROOT, "embedding_cache.db")  # None keeps the cache in memory only
+    EMBEDDING_CACHE_MEMORY_MB: int = 64  # Byte budget of the in-memory LRU tier
+    EMBEDDING_CACHE_DTYPE: str = "float32"  # Stored vector format: float32, or lossy float16/int8 (smaller, but cache hits score slightly differently)
+    EMBEDDING_BATCH_WINDOW_MS: float = 5.0  # How long concurrent embed calls are collected into one provider batch; 0 disables
+    EMBEDDING_BATCH_MAX_ITEMS: int = 0  # Texts that close a batch early; 0 uses the provider's batch limit
+    EMBEDDING_CHUNK_TOKENS: int = 384  # Approx. tokens per chunk when embedding long documents (resumes, drafts)
+    EMBEDDING_CHUNK_POOLING: str = "weighted"  # How chunk embeddings are combined: mean, or weighted by chunk length
+    LLM_FALLBACKS: List[str] = []  # "provider/model" entries (e.g. "openai/gpt-4.1-mini") hedged behind LLM_PROVIDER/LL_MODEL, in order
+    LLM_LATENCY_SLO_SECONDS: Dict[str, float] = {"default": 30.0}  # Per prompt type; caps the p95-based wait before a fallback is hedged in
+    LLM_BREAKER_FAILURES: int = 3  # Consecutive errors or lost slow calls that stop traffic to a provider; 0 disables the breaker
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 60.0  # Time before a tripped provider gets one trial call
+    LLM_PROMPT_TOKEN_BUDGET: int = 6000  # Approx. prompt tokens; resume/job text is trimmed to fit, other prompt parts never are; 0 = no limit
+    LLM_CONSTRAINED_JSON: bool = True  # Pass response schemas to providers with constrained decoding (Ollama format, OpenAI structured outputs)
+    LLM_CACHE_ENABLED: bool = True  # Reuse parsed LLM responses for identical (provider, model, options, prompt)
+    LLM_CACHE_PATH: Optional[str] = os.path.join(_BACKEND_ROOT, "llm_cache.db")  # None keeps the cache in memory only
+    LLM_CACHE_MEMORY_MB: int = 16  # Byte budget of the in-memory LRU tier
+    LLM_CACHE_MAX_ENTRIES: int = 5000  # Rows kept on disk; least recently used are pruned beyond this
+    LLM_CACHE_TTL_HOURS: float = 168.0  # Age after which a cached response is recomputed; 0 = never
+    AGENT_METRICS_DB_PATH: Optional[str] = None  # SQLite file every LLM/embedding call is appended to for offline analysis; None keeps metrics in memory only
+    PROVIDER_WARMUP: bool = True  # Create default LLM/embedding clients and check models at startup
+    PROVIDER_ASYNC_CLIENTS: bool = True  # Call providers through their async clients; False uses sync clients in the threadpool
+    PROVIDER_MAX_CONCURRENCY: int = 4  # In-flight LLM/embedding calls per provider endpoint; 0 = unlimited
+    PROVIDER_CONCURRENCY_LIMITS: Dict[str, int] = {"openai": 16, "hashing": 0}  # Per-provider overrides of PROVIDER_MAX_CONCURRENCY
+    PROVIDER_MAX_QUEUE: int = 64  # Calls allowed to wait per provider endpoint before new ones are rejected
+    PROVIDER_QUEUE_TIMEOUT: float = 120.0  # Seconds a call may wait for a provider slot unless its request sets a deadline
+    SCORE_IMPROVEMENT_CANDIDATES: int = 3  # Resume rewrites generated concurrently per improvement round; 1 = one at a time
+    SCORE_IMPROVEMENT_TARGET_GAIN: float = 0.05  # Similarity gain over the original that ends a round without waiting for the rest
+    SCORE_IMPROVEMENT_TEMPERATURES: List[float] = [0.4, 0.7, 1.0]  # Cycled across candidates; [] keeps the model's default (e.g. for models without temperature)
+    SKILL_EMBEDDING_MATCH_THRESHOLD: float = 0.8  # Min cosine similarity for the semantic resolve_phrase fallback
+    CANDIDATE_INDEX_PATH: Optional[str] = os.path.join(_BACKEND_ROOT, "candidate_index.db")  # None keeps the index in memory only
+    CANDIDATE_INDEX_NPROBE: int = 8  # Inverted lists scanned per candidate search query
+    CANDIDATE_INDEX_DTYPE: str = "int8"  # In-memory vector format; re-ranking always uses float32
+    TAXONOMY_WATCH_INTERVAL: float = 30.0  # Seconds between taxonomy_map.json change checks; 0 disables
     GITHUB_TOKEN: Optional[str] = None  # Optional GitHub Personal Access Token for higher API rate limits
 
     model_config = SettingsConfigDict(
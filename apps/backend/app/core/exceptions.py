@@ -4,7 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR, HTTP_503_SERVICE_UNAVAILABLE
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,7 @@ async def custom_http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "request_id": request_id},
+        headers=exc.headers,
     )
 
 
@@ -25,6 +26,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+async def provider_overloaded_exception_handler(request: Request, exc: Exception):
+    request_id = getattr(request.state, "request_id", "")
+    return JSONResponse(
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"Model provider busy, try again later: {exc}", "request_id": request_id},
+        headers={"Retry-After": "5"},
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", "")
     return JSONResponse(
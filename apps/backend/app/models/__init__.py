@@ -3,7 +3,7 @@ from .resume import ProcessedResume, Resume
 from .user import User
 from .job import ProcessedJob, Job
 from .association import job_resume_association
-from .skill_profile import SkillProfile, SkillAuditLog
+from .skill_profile import SkillProfile, SkillAuditLog, SkillPosting
 
 __all__ = [
     "Base",
@@ -15,4 +15,5 @@ __all__ = [
     "job_resume_association",
     "SkillProfile",
     "SkillAuditLog",
+    "SkillPosting",
 ]
@@ -1,6 +1,6 @@
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, text, Float, Boolean
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, text, Float, Boolean, Index, UniqueConstraint
 
 from .base import Base
 
@@ -43,6 +43,7 @@ class SkillProfile(Base):
     # Relationships
     resume = relationship("ProcessedResume", back_populates="skill_profile")
     audit_logs = relationship("SkillAuditLog", back_populates="profile", cascade="all, delete-orphan")
+    postings = relationship("SkillPosting", back_populates="profile", cascade="all, delete-orphan")
 
 
 class SkillAuditLog(Base):
@@ -71,3 +72,31 @@ class SkillAuditLog(Base):
 
     # Relationships
     profile = relationship("SkillProfile", back_populates="audit_logs")
+
+
+class SkillPosting(Base):
+    """
+    Inverted index entry mapping a skill (ESCO ID or canonical name) to a
+    profile that has it. Kept in sync with SkillProfile.skills so skill
+    searches never need to load the profile JSON blobs.
+    """
+    __tablename__ = "skill_postings"
+    __table_args__ = (
+        UniqueConstraint("profile_id", "skill_key", name="uq_skill_postings_profile_skill"),
+        Index("ix_skill_postings_key_status_confidence", "skill_key", "status", "confidence"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    skill_key = Column(String, nullable=False)  # ESCO ID, or lower-cased canonical name
+    profile_id = Column(
+        String,
+        ForeignKey("skill_profiles.profile_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    skill_name = Column(String, nullable=False)
+    confidence = Column(Float, nullable=False)
+    status = Column(String, nullable=False)  # mirrors SkillItem.manual_status
+
+    # Relationships
+    profile = relationship("SkillProfile", back_populates="postings")
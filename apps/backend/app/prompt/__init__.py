@@ -1,4 +1,5 @@
 from .base import PromptFactory
+from .builder import PromptBuilder
 
 prompt_factory = PromptFactory()
-__all__ = ["prompt_factory"]
+__all__ = ["prompt_factory", "PromptBuilder"]
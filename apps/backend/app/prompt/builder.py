@@ -0,0 +1,121 @@
+import logging
+import re
+from typing import Any, Dict, Optional, Sequence, Union
+
+from app.core import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in English text for providers without a local tokenizer
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_NOTE = "[... truncated to fit the prompt budget]"
+
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+FieldKey = Union[int, str]
+
+
+def _openai_encoding(model: Optional[str]) -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+class PromptBuilder:
+    """
+    Fills prompt templates within a token budget.
+
+    Tokens are counted with the provider's tokenizer where one is available
+    locally (tiktoken for OpenAI models, if installed) and estimated at
+    about four characters per token otherwise. Fields named as trimmable
+    have their whitespace compacted and, when the prompt is over budget,
+    are cut at line boundaries; the space left by the fixed parts of the
+    prompt is shared between them so that short fields stay whole and the
+    longest ones give way first.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[str] = settings.LLM_PROVIDER,
+        model: Optional[str] = settings.LL_MODEL,
+        budget: int = settings.LLM_PROMPT_TOKEN_BUDGET,
+    ) -> None:
+        self.provider = provider
+        self.budget = budget
+        self._encoding = _openai_encoding(model) if provider == "openai" else None
+
+    def count_tokens(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    @staticmethod
+    def compact(text: str) -> str:
+        """Strip trailing spaces and collapse runs of blank lines"""
+        return _BLANK_RUNS.sub("\n\n", _TRAILING_SPACE.sub("\n", text.strip() + "\n")).strip()
+
+    def trim(self, text: str, max_tokens: int) -> str:
+        """Keep the leading lines of ``text`` that fit in ``max_tokens``"""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        remaining = max_tokens - self.count_tokens(TRUNCATION_NOTE) - 1
+        kept = []
+        for line in text.split("\n"):
+            cost = self.count_tokens(line) + 1
+            if cost > remaining:
+                if not kept and remaining > 0:
+                    # A single overlong line: keep its proportional prefix
+                    kept.append(line[: remaining * len(line) // cost])
+                break
+            kept.append(line)
+            remaining -= cost
+        return "\n".join(kept + [TRUNCATION_NOTE])
+
+    @staticmethod
+    def _share(sizes: Dict[FieldKey, int], available: int) -> Dict[FieldKey, int]:
+        """Split ``available`` tokens, giving small fields all they need first"""
+        allowances: Dict[FieldKey, int] = {}
+        remaining = max(available, 0)
+        ordered = sorted(sizes, key=sizes.get)
+        for position, key in enumerate(ordered):
+            allowance = min(sizes[key], remaining // (len(ordered) - position))
+            allowances[key] = allowance
+            remaining -= allowance
+        return allowances
+
+    def build(self, template: str, *args: Any, trimmable: Sequence[FieldKey] = (), **kwargs: Any) -> str:
+        """
+        ``template.format(*args, **kwargs)``, with the fields listed in
+        ``trimmable`` (positional indices or keyword names, all strings)
+        compacted and cut down until the prompt fits the budget.
+        """
+        args = list(args)
+        for key in trimmable:
+            if isinstance(key, int):
+                args[key] = self.compact(args[key])
+            else:
+                kwargs[key] = self.compact(kwargs[key])
+        prompt = template.format(*args, **kwargs)
+        total = self.count_tokens(prompt)
+        if self.budget <= 0 or not trimmable or total <= self.budget:
+            return prompt
+
+        fields = {key: args[key] if isinstance(key, int) else kwargs[key] for key in trimmable}
+        sizes = {key: self.count_tokens(value) for key, value in fields.items()}
+        allowances = self._share(sizes, self.budget - (total - sum(sizes.values())))
+        for key, value in fields.items():
+            trimmed = self.trim(value, allowances[key])
+            if isinstance(key, int):
+                args[key] = trimmed
+            else:
+                kwargs[key] = trimmed
+        prompt = template.format(*args, **kwargs)
+        logger.info(f"Prompt trimmed from ~{total} to ~{self.count_tokens(prompt)} tokens (budget {self.budget})")
+        return prompt
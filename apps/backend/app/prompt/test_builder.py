@@ -0,0 +1,66 @@
+"""Tests for filling prompt templates within a token budget"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.prompt.builder import TRUNCATION_NOTE, PromptBuilder
+
+TEMPLATE = "Instructions: compare these.\nJob:\n{job}\nResume:\n{resume}\n"
+
+
+def _builder(budget: int) -> PromptBuilder:
+    return PromptBuilder(provider="ollama", model="model", budget=budget)
+
+
+def _lines(prefix: str, count: int) -> str:
+    return "\n".join(f"{prefix} line {i:03d} with some words" for i in range(count))
+
+
+def test_prompt_within_budget_is_only_compacted():
+    builder = _builder(1000)
+    prompt = builder.build(TEMPLATE, trimmable=("job",), job="  first  \n\n\n\nsecond\t\n", resume="kept   as is")
+    assert prompt == "Instructions: compare these.\nJob:\nfirst\n\nsecond\nResume:\nkept   as is\n"
+
+
+def test_trimmed_prompt_fits_the_budget_and_keeps_fixed_text():
+    builder = _builder(300)
+    job, resume = _lines("job", 100), _lines("resume", 100)
+    prompt = builder.build(TEMPLATE, trimmable=("job", "resume"), job=job, resume=resume)
+
+    assert builder.count_tokens(prompt) <= 300
+    assert prompt.startswith("Instructions: compare these.\nJob:\njob line 000")
+    assert prompt.count(TRUNCATION_NOTE) == 2
+    # Fields are cut at line boundaries
+    assert "job line 000 with some words\n" in prompt
+
+
+def test_short_fields_stay_whole_while_long_ones_give_way():
+    builder = _builder(200)
+    short = "short job description"
+    prompt = builder.build(TEMPLATE, trimmable=("job", "resume"), job=short, resume=_lines("resume", 200))
+
+    assert builder.count_tokens(prompt) <= 200
+    assert f"Job:\n{short}\nResume:" in prompt
+    assert prompt.count(TRUNCATION_NOTE) == 1
+
+
+def test_positional_fields_and_fixed_fields_are_never_trimmed():
+    builder = _builder(60)
+    fixed = _lines("fixed", 10)
+    prompt = builder.build("{0}\n{1}", _lines("trim", 50), fixed, trimmable=(0,))
+    assert prompt.endswith(fixed)
+    assert TRUNCATION_NOTE in prompt
+
+
+def test_single_overlong_line_keeps_a_prefix():
+    builder = _builder(0)
+    trimmed = builder.trim("x" * 400, 30)
+    assert trimmed.startswith("x") and trimmed.endswith(TRUNCATION_NOTE)
+    assert builder.count_tokens(trimmed) <= 30
+
+
+def test_zero_budget_disables_trimming():
+    long_text = _lines("job", 500)
+    assert _builder(0).build("{job}", trimmable=("job",), job=long_text) == long_text
@@ -1,3 +1,4 @@
+import json
 import pkgutil
 import importlib
 from typing import Dict
@@ -8,6 +9,7 @@ from app.schemas.json import __path__ as schema_pkg_path
 class JSONSchemaFactory:
     def __init__(self) -> None:
         self._schema: Dict[str, str] = {}
+        self._compact: Dict[str, str] = {}
         self._discover()
 
     def _discover(self) -> None:
@@ -18,6 +20,10 @@ class JSONSchemaFactory:
             module = importlib.import_module(f"app.schemas.json.{module_name}")
             if hasattr(module, "SCHEMA"):
                 self._schema[module_name] = getattr(module, "SCHEMA")
+                # Serialised once: prompts embed the schema on every call
+                self._compact[module_name] = json.dumps(
+                    self._schema[module_name], separators=(",", ":"), ensure_ascii=False
+                )
 
     def list_prompts(self) -> Dict[str, str]:
         return self._schema
@@ -29,3 +35,8 @@ class JSONSchemaFactory:
             raise KeyError(
                 f"SCHEMA '{name}' not found. Available schemas: {list(self._schema.keys())}"
             )
+
+    def get_compact(self, name: str) -> str:
+        """The schema as minified JSON, ready to embed in a prompt"""
+        self.get(name)
+        return self._compact[name]
@@ -4,7 +4,20 @@ from .resume_preview import ResumePreviewerModel
 from .resume_analysis import ResumeAnalysisModel
 from .structured_resume import StructuredResumeModel
 from .resume_improvement import ResumeImprovementRequest
-from .config import LLMApiKeyResponse, LLMApiKeyUpdate
+from .config import (
+    LLMApiKeyResponse,
+    LLMApiKeyUpdate,
+    EmbeddingCacheStatsResponse,
+    LLMCacheStatsResponse,
+    ProviderQueueStats,
+    ProviderQueuesResponse,
+    PromptOutputStats,
+    StructuredOutputStatsResponse,
+    LLMProviderHealth,
+    LLMProvidersResponse,
+    AgentCallStats,
+    AgentMetricsResponse,
+)
 
 __all__ = [
     "JobUploadRequest",
@@ -15,4 +28,14 @@ __all__ = [
     "ResumeAnalysisModel",
     "LLMApiKeyResponse",
     "LLMApiKeyUpdate",
+    "EmbeddingCacheStatsResponse",
+    "LLMCacheStatsResponse",
+    "ProviderQueueStats",
+    "ProviderQueuesResponse",
+    "PromptOutputStats",
+    "StructuredOutputStatsResponse",
+    "LLMProviderHealth",
+    "LLMProvidersResponse",
+    "AgentCallStats",
+    "AgentMetricsResponse",
 ]
@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -7,3 +9,100 @@ class LLMApiKeyResponse(BaseModel):
 
 class LLMApiKeyUpdate(BaseModel):
     api_key: str = Field(default="", description="Updated LLM API key value")
+
+
+class EmbeddingCacheStatsResponse(BaseModel):
+    enabled: bool = Field(..., description="Whether embedding caching is enabled")
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    hit_ratio: float = Field(default=0.0, description="Share of lookups served from either tier")
+    bytes_saved: int = Field(default=0, description="float32 vector bytes served from cache instead of the provider")
+    memory_entries: int = 0
+    memory_bytes: int = 0
+
+
+class LLMCacheStatsResponse(BaseModel):
+    enabled: bool = Field(..., description="Whether LLM response caching is enabled")
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = Field(default=0, description="Stored responses dropped for exceeding the TTL")
+    hit_ratio: float = Field(default=0.0, description="Share of lookups served from either tier")
+    memory_entries: int = 0
+    memory_bytes: int = 0
+
+class ProviderQueueStats(BaseModel):
+    name: str = Field(..., description="Provider and endpoint the limit applies to")
+    limit: int = Field(..., description="Max concurrent calls; 0 means unlimited")
+    in_flight: int = 0
+    queued: int = Field(default=0, description="Calls currently waiting for a slot")
+    max_queued: int = Field(default=0, description="Highest queue depth seen")
+    admitted: int = 0
+    rejected: int = Field(default=0, description="Calls refused because the queue was full")
+    expired: int = Field(default=0, description="Calls whose deadline passed while queued")
+    wait_seconds: float = Field(default=0.0, description="Total time admitted calls spent queued")
+    max_wait_seconds: float = 0.0
+    mean_wait_ms: float = 0.0
+
+
+class ProviderQueuesResponse(BaseModel):
+    providers: List[ProviderQueueStats] = Field(default_factory=list)
+
+
+class PromptOutputStats(BaseModel):
+    prompt_type: str = Field(..., description="Prompt the JSON responses were generated for")
+    calls: int = 0
+    constrained: int = Field(default=0, description="Calls decoded against the response schema by the provider")
+    parsed: int = Field(default=0, description="Responses that were valid JSON as returned")
+    repaired: int = Field(default=0, description="Responses whose JSON had to be extracted from surrounding text")
+    parse_failed: int = Field(default=0, description="Responses with no recoverable JSON")
+    invalid: int = Field(default=0, description="Responses that failed schema validation")
+    failure_rate: float = 0.0
+    repair_rate: float = 0.0
+
+
+class LLMProviderHealth(BaseModel):
+    name: str = Field(..., description="Provider and model, as in LLM_FALLBACKS")
+    state: str = Field(..., description="Circuit breaker state: closed, open or half_open")
+    consecutive_failures: int = 0
+    calls: int = 0
+    wins: int = Field(default=0, description="Calls whose result was used")
+    failures: int = Field(default=0, description="Calls that failed with a provider error")
+    slow: int = Field(default=0, description="Calls beaten by a hedged provider after their deadline")
+    hedged: int = Field(default=0, description="Calls started while another provider was still running")
+    opened: int = Field(default=0, description="Times the circuit breaker tripped")
+    p95_seconds: Dict[str, float] = Field(default_factory=dict, description="Recent p95 latency per prompt type")
+
+
+class LLMProvidersResponse(BaseModel):
+    fallbacks: List[str] = Field(default_factory=list, description="Providers hedged behind the primary, in order")
+    providers: List[LLMProviderHealth] = Field(default_factory=list)
+
+
+class AgentCallStats(BaseModel):
+    kind: str = Field(..., description="llm or embedding")
+    provider: str
+    model: str
+    prompt: str = Field(..., description="Prompt type of the calls, '-' when unlabelled")
+    calls: int = 0
+    errors: int = 0
+    cached: int = Field(default=0, description="Calls answered entirely from cache")
+    coalesced: int = Field(default=0, description="Calls that joined an identical call in flight; its record holds the tokens")
+    input_tokens: int = Field(default=0, description="Provider-reported for LLMs, estimated for embeddings")
+    output_tokens: int = 0
+    retries: int = Field(default=0, description="Extra provider attempts from hedging or failover")
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    latency_ms_p50: float = Field(default=0.0, description="Over recent calls")
+    latency_ms_p95: float = Field(default=0.0, description="Over recent calls")
+
+
+class AgentMetricsResponse(BaseModel):
+    sink: Optional[str] = Field(default=None, description="SQLite file call records are written to, if any")
+    calls: List[AgentCallStats] = Field(default_factory=list)
+
+
+class StructuredOutputStatsResponse(BaseModel):
+    constrained_decoding: bool = Field(..., description="Whether response schemas are passed to providers")
+    prompts: List[PromptOutputStats] = Field(default_factory=list)
@@ -39,6 +39,10 @@ class SkillProfileModel(BaseModel):
         default_factory=lambda: {"share_github": True, "share_linkedin": True, "mask_pii": True},
         description="Privacy preferences"
     )
+    collection_shares: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Share of non-rejected skills in each ESCO collection (digital, green, ...)"
+    )
     created_at: datetime = Field(..., description="Profile creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -93,6 +97,98 @@ class JobMatchResponse(BaseModel):
     recommendations: List[str] = Field(default_factory=list, description="Suggested improvements")
 
 
+class SkillSearchTerm(BaseModel):
+    """One skill condition in a profile search"""
+    name: str = Field(..., description="Skill name, alias or ESCO ID")
+    min_confidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Overrides the request-wide minimum for this skill")
+
+
+class SkillSearchRequest(BaseModel):
+    """Find profiles by the skills they contain"""
+    skills: List[SkillSearchTerm] = Field(..., min_length=1, max_length=50, description="Skills to search for")
+    operator: Literal["and", "or"] = Field(default="and", description="Require all skills (and) or any of them (or)")
+    min_confidence: float = Field(default=0.0, ge=0.0, le=1.0, description="Minimum confidence for every skill")
+    statuses: List[Literal["suggested", "accepted", "rejected", "edited"]] = Field(
+        default_factory=lambda: ["suggested", "accepted", "edited"],
+        description="Skill statuses that count as a match"
+    )
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=20, ge=1, le=200)
+
+
+class SkillSearchMatch(BaseModel):
+    """A searched skill found in a profile"""
+    name: str
+    skill_key: str
+    confidence: float
+    status: str
+
+
+class SkillSearchHit(BaseModel):
+    """A profile matching a skill search"""
+    profile_id: str
+    resume_id: Optional[str] = None
+    score: float = Field(..., description="Average confidence of the matched skills")
+    matched_skills: List[SkillSearchMatch] = Field(default_factory=list)
+
+
+class SkillSearchResponse(BaseModel):
+    """Paged skill search results"""
+    total: int
+    page: int
+    page_size: int
+    results: List[SkillSearchHit] = Field(default_factory=list)
+
+
+class SkillCollectionSummary(BaseModel):
+    """ESCO collection shares aggregated across skill profiles"""
+    profiles: int = Field(..., description="Profiles included in the aggregate")
+    collection_shares: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Mean per-profile share of skills in each ESCO collection"
+    )
+
+
+class CandidateSearchRequest(BaseModel):
+    """Request to find the profiles closest to a job description"""
+    job_text: str = Field(..., description="Job description text")
+    top_k: int = Field(10, ge=1, le=100, description="Number of candidates to return")
+    rerank: bool = Field(True, description="Re-score the shortlist exactly instead of using approximate scores")
+
+
+class CandidateHit(BaseModel):
+    """A profile returned by candidate search"""
+    profile_id: str
+    resume_id: Optional[str] = None
+    score: float = Field(..., description="Weighted resume and skill similarity")
+    resume_similarity: float = Field(..., description="Cosine similarity of job and resume text")
+    skill_similarity: Optional[float] = Field(
+        None, description="Cosine similarity of job skills and profile skills, when the job names any"
+    )
+
+
+class CandidateSearchResponse(BaseModel):
+    """Best matching profiles for a job description"""
+    job_skills: List[str] = Field(default_factory=list, description="Taxonomy skills found in the job text")
+    shortlisted: int = Field(..., description="Profiles scored after the approximate search")
+    duration_ms: float
+    results: List[CandidateHit] = Field(default_factory=list)
+
+
+class CandidateReindexResponse(BaseModel):
+    """Response after rebuilding the candidate index"""
+    profiles: int = Field(..., description="Profiles indexed")
+    duration_ms: float
+
+
+class TaxonomyReloadResponse(BaseModel):
+    """Response after reloading the skill taxonomy"""
+    skill_count: int = Field(..., description="Unique skills in the new taxonomy")
+    lookup_count: int = Field(..., description="Skill names and aliases available for lookup")
+    index_tokens: int = Field(..., description="Distinct leading tokens in the matcher index")
+    duration_ms: float = Field(..., description="Time spent building and validating the new taxonomy")
+
+
 class ExportFormat(str):
     """Supported export formats"""
     JSON = "json"
@@ -2,6 +2,8 @@ from .job_service import JobService
 from .resume_service import ResumeService
 from .score_improvement_service import ScoreImprovementService
 from .github_service import GitHubService, GitHubAPIError, GitHubRateLimitError
+from .taxonomy_reload_service import TaxonomyReloadService, get_taxonomy_reload_service
+from .candidate_search_service import CandidateIndexService, get_candidate_index_service
 from .exceptions import (
     ResumeNotFoundError,
     ResumeParsingError,
@@ -10,6 +12,7 @@ from .exceptions import (
     JobParsingError,
     ResumeKeywordExtractionError,
     JobKeywordExtractionError,
+    TaxonomyReloadError,
 )
 
 __all__ = [
@@ -26,4 +29,9 @@ __all__ = [
     "GitHubService",
     "GitHubAPIError",
     "GitHubRateLimitError",
+    "TaxonomyReloadService",
+    "TaxonomyReloadError",
+    "get_taxonomy_reload_service",
+    "CandidateIndexService",
+    "get_candidate_index_service",
 ]
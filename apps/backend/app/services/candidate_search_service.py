@@ -0,0 +1,331 @@
+"""Approximate nearest-neighbour search for candidate profiles matching a job"""
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.agent import EmbeddingManager, Priority, request_priority
+from app.core import settings
+from app.models import Resume, SkillProfile
+from app.schemas.pydantic.skill_profile import (
+    CandidateHit,
+    CandidateSearchRequest,
+    CandidateSearchResponse,
+)
+from app.skills import get_taxonomy_mapper
+from .skill_service import SkillMatcher
+from .vector_index import IVFIndex, VectorIndexStore
+
+logger = logging.getLogger(__name__)
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class CandidateIndexService:
+    """
+    Keeps two IVF indexes over skill profiles and answers "who fits this
+    job" queries from them.
+
+    The ``resume`` index holds one embedding of the resume text per profile,
+    the ``skill`` index the confidence-weighted mean of its non-rejected
+    skill name embeddings. The in-memory indexes may hold quantized vectors
+    (``dtype``); a search shortlists profiles from both of them and re-ranks
+    the shortlist exactly on the float32 vectors kept in the store.
+
+    Index mutations and searches run in the threadpool under one lock;
+    vectors are persisted as they change, so a restart only reloads them.
+    """
+
+    RESUME_INDEX = "resume"
+    SKILL_INDEX = "skill"
+    # Weight of resume-text similarity in the combined score; skills get the rest
+    RESUME_WEIGHT = 0.5
+    # Shortlist size per index, as a multiple of the requested top_k
+    SHORTLIST_FACTOR = 5
+
+    def __init__(self, store_path: Optional[Path] = None, nprobe: int = 8, dtype: str = "float32"):
+        self.store_path = store_path
+        self.nprobe = nprobe
+        self.dtype = dtype
+        self.embedding_manager = EmbeddingManager()
+        self._model = f"{settings.EMBEDDING_PROVIDER}/{settings.EMBEDDING_MODEL}"
+        self._store: Optional[VectorIndexStore] = None
+        self._indexes: Dict[str, IVFIndex] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        """Open the store and load both indexes; called with ``_lock`` held"""
+        if self._store is not None:
+            return
+        store = VectorIndexStore(self.store_path)
+        stored_model = store.get_meta("embedding_model")
+        if stored_model is not None and stored_model != self._model:
+            logger.info(
+                f"Candidate index was built with {stored_model}, not {self._model}; "
+                "clearing it, rebuild with POST /api/v1/skills/candidates/reindex"
+            )
+            store.clear()
+        store.set_meta("embedding_model", self._model)
+
+        for name in (self.RESUME_INDEX, self.SKILL_INDEX):
+            index = IVFIndex(nprobe=self.nprobe, dtype=self.dtype)
+            store.load(name, index)
+            self._indexes[name] = index
+        self._store = store
+        logger.info(
+            f"Loaded candidate index with {len(self._indexes[self.RESUME_INDEX])} profiles "
+            f"({sum(index.nbytes for index in self._indexes.values())} bytes of {self.dtype} vectors)"
+        )
+
+    @staticmethod
+    def _skill_terms(skills: Iterable[Dict]) -> Tuple[List[str], List[float]]:
+        names: List[str] = []
+        weights: List[float] = []
+        for skill in skills:
+            if skill.get("manual_status") == "rejected":
+                continue
+            names.append(skill.get("edited_name") or skill["name"])
+            weights.append(float(skill.get("confidence", 1.0)))
+        return names, weights
+
+    @staticmethod
+    def _weighted_mean(vectors: np.ndarray, weights: List[float]) -> Optional[np.ndarray]:
+        if not len(vectors):
+            return None
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        unit = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        if sum(weights) <= 0:
+            # e.g. every skill at zero confidence: fall back to a plain mean
+            weights = None
+        return _unit(np.average(unit, axis=0, weights=weights))
+
+    def _put(self, name: str, ids: List[str], vectors: np.ndarray) -> None:
+        """Add or replace vectors and persist them; called with ``_lock`` held"""
+        index = self._indexes[name]
+        centroids = index.centroids
+        index.add(ids, vectors)
+        self._store.upsert(name, ids, vectors)
+        if index.centroids is not centroids:
+            self._store.save_centroids(name, index.centroids)
+
+    def _delete(self, name: str, ids: List[str]) -> None:
+        if self._indexes[name].remove(ids):
+            self._store.delete(name, ids)
+
+    def _write(
+        self,
+        profile_ids: List[str],
+        resume_vectors: Optional[np.ndarray],
+        skill_vectors: List[Optional[np.ndarray]],
+    ) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            if resume_vectors is not None:
+                self._put(self.RESUME_INDEX, profile_ids, resume_vectors)
+            with_skills = [i for i, vector in enumerate(skill_vectors) if vector is not None]
+            if with_skills:
+                self._put(
+                    self.SKILL_INDEX,
+                    [profile_ids[i] for i in with_skills],
+                    np.stack([skill_vectors[i] for i in with_skills]),
+                )
+            self._delete(
+                self.SKILL_INDEX,
+                [profile_id for profile_id, vector in zip(profile_ids, skill_vectors) if vector is None],
+            )
+
+    async def _embed_profiles(
+        self, resume_texts: Optional[List[str]], skill_lists: List[Iterable[Dict]]
+    ) -> Tuple[Optional[np.ndarray], List[Optional[np.ndarray]]]:
+        """Embed resume texts and skill names of several profiles in one batch"""
+        terms = [self._skill_terms(skills) for skills in skill_lists]
+        texts = list(resume_texts or [])
+        for names, _ in terms:
+            texts.extend(names)
+        vectors = np.asarray(await self.embedding_manager.embed_many(texts), dtype=np.float32)
+
+        offset = len(resume_texts or [])
+        resume_vectors = vectors[:offset] if resume_texts else None
+        skill_vectors: List[Optional[np.ndarray]] = []
+        for names, weights in terms:
+            skill_vectors.append(self._weighted_mean(vectors[offset:offset + len(names)], weights))
+            offset += len(names)
+        return resume_vectors, skill_vectors
+
+    async def index_profile(self, profile_id: str, resume_text: str, skills: Iterable[Dict]) -> None:
+        """Add or replace a profile in both indexes"""
+        resume_vectors, skill_vectors = await self._embed_profiles([resume_text], [list(skills)])
+        await run_in_threadpool(self._write, [profile_id], resume_vectors, skill_vectors)
+
+    async def update_skills(self, profile_id: str, skills: Iterable[Dict]) -> None:
+        """Refresh a profile's skill vector after its skills changed"""
+        _, skill_vectors = await self._embed_profiles(None, [list(skills)])
+        await run_in_threadpool(self._write, [profile_id], None, skill_vectors)
+
+    def _exact_vectors(self, name: str, ids: List[str]) -> np.ndarray:
+        """Full-precision unit vectors for ``ids``; called with ``_lock`` held"""
+        index = self._indexes[name]
+        if index.dtype == "float32":
+            return index.get(ids)
+        stored = self._store.get(name, ids)
+        vectors = np.zeros((len(ids), index.dim), dtype=np.float32)
+        for position, item_id in enumerate(ids):
+            if item_id in stored:
+                vectors[position] = _unit(stored[item_id])
+        return vectors
+
+    def _rank(
+        self,
+        resume_query: np.ndarray,
+        skill_query: Optional[np.ndarray],
+        top_k: int,
+        rerank: bool,
+    ) -> Tuple[List[Tuple[str, float, float, Optional[float]]], int]:
+        with self._lock:
+            self._ensure_loaded()
+            resume_index = self._indexes[self.RESUME_INDEX]
+            skill_index = self._indexes[self.SKILL_INDEX]
+            shortlist_size = top_k * self.SHORTLIST_FACTOR
+
+            resume_hits = dict(resume_index.search(resume_query, shortlist_size))
+            skill_hits = (
+                dict(skill_index.search(skill_query, shortlist_size))
+                if skill_query is not None and skill_index.dim == len(skill_query)
+                else {}
+            )
+            # Only profiles with a resume vector can be scored on both parts
+            shortlist = [
+                profile_id
+                for profile_id in dict.fromkeys([*resume_hits, *skill_hits])
+                if profile_id in resume_index
+            ]
+            if not shortlist:
+                return [], 0
+
+            if rerank:
+                resume_scores = self._exact_vectors(self.RESUME_INDEX, shortlist) @ _unit(resume_query)
+                skill_scores = (
+                    self._exact_vectors(self.SKILL_INDEX, shortlist) @ _unit(skill_query)
+                    if skill_hits else None
+                )
+            else:
+                resume_scores = np.array([resume_hits.get(p, 0.0) for p in shortlist])
+                skill_scores = (
+                    np.array([skill_hits.get(p, 0.0) for p in shortlist]) if skill_hits else None
+                )
+
+        if skill_scores is None:
+            scores = resume_scores
+        else:
+            scores = self.RESUME_WEIGHT * resume_scores + (1 - self.RESUME_WEIGHT) * skill_scores
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            (
+                shortlist[i],
+                float(scores[i]),
+                float(resume_scores[i]),
+                float(skill_scores[i]) if skill_scores is not None else None,
+            )
+            for i in order
+        ], len(shortlist)
+
+    async def search(self, db: AsyncSession, request: CandidateSearchRequest) -> CandidateSearchResponse:
+        """Top-k profiles for a job text, embedding the text and its skills in one call"""
+        started = time.perf_counter()
+        matcher = SkillMatcher.shared(get_taxonomy_mapper())
+        job_skills = list(dict.fromkeys(match.entry.canonical_name for match in matcher.match(request.job_text)))
+
+        vectors = np.asarray(
+            await self.embedding_manager.embed_many([request.job_text, *job_skills]), dtype=np.float32
+        )
+        skill_query = self._weighted_mean(vectors[1:], [1.0] * len(job_skills))
+        ranked, shortlisted = await run_in_threadpool(
+            self._rank, vectors[0], skill_query, request.top_k, request.rerank
+        )
+
+        resume_ids: Dict[str, str] = {}
+        if ranked:
+            rows = await db.execute(
+                select(SkillProfile.profile_id, SkillProfile.resume_id).where(
+                    SkillProfile.profile_id.in_([profile_id for profile_id, *_ in ranked])
+                )
+            )
+            resume_ids = dict(rows.all())
+
+        return CandidateSearchResponse(
+            job_skills=job_skills,
+            shortlisted=shortlisted,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            results=[
+                CandidateHit(
+                    profile_id=profile_id,
+                    resume_id=resume_ids.get(profile_id),
+                    score=round(score, 4),
+                    resume_similarity=round(resume_score, 4),
+                    skill_similarity=round(skill_score, 4) if skill_score is not None else None,
+                )
+                for profile_id, score, resume_score, skill_score in ranked
+                # Profiles deleted from the database since they were indexed
+                if profile_id in resume_ids
+            ],
+        )
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._store.clear()
+            for name in (self.RESUME_INDEX, self.SKILL_INDEX):
+                self._indexes[name] = IVFIndex(nprobe=self.nprobe, dtype=self.dtype)
+
+    async def rebuild(self, db: AsyncSession, batch_size: int = 32) -> int:
+        """Re-embed every stored profile; returns profiles indexed"""
+        result = await db.execute(
+            select(SkillProfile.profile_id, Resume.content, SkillProfile.skills).join(
+                Resume, Resume.resume_id == SkillProfile.resume_id
+            )
+        )
+        rows = result.all()
+        await run_in_threadpool(self._reset)
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            # Queue behind interactive searches and job matches
+            with request_priority(Priority.BULK):
+                resume_vectors, skill_vectors = await self._embed_profiles(
+                    [content for _, content, _ in batch], [skills or [] for _, _, skills in batch]
+                )
+            await run_in_threadpool(
+                self._write, [profile_id for profile_id, _, _ in batch], resume_vectors, skill_vectors
+            )
+        logger.info(f"Rebuilt candidate index for {len(rows)} profiles")
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+                self._indexes = {}
+
+
+_candidate_index_service: Optional[CandidateIndexService] = None
+
+
+def get_candidate_index_service() -> CandidateIndexService:
+    """Get singleton candidate index service"""
+    global _candidate_index_service
+    if _candidate_index_service is None:
+        _candidate_index_service = CandidateIndexService(
+            Path(settings.CANDIDATE_INDEX_PATH) if settings.CANDIDATE_INDEX_PATH else None,
+            nprobe=settings.CANDIDATE_INDEX_NPROBE,
+            dtype=settings.CANDIDATE_INDEX_DTYPE,
+        )
+    return _candidate_index_service
@@ -108,3 +108,14 @@ class JobKeywordExtractionError(Exception):
             message = "Job keyword extraction failed. Cannot improve resume without job requirements."
         super().__init__(message)
         self.job_id = job_id
+
+
+class TaxonomyReloadError(Exception):
+    """
+    Exception raised when a freshly built taxonomy fails validation and is not installed.
+    """
+
+    def __init__(self, message: Optional[str] = None):
+        if not message:
+            message = "Taxonomy reload failed validation."
+        super().__init__(message)
@@ -13,7 +13,6 @@ from app.schemas.pydantic.skill_profile import (
     SkillItem,
 )
 from app.agent import EmbeddingManager
-from app.skills import get_taxonomy_mapper
 from .skill_service import SkillExtractionService
 
 logger = logging.getLogger(__name__)
@@ -22,11 +21,16 @@ logger = logging.getLogger(__name__)
 class JobMatchingService:
     """Service for matching user skills against job descriptions"""
 
+    # Minimum similarity for a job skill to count as matched
+    MATCH_THRESHOLD = 0.7
+    # Similarity floor when one skill name contains the other
+    NAME_MATCH_SCORE = 0.95
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self.embedding_manager = EmbeddingManager()
-        self.taxonomy_mapper = get_taxonomy_mapper()
         self.skill_service = SkillExtractionService(db)
+        self.taxonomy_mapper = self.skill_service.taxonomy_mapper
 
     async def match_job(self, request: JobMatchRequest) -> JobMatchResponse:
         """
@@ -153,38 +157,39 @@ class JobMatchingService:
     async def _get_skill_embeddings(
         self, skills: List[SkillItem]
     ) -> dict:
-        """Get embeddings for user skills"""
-        embeddings = {}
-        for skill in skills:
-            # Use skill name and evidence for richer embedding
-            text = f"{skill.name}: {' '.join([e.snippet[:100] for e in skill.evidence[:2]])}"
-            try:
-                embedding = await self.embedding_manager.embed(text)
-                embeddings[skill.name.lower()] = {
-                    "embedding": embedding,
-                    "skill": skill
-                }
-            except Exception as e:
-                logger.warning(f"Failed to get embedding for skill {skill.name}: {e}")
-
-        return embeddings
+        """Get embeddings for user skills in one batched request"""
+        # Use skill name and evidence for richer embedding
+        texts = [
+            f"{skill.name}: {' '.join([e.snippet[:100] for e in skill.evidence[:2]])}"
+            for skill in skills
+        ]
+        try:
+            vectors = await self.embedding_manager.embed_many(texts)
+        except Exception as e:
+            logger.warning(f"Failed to get embeddings for {len(skills)} user skills: {e}")
+            return {}
+
+        return {
+            skill.name.lower(): {"embedding": embedding, "skill": skill}
+            for skill, embedding in zip(skills, vectors)
+        }
 
     async def _get_job_skill_embeddings(
         self, job_skills: List[Tuple[str, str]]
     ) -> dict:
-        """Get embeddings for job skills"""
-        embeddings = {}
-        for skill_name, section in job_skills:
-            try:
-                embedding = await self.embedding_manager.embed(skill_name)
-                embeddings[skill_name.lower()] = {
-                    "embedding": embedding,
-                    "section": section
-                }
-            except Exception as e:
-                logger.warning(f"Failed to get embedding for job skill {skill_name}: {e}")
-
-        return embeddings
+        """Get embeddings for job skills in one batched request"""
+        try:
+            vectors = await self.embedding_manager.embed_many(
+                [skill_name for skill_name, _ in job_skills]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get embeddings for {len(job_skills)} job skills: {e}")
+            return {}
+
+        return {
+            skill_name.lower(): {"embedding": embedding, "section": section}
+            for (skill_name, section), embedding in zip(job_skills, vectors)
+        }
 
     async def _match_skills(
         self,
@@ -197,53 +202,58 @@ class JobMatchingService:
         """
         Match user skills against job skills using embeddings
 
+        All job x user similarities come from one product of the
+        row-normalised embedding matrices; name containment boosts a pair
+        to at least ``NAME_MATCH_SCORE`` and each job skill takes its best
+        user skill above ``MATCH_THRESHOLD``.
+
         Returns:
             (matched_skills, missing_skills)
         """
         matched_skills = []
         missing_skills = []
 
-        # Track which job skills have been matched
-        matched_job_skills = set()
-
-        # For each job skill, find best matching user skill
-        for job_skill_name, section in job_skills:
-            job_skill_key = job_skill_name.lower()
-
-            if job_skill_key not in job_embeddings:
-                continue
-
-            job_embedding = job_embeddings[job_skill_key]["embedding"]
-            best_match = None
-            best_score = 0.7  # Threshold for considering a match
-
-            # Find best matching user skill
-            for user_skill_key, user_data in user_embeddings.items():
-                user_embedding = user_data["embedding"]
-
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(user_embedding, job_embedding)
-
-                # Also check exact name match or alias match
-                if (user_skill_key == job_skill_key or
-                    user_skill_key in job_skill_key or
-                    job_skill_key in user_skill_key):
-                    similarity = max(similarity, 0.95)
-
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = user_data["skill"]
-
-            if best_match:
+        job_entries = [
+            (name, section) for name, section in job_skills if name.lower() in job_embeddings
+        ]
+        if not job_entries:
+            return matched_skills, missing_skills
+
+        job_keys = [name.lower() for name, _ in job_entries]
+        user_keys = list(user_embeddings.keys())
+
+        if user_keys:
+            job_matrix = self._normalized_matrix([job_embeddings[key]["embedding"] for key in job_keys])
+            user_matrix = self._normalized_matrix([user_embeddings[key]["embedding"] for key in user_keys])
+            similarity = job_matrix @ user_matrix.T
+
+            # Exact name or containment either way counts as a near-certain match
+            jobs = np.array(job_keys)[:, None]
+            users = np.array(user_keys)[None, :]
+            name_match = (np.strings.find(jobs, users) >= 0) | (np.strings.find(users, jobs) >= 0)
+            similarity = np.where(name_match, np.maximum(similarity, self.NAME_MATCH_SCORE), similarity)
+
+            best_user = similarity.argmax(axis=1)
+            best_score = similarity[np.arange(len(job_keys)), best_user]
+            is_match = best_score > self.MATCH_THRESHOLD
+        else:
+            best_user = np.zeros(len(job_keys), dtype=int)
+            best_score = np.zeros(len(job_keys))
+            is_match = np.zeros(len(job_keys), dtype=bool)
+
+        for (job_skill_name, section), user_index, score, matched in zip(
+            job_entries, best_user, best_score, is_match
+        ):
+            if matched:
+                best_match = user_embeddings[user_keys[user_index]]["skill"]
                 matched_skills.append(
                     MatchedSkill(
                         name=job_skill_name,
-                        score=round(best_score, 2),
+                        score=round(float(score), 2),
                         category=best_match.category,
                         confidence=best_match.confidence
                     )
                 )
-                matched_job_skills.add(job_skill_key)
             else:
                 # Skill is missing from user profile
                 category = self.taxonomy_mapper.get_category(job_skill_name)
@@ -264,24 +274,12 @@ class JobMatchingService:
 
         return matched_skills, missing_skills
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
-        try:
-            vec1_np = np.array(vec1)
-            vec2_np = np.array(vec2)
-
-            dot_product = np.dot(vec1_np, vec2_np)
-            norm1 = np.linalg.norm(vec1_np)
-            norm2 = np.linalg.norm(vec2_np)
-
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-
-            similarity = dot_product / (norm1 * norm2)
-            return float(similarity)
-        except Exception as e:
-            logger.warning(f"Error calculating cosine similarity: {e}")
-            return 0.0
+    @staticmethod
+    def _normalized_matrix(vectors: List[List[float]]) -> np.ndarray:
+        """Stack vectors into a matrix of unit rows; zero vectors stay zero"""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
 
     def _calculate_match_score(
         self, matched_count: int, total_job_skills: int
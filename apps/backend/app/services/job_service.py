@@ -7,8 +7,8 @@ from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agent import AgentManager
-from app.prompt import prompt_factory
+from app.agent import AgentManager, Priority, request_priority
+from app.prompt import PromptBuilder, prompt_factory
 from app.schemas.json import json_schema_factory
 from app.models import Job, Resume, ProcessedJob
 from app.schemas.pydantic import StructuredJobModel
@@ -66,7 +66,9 @@ class JobService:
         """
         extract and store structured job data in the database
         """
-        structured_job = await self._extract_structured_json(job_description_text)
+        # Long structured extraction queues behind interactive matches and searches
+        with request_priority(Priority.BULK):
+            structured_job = await self._extract_structured_json(job_description_text)
         if not structured_job:
             logger.info("Structured job extraction failed.")
             return None
@@ -120,16 +122,18 @@ class JobService:
         return the data in exact JSON schema we need.
         """
         prompt_template = prompt_factory.get("structured_job")
-        prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("structured_job"), indent=2),
+        prompt = PromptBuilder().build(
+            prompt_template,
+            json_schema_factory.get_compact("structured_job"),
             job_description_text,
+            trimmable=(1,),
         )
         logger.info(f"Structured Job Prompt: {prompt}")
-        raw_output = await self.json_agent_manager.run(prompt=prompt)
-
         try:
-            structured_job: StructuredJobModel = StructuredJobModel.model_validate(
-                raw_output
+            structured_job: StructuredJobModel = await self.json_agent_manager.run(
+                prompt=prompt,
+                response_model=StructuredJobModel,
+                prompt_type="structured_job",
             )
         except ValidationError as e:
             logger.info(f"Validation error: {e}")
@@ -11,8 +11,9 @@ from pydantic import ValidationError
 from typing import Dict, Optional
 
 from app.models import Resume, ProcessedResume
-from app.agent import AgentManager
-from app.prompt import prompt_factory
+from app.agent import AgentManager, Priority, request_priority
+from app.agent.exceptions import ProviderOverloadedError
+from app.prompt import PromptBuilder, prompt_factory
 from app.schemas.json import json_schema_factory
 from app.schemas.pydantic import StructuredResumeModel
 from .exceptions import ResumeNotFoundError, ResumeValidationError
@@ -167,7 +168,9 @@ class ResumeService:
         extract and store structured resume data in the database
         """
         try:
-            structured_resume = await self._extract_structured_json(resume_text)
+            # Long structured extraction queues behind interactive matches and searches
+            with request_priority(Priority.BULK):
+                structured_resume = await self._extract_structured_json(resume_text)
             if not structured_resume:
                 logger.error("Structured resume extraction returned None.")
                 raise ResumeValidationError(
@@ -219,8 +222,8 @@ class ResumeService:
 
             self.db.add(processed_resume)
             await self.db.commit()
-        except ResumeValidationError:
-            # Re-raise validation errors to propagate to the upload endpoint
+        except (ResumeValidationError, ProviderOverloadedError):
+            # Re-raise validation and overload errors to propagate to the upload endpoint
             raise
         except Exception as e:
             logger.error(f"Error storing structured resume: {str(e)}")
@@ -332,16 +335,18 @@ class ResumeService:
         return the data in exact JSON schema we need.
         """
         prompt_template = prompt_factory.get("structured_resume")
-        prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("structured_resume"), indent=2),
+        prompt = PromptBuilder().build(
+            prompt_template,
+            json_schema_factory.get_compact("structured_resume"),
             resume_text,
+            trimmable=(1,),
         )
         logger.info(f"Structured Resume Prompt: {prompt}")
-        raw_output = await self.json_agent_manager.run(prompt=prompt)
-
         try:
-            structured_resume: StructuredResumeModel = (
-                StructuredResumeModel.model_validate(raw_output)
+            structured_resume: StructuredResumeModel = await self.json_agent_manager.run(
+                prompt=prompt,
+                response_model=StructuredResumeModel,
+                prompt_type="structured_resume",
             )
         except ValidationError as e:
             logger.info(f"Validation error: {e}")
@@ -11,10 +11,11 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Optional, Tuple, AsyncGenerator, List
 
-from app.prompt import prompt_factory
+from app.prompt import PromptBuilder, prompt_factory
 from app.schemas.json import json_schema_factory
 from app.schemas.pydantic import ResumePreviewerModel, ResumeAnalysisModel
-from app.agent import EmbeddingManager, AgentManager
+from app.agent import EmbeddingManager, AgentManager, Priority, request_priority
+from app.core import settings
 from app.models import Resume, Job, ProcessedResume, ProcessedJob
 from .exceptions import (
     ResumeNotFoundError,
@@ -41,7 +42,9 @@ class ScoreImprovementService:
         self.max_retries = max_retries
         self.md_agent_manager = AgentManager(strategy="md")
         self.json_agent_manager = AgentManager()
-        self.embedding_manager = EmbeddingManager()
+        self.embedding_manager = EmbeddingManager(
+            model_provider=settings.SCORING_EMBEDDING_PROVIDER or settings.EMBEDDING_PROVIDER
+        )
 
     @staticmethod
     def _normalize_keyword_list(raw_keywords: List[str]) -> List[str]:
@@ -251,6 +254,25 @@ class ScoreImprovementService:
 
         return float(np.dot(ejk, re) / (np.linalg.norm(ejk) * np.linalg.norm(re)))
 
+    async def _score_candidate(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        extracted_job_keywords_embedding: np.ndarray,
+    ) -> Tuple[str, float]:
+        """
+        Generate one rewrite and score it against the job keywords.
+        """
+        generation_args = {} if temperature is None else {"temperature": temperature}
+        # Candidates must be fresh samples, never a cached or shared draft
+        improved = await self.md_agent_manager.run(
+            prompt, use_cache=False, prompt_type="resume_improvement", **generation_args
+        )
+        emb = await self.embedding_manager.embed_document(improved, prompt_type="resume_draft")
+        return improved, self.calculate_cosine_similarity(
+            emb, extracted_job_keywords_embedding
+        )
+
     async def improve_score_with_llm(
         self,
         resume: str,
@@ -262,34 +284,75 @@ class ScoreImprovementService:
         ats_recommendations: str,
         skill_priority_text: str,
     ) -> Tuple[str, float]:
+        """
+        Rewrite the resume until a draft scores above the original.
+
+        Up to ``max_retries`` drafts are generated in rounds of
+        SCORE_IMPROVEMENT_CANDIDATES concurrent candidates, cycling through
+        SCORE_IMPROVEMENT_TEMPERATURES. A round ends as soon as a draft gains
+        SCORE_IMPROVEMENT_TARGET_GAIN over the original (cancelling the rest),
+        otherwise when all its drafts are scored; the best improving draft
+        is returned.
+        """
         prompt_template = prompt_factory.get("resume_improvement")
         best_resume, best_score = resume, previous_cosine_similarity_score
+        prompt = PromptBuilder().build(
+            prompt_template,
+            trimmable=("raw_job_description",),
+            raw_job_description=job,
+            extracted_job_keywords=extracted_job_keywords,
+            raw_resume=resume,
+            extracted_resume_keywords=extracted_resume_keywords,
+            current_cosine_similarity=previous_cosine_similarity_score,
+            ats_recommendations=ats_recommendations,
+            skill_priority_text=skill_priority_text,
+        )
+        temperatures = settings.SCORE_IMPROVEMENT_TEMPERATURES or [None]
+        round_size = max(1, settings.SCORE_IMPROVEMENT_CANDIDATES)
+        target_score = previous_cosine_similarity_score + settings.SCORE_IMPROVEMENT_TARGET_GAIN
 
-        for attempt in range(1, self.max_retries + 1):
-            logger.info(
-                f"Attempt {attempt}/{self.max_retries} to improve resume score."
-            )
-            prompt = prompt_template.format(
-                raw_job_description=job,
-                extracted_job_keywords=extracted_job_keywords,
-                raw_resume=best_resume,
-                extracted_resume_keywords=extracted_resume_keywords,
-                current_cosine_similarity=best_score,
-                ats_recommendations=ats_recommendations,
-                skill_priority_text=skill_priority_text,
-            )
-            improved = await self.md_agent_manager.run(prompt)
-            emb = await self.embedding_manager.embed(text=improved)
-            score = self.calculate_cosine_similarity(
-                emb, extracted_job_keywords_embedding
-            )
-
-            if score > best_score:
-                return improved, score
-
+        attempt = 0
+        while attempt < self.max_retries:
+            candidates = min(round_size, self.max_retries - attempt)
             logger.info(
-                f"Attempt {attempt} resulted in score: {score}, best score so far: {best_score}"
+                f"Attempts {attempt + 1}-{attempt + candidates}/{self.max_retries} to improve resume score."
             )
+            # Each round is several full rewrites; let interactive calls go first
+            with request_priority(Priority.BULK):
+                tasks = [
+                    asyncio.create_task(
+                        self._score_candidate(
+                            prompt,
+                            temperatures[(attempt + i) % len(temperatures)],
+                            extracted_job_keywords_embedding,
+                        )
+                    )
+                    for i in range(candidates)
+                ]
+            attempt += candidates
+            errors: List[Exception] = []
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    try:
+                        improved, score = await finished
+                    except Exception as e:
+                        logger.warning(f"Resume improvement candidate failed: {e}")
+                        errors.append(e)
+                        continue
+                    logger.info(f"Candidate scored {score}, best score so far: {best_score}")
+                    if score > best_score:
+                        best_resume, best_score = improved, score
+                    if best_score >= target_score:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if best_score > previous_cosine_similarity_score:
+                return best_resume, best_score
+            if len(errors) == candidates:
+                raise errors[-1]
 
         return best_resume, best_score
 
@@ -298,16 +361,18 @@ class ScoreImprovementService:
         Returns the updated resume in a format suitable for the dashboard.
         """
         prompt_template = prompt_factory.get("structured_resume")
-        prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("resume_preview"), indent=2),
+        prompt = PromptBuilder().build(
+            prompt_template,
+            json_schema_factory.get_compact("resume_preview"),
             updated_resume,
+            trimmable=(1,),
         )
         logger.info(f"Structured Resume Prompt: {prompt}")
-        raw_output = await self.json_agent_manager.run(prompt=prompt)
-
         try:
-            resume_preview: ResumePreviewerModel = ResumePreviewerModel.model_validate(
-                raw_output
+            resume_preview: ResumePreviewerModel = await self.json_agent_manager.run(
+                prompt=prompt,
+                response_model=ResumePreviewerModel,
+                prompt_type="resume_preview",
             )
         except ValidationError as e:
             logger.info(f"Validation error: {e}")
@@ -327,9 +392,9 @@ class ScoreImprovementService:
         """Generate a structured summary comparing resume versions against the job."""
 
         prompt_template = prompt_factory.get("resume_analysis")
-        schema = json.dumps(json_schema_factory.get("resume_analysis"), indent=2)
-        prompt = prompt_template.format(
-            schema,
+        prompt = PromptBuilder().build(
+            prompt_template,
+            json_schema_factory.get_compact("resume_analysis"),
             job_description,
             extracted_job_keywords,
             original_resume,
@@ -337,12 +402,15 @@ class ScoreImprovementService:
             improved_resume,
             original_score,
             new_score,
+            trimmable=(1, 3, 5),
         )
 
-        raw_output = await self.json_agent_manager.run(prompt=prompt)
-
         try:
-            analysis = ResumeAnalysisModel.model_validate(raw_output)
+            analysis = await self.json_agent_manager.run(
+                prompt=prompt,
+                response_model=ResumeAnalysisModel,
+                prompt_type="resume_analysis",
+            )
         except ValidationError as e:
             logger.info(f"Resume analysis validation error: {e}")
             return None
@@ -383,10 +451,10 @@ class ScoreImprovementService:
         skill_priority_text = self._build_skill_priority_text(skill_stats_for_prompt)
 
         resume_embedding_task = asyncio.create_task(
-            self.embedding_manager.embed(resume.content)
+            self.embedding_manager.embed_document(resume.content, prompt_type="resume")
         )
         job_kw_embedding_task = asyncio.create_task(
-            self.embedding_manager.embed(extracted_job_keywords)
+            self.embedding_manager.embed(extracted_job_keywords, prompt_type="job_keywords")
         )
         resume_embedding, extracted_job_keywords_embedding = await asyncio.gather(
             resume_embedding_task, job_kw_embedding_task
@@ -488,9 +556,9 @@ class ScoreImprovementService:
         )
         skill_priority_text = self._build_skill_priority_text(skill_stats_for_prompt)
 
-        resume_embedding = await self.embedding_manager.embed(text=resume.content)
+        resume_embedding = await self.embedding_manager.embed_document(resume.content, prompt_type="resume")
         extracted_job_keywords_embedding = await self.embedding_manager.embed(
-            text=extracted_job_keywords
+            text=extracted_job_keywords, prompt_type="job_keywords"
         )
 
         yield f"data: {json.dumps({'status': 'scoring', 'message': 'Calculating compatibility score...'})}\n\n"
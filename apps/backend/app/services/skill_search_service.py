@@ -0,0 +1,216 @@
+"""Inverted skill index and profile search"""
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, desc, distinct, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import SkillProfile, SkillPosting
+from app.schemas.pydantic.skill_profile import (
+    SkillCollectionSummary,
+    SkillSearchRequest,
+    SkillSearchResponse,
+    SkillSearchHit,
+    SkillSearchMatch,
+)
+from app.skills import get_taxonomy_mapper
+
+logger = logging.getLogger(__name__)
+
+
+def posting_key(name: str, mapped_taxonomy_id: Optional[str] = None) -> str:
+    """Index key for a skill: its ESCO ID when mapped, else the lower-cased name"""
+    return mapped_taxonomy_id or name.strip().lower()
+
+
+class SkillSearchService:
+    """
+    Maintains the skill -> profile posting lists and answers skill searches
+
+    Index writes only stage changes on the session; callers commit them in
+    the same transaction as the profile change they mirror.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _postings_for(profile_id: str, skills: Iterable[Dict]) -> List[SkillPosting]:
+        by_key: Dict[str, SkillPosting] = {}
+        for skill in skills:
+            key = posting_key(skill["name"], skill.get("mapped_taxonomy_id"))
+            existing = by_key.get(key)
+            if existing is not None and existing.confidence >= skill["confidence"]:
+                continue
+            by_key[key] = SkillPosting(
+                skill_key=key,
+                profile_id=profile_id,
+                skill_name=skill.get("edited_name") or skill["name"],
+                confidence=skill["confidence"],
+                status=skill.get("manual_status", "suggested"),
+            )
+        return list(by_key.values())
+
+    async def index_profile(self, profile_id: str, skills: Iterable[Dict]) -> None:
+        """Replace the postings of a profile with ones derived from ``skills``"""
+        await self.db.execute(delete(SkillPosting).where(SkillPosting.profile_id == profile_id))
+        self.db.add_all(self._postings_for(profile_id, skills))
+
+    async def update_skill(self, profile_id: str, skills: Iterable[Dict], skill: Dict) -> None:
+        """
+        Mirror a single skill's status/name change into its posting
+
+        Several skills of a profile can share a posting (e.g. two names mapped
+        to one ESCO ID), so the posting is recomputed from all of them.
+        """
+        key = posting_key(skill["name"], skill.get("mapped_taxonomy_id"))
+        await self.db.execute(
+            delete(SkillPosting).where(
+                SkillPosting.profile_id == profile_id,
+                SkillPosting.skill_key == key,
+            )
+        )
+        self.db.add_all(
+            self._postings_for(
+                profile_id,
+                (s for s in skills if posting_key(s["name"], s.get("mapped_taxonomy_id")) == key),
+            )
+        )
+
+    async def rebuild(self) -> int:
+        """Rebuild the whole index from stored profiles; returns profiles indexed"""
+        await self.db.execute(delete(SkillPosting))
+        result = await self.db.execute(select(SkillProfile.profile_id, SkillProfile.skills))
+        count = 0
+        for profile_id, skills in result.all():
+            self.db.add_all(self._postings_for(profile_id, skills or []))
+            count += 1
+        await self.db.commit()
+        logger.info(f"Rebuilt skill index for {count} profiles")
+        return count
+
+    async def collection_summary(self) -> SkillCollectionSummary:
+        """
+        Mean ESCO collection shares across all profiles, computed from the
+        posting lists with one bitset AND/popcount pass per collection.
+        """
+        taxonomy_mapper = get_taxonomy_mapper()
+        tagger = taxonomy_mapper.get_collection_tagger()
+        result = await self.db.execute(
+            select(SkillPosting.profile_id, SkillPosting.skill_key)
+            .where(SkillPosting.status != "rejected")
+            .order_by(SkillPosting.profile_id)
+        )
+        skill_keys: Dict[str, List[str]] = {}
+        for profile_id, skill_key in result.all():
+            skill_keys.setdefault(profile_id, []).append(skill_key)
+        if tagger is None:
+            return SkillCollectionSummary(profiles=len(skill_keys))
+
+        profiles = [
+            [skill_id for skill_id in map(taxonomy_mapper.get_skill_id, keys) if skill_id is not None]
+            for keys in skill_keys.values()
+        ]
+        return SkillCollectionSummary(
+            profiles=len(profiles),
+            collection_shares=tagger.aggregate(profiles, [len(keys) for keys in skill_keys.values()]),
+        )
+
+    @staticmethod
+    def _resolve_terms(request: SkillSearchRequest) -> Dict[str, float]:
+        """Map search terms to posting keys with their confidence thresholds"""
+        taxonomy_mapper = get_taxonomy_mapper()
+        thresholds: Dict[str, float] = {}
+        for term in request.skills:
+            mapping = taxonomy_mapper.get_mapping(term.name)
+            if mapping:
+                key = posting_key(mapping["skill_name"], mapping.get("esco_id"))
+            else:
+                key = posting_key(term.name)
+            threshold = term.min_confidence if term.min_confidence is not None else request.min_confidence
+            thresholds[key] = max(threshold, thresholds.get(key, 0.0))
+        return thresholds
+
+    async def search(self, request: SkillSearchRequest) -> SkillSearchResponse:
+        """
+        Find profiles having all (``and``) or any (``or``) of the requested
+        skills above their confidence thresholds, best matches first.
+        """
+        thresholds = self._resolve_terms(request)
+        term_filter = or_(
+            *(
+                and_(SkillPosting.skill_key == key, SkillPosting.confidence >= threshold)
+                for key, threshold in thresholds.items()
+            )
+        )
+        matched = func.count(distinct(SkillPosting.skill_key)).label("matched")
+        score = func.avg(SkillPosting.confidence).label("score")
+
+        grouped = (
+            select(SkillPosting.profile_id, matched, score)
+            .where(term_filter, SkillPosting.status.in_(request.statuses))
+            .group_by(SkillPosting.profile_id)
+        )
+        if request.operator == "and":
+            grouped = grouped.having(matched == len(thresholds))
+
+        total = await self.db.scalar(select(func.count()).select_from(grouped.subquery()))
+        page_rows = (
+            await self.db.execute(
+                grouped.order_by(desc("matched"), desc("score"), SkillPosting.profile_id)
+                .limit(request.page_size)
+                .offset((request.page - 1) * request.page_size)
+            )
+        ).all()
+
+        results: List[SkillSearchHit] = []
+        if page_rows:
+            profile_ids = [row.profile_id for row in page_rows]
+            matches, resume_ids = await self._load_page_details(
+                profile_ids, term_filter, request.statuses
+            )
+            results = [
+                SkillSearchHit(
+                    profile_id=row.profile_id,
+                    resume_id=resume_ids.get(row.profile_id),
+                    score=round(float(row.score), 4),
+                    matched_skills=matches.get(row.profile_id, []),
+                )
+                for row in page_rows
+            ]
+
+        return SkillSearchResponse(
+            total=total or 0,
+            page=request.page,
+            page_size=request.page_size,
+            results=results,
+        )
+
+    async def _load_page_details(
+        self, profile_ids: List[str], term_filter, statuses: List[str]
+    ) -> Tuple[Dict[str, List[SkillSearchMatch]], Dict[str, str]]:
+        postings = await self.db.execute(
+            select(SkillPosting).where(
+                SkillPosting.profile_id.in_(profile_ids),
+                SkillPosting.status.in_(statuses),
+                term_filter,
+            )
+        )
+        matches: Dict[str, List[SkillSearchMatch]] = {}
+        for posting in postings.scalars():
+            matches.setdefault(posting.profile_id, []).append(
+                SkillSearchMatch(
+                    name=posting.skill_name,
+                    skill_key=posting.skill_key,
+                    confidence=posting.confidence,
+                    status=posting.status,
+                )
+            )
+
+        resumes = await self.db.execute(
+            select(SkillProfile.profile_id, SkillProfile.resume_id).where(
+                SkillProfile.profile_id.in_(profile_ids)
+            )
+        )
+        return matches, dict(resumes.all())
@@ -18,8 +18,10 @@ from app.schemas.pydantic.skill_profile import (
     SkillActionRequest,
 )
 from app.agent import EmbeddingManager
-from app.skills import get_taxonomy_mapper
+from app.core import settings
+from app.skills import get_taxonomy_mapper, get_taxonomy_embedding_index
 from .exceptions import ResumeNotFoundError
+from .skill_search_service import SkillSearchService
 
 logger = logging.getLogger(__name__)
 
@@ -86,14 +88,21 @@ class SkillMatcher:
     _cache: Optional[Dict[str, object]] = None
     _shared_instance: Optional["SkillMatcher"] = None
 
-    def __init__(self, taxonomy_mapper, excluded: Optional[Set[str]] = None):
+    def __init__(
+        self,
+        taxonomy_mapper,
+        excluded: Optional[Set[str]] = None,
+        cache: Optional[Dict[str, object]] = None,
+    ):
         self.taxonomy_mapper = taxonomy_mapper
         self.excluded = {s.lower() for s in (excluded or set())}
 
-        if SkillMatcher._cache is None:
-            SkillMatcher._cache = self._build_index(taxonomy_mapper)
+        if cache is None:
+            if SkillMatcher._cache is None:
+                SkillMatcher._cache = self._build_index(taxonomy_mapper)
+            cache = SkillMatcher._cache
 
-        cache = SkillMatcher._cache
+        self._index_cache = cache
         self.index: Dict[str, List[SkillEntry]] = cache["index"]
         self.normalized_lookup: Dict[str, SkillEntry] = cache["normalized_lookup"]
         self.max_tokens: int = cache["max_tokens"]
@@ -107,6 +116,24 @@ class SkillMatcher:
                 cls._shared_instance.excluded.update(s.lower() for s in excluded)
         return cls._shared_instance
 
+    @classmethod
+    def build_snapshot(cls, taxonomy_mapper, excluded: Optional[Set[str]] = None) -> "SkillMatcher":
+        """Build a matcher with its own index without touching the shared one"""
+        return cls(taxonomy_mapper, excluded, cache=cls._build_index(taxonomy_mapper))
+
+    @classmethod
+    def install(cls, matcher: "SkillMatcher") -> Optional["SkillMatcher"]:
+        """
+        Make ``matcher`` the shared instance and return the previous one
+
+        Services constructed earlier keep a reference to the old matcher, so
+        in-flight requests finish on the snapshot they started with.
+        """
+        previous = cls._shared_instance
+        cls._cache = matcher._index_cache
+        cls._shared_instance = matcher
+        return previous
+
     @classmethod
     def _build_index(cls, taxonomy_mapper) -> Dict[str, object]:
         index: Dict[str, List[SkillEntry]] = defaultdict(list)
@@ -114,12 +141,12 @@ class SkillMatcher:
         unique_entries: Dict[Tuple[str, str], SkillEntry] = {}
         max_tokens = 0
 
-        for mapping in taxonomy_mapper.get_all_mappings():
+        for mapping, mapping_aliases in taxonomy_mapper.iter_mappings_with_aliases():
             canonical = mapping.get("skill_name")
             if not canonical:
                 continue
 
-            aliases = [canonical] + mapping.get("aliases", [])
+            aliases = [canonical] + mapping_aliases
             esco_id = mapping.get("esco_id")
             category = mapping.get("category", "technical")
             skill_type = mapping.get("skill_type")
@@ -356,13 +383,16 @@ class SkillExtractionService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.embedding_manager = EmbeddingManager()
-        self.taxonomy_mapper = get_taxonomy_mapper()
+        self.skill_search = SkillSearchService(db)
         self.excluded_skills = {
             "r",
             "code",
         }
 
-        self.skill_matcher = SkillMatcher.shared(self.taxonomy_mapper, self.excluded_skills)
+        # Take the mapper from the matcher so both come from the same snapshot,
+        # even if a taxonomy reload swaps them while this service is alive.
+        self.skill_matcher = SkillMatcher.shared(get_taxonomy_mapper(), self.excluded_skills)
+        self.taxonomy_mapper = self.skill_matcher.taxonomy_mapper
         self.minimum_confidence = 0.55
         self.structured_label_stopwords = {
             "skills",
@@ -437,9 +467,17 @@ class SkillExtractionService:
         )
 
         self.db.add(profile)
+        await self.skill_search.index_profile(profile_id, profile.skills)
         await self.db.commit()
         await self.db.refresh(profile)
 
+        try:
+            from app.services import get_candidate_index_service
+            await get_candidate_index_service().index_profile(profile_id, resume_text, profile.skills)
+        except Exception as e:
+            # The profile is stored either way; a reindex picks it up later
+            logger.warning(f"Failed to add profile {profile_id} to the candidate index: {e}")
+
         logger.info(f"Created skill profile {profile_id} with {len(skills)} skills")
         return profile_id
 
@@ -474,8 +512,8 @@ class SkillExtractionService:
             )
 
         if processed_data:
-            for skill in self._iter_skill_strings(processed_data.get("skills")):
-                entry = self.skill_matcher.resolve_phrase(skill)
+            phrases = self._iter_skill_strings(processed_data.get("skills"))
+            for skill, entry in zip(phrases, await self._resolve_phrases(phrases)):
                 if not entry:
                     continue
                 self._add_or_update_skill(
@@ -519,6 +557,39 @@ class SkillExtractionService:
         skills_list.sort(key=lambda x: x.confidence, reverse=True)
         return skills_list
 
+    async def _resolve_phrases(self, phrases: List[str]) -> List[Optional[SkillEntry]]:
+        """
+        Resolve skill phrases to taxonomy entries
+
+        Exact alias lookup first; phrases it misses are embedded in one batch
+        and matched against the taxonomy embedding matrix in one product.
+        """
+        entries = [self.skill_matcher.resolve_phrase(phrase) for phrase in phrases]
+        leftovers = [i for i, entry in enumerate(entries) if entry is None]
+        embedding_index = get_taxonomy_embedding_index(
+            settings.EMBEDDING_PROVIDER, settings.EMBEDDING_MODEL
+        )
+        if not leftovers or embedding_index is None:
+            return entries
+
+        try:
+            vectors = await self.embedding_manager.embed_many([phrases[i] for i in leftovers])
+            rows, similarities = embedding_index.nearest(vectors)
+        except Exception as e:
+            logger.warning(f"Semantic skill resolution failed for {len(leftovers)} phrases: {e}")
+            return entries
+
+        for i, row, similarity in zip(leftovers, rows, similarities):
+            if similarity < settings.SKILL_EMBEDDING_MATCH_THRESHOLD:
+                continue
+            entries[i] = self.skill_matcher.resolve_phrase(embedding_index.names[row])
+            if entries[i]:
+                logger.debug(
+                    f"Resolved '{phrases[i]}' to '{entries[i].canonical_name}' "
+                    f"by embedding similarity {similarity:.2f}"
+                )
+        return entries
+
     async def _extract_github_skills(self, github_data: Dict) -> List[SkillItem]:
         """
         Extract skills from GitHub data
@@ -907,6 +978,21 @@ class SkillExtractionService:
 
         return round(min(1.0, max(0.0, confidence)), 2)
 
+    def _collection_shares(self, skills: List[Dict]) -> Dict[str, float]:
+        """Tag a profile with its share of skills in each ESCO collection"""
+        tagger = self.taxonomy_mapper.get_collection_tagger()
+        if tagger is None:
+            return {}
+        active = [skill for skill in skills if skill.get("manual_status") != "rejected"]
+        skill_ids = [
+            self.taxonomy_mapper.get_skill_id(skill.get("mapped_taxonomy_id") or skill["name"])
+            for skill in active
+        ]
+        return tagger.tag(
+            (skill_id for skill_id in skill_ids if skill_id is not None),
+            total_skills=len(active),
+        )
+
     async def get_skill_profile(self, profile_id: str) -> Optional[SkillProfileModel]:
         """Get a skill profile by ID"""
         result = await self.db.execute(
@@ -922,6 +1008,7 @@ class SkillExtractionService:
             resume_id=profile.resume_id,
             skills=[SkillItem(**skill) for skill in profile.skills],
             privacy_settings=profile.privacy_settings or {},
+            collection_shares=self._collection_shares(profile.skills),
             created_at=profile.created_at,
             updated_at=profile.updated_at
         )
@@ -941,6 +1028,7 @@ class SkillExtractionService:
             resume_id=profile.resume_id,
             skills=[SkillItem(**skill) for skill in profile.skills],
             privacy_settings=profile.privacy_settings or {},
+            collection_shares=self._collection_shares(profile.skills),
             created_at=profile.created_at,
             updated_at=profile.updated_at
         )
@@ -1003,6 +1091,7 @@ class SkillExtractionService:
             .where(SkillProfile.profile_id == request.profile_id)
             .values(skills=skills)
         )
+        await self.skill_search.update_skill(request.profile_id, skills, skills[skill_index])
 
         # Create audit log
         audit_log = SkillAuditLog(
@@ -1016,5 +1105,11 @@ class SkillExtractionService:
 
         await self.db.commit()
 
+        try:
+            from app.services import get_candidate_index_service
+            await get_candidate_index_service().update_skills(request.profile_id, skills)
+        except Exception as e:
+            logger.warning(f"Failed to update profile {request.profile_id} in the candidate index: {e}")
+
         updated_skill = SkillItem(**skills[skill_index])
         return True, message, updated_skill
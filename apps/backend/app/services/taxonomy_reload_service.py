@@ -0,0 +1,163 @@
+"""Hot reload of the skill taxonomy without restarting the backend"""
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.agent import get_provider_registry
+from app.core import settings
+from app.skills import TaxonomyMapper, TAXONOMY_FILE, reset_taxonomy_embedding_indexes, set_taxonomy_mapper
+from .skill_service import SkillMatcher
+from .exceptions import TaxonomyReloadError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TaxonomyReloadResult:
+    skill_count: int
+    lookup_count: int
+    index_tokens: int
+    duration_ms: float
+
+
+class TaxonomyReloadService:
+    """
+    Builds a new taxonomy mapper and matcher index off the event loop,
+    validates them and swaps the process-wide references.
+
+    Requests that already hold the previous mapper/matcher keep using them
+    until they complete; the old snapshot is released once they drop it, so
+    both versions only coexist for the duration of the swap window. The
+    previous mapper's taxonomy store is closed at that point.
+    """
+
+    # Reject a new taxonomy that loses more than half of the current skills
+    # unless the caller explicitly forces the reload.
+    MIN_RETAINED_RATIO = 0.5
+
+    def __init__(self, taxonomy_file: Optional[Path] = None):
+        self.taxonomy_file = Path(taxonomy_file) if taxonomy_file else TAXONOMY_FILE
+        self._lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._last_signature = self._file_signature()
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.taxonomy_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _build(self) -> Tuple[TaxonomyMapper, SkillMatcher]:
+        current = SkillMatcher._shared_instance
+        excluded = set(current.excluded) if current else None
+        mapper = TaxonomyMapper(self.taxonomy_file)
+        matcher = SkillMatcher.build_snapshot(mapper, excluded)
+        return mapper, matcher
+
+    def _validate(self, mapper: TaxonomyMapper, matcher: SkillMatcher, force: bool) -> int:
+        skill_count = len(mapper.get_all_mappings())
+        if skill_count == 0:
+            raise TaxonomyReloadError("New taxonomy contains no skill mappings.")
+        if not matcher.index:
+            raise TaxonomyReloadError("New taxonomy produced an empty matcher index.")
+
+        current = SkillMatcher._shared_instance
+        if current is not None and not force:
+            previous_count = len(current.taxonomy_mapper.get_all_mappings())
+            if previous_count and skill_count < previous_count * self.MIN_RETAINED_RATIO:
+                raise TaxonomyReloadError(
+                    f"New taxonomy has {skill_count} skills, down from {previous_count}. "
+                    "Use force to apply it anyway."
+                )
+        return skill_count
+
+    async def reload(self, force: bool = False) -> TaxonomyReloadResult:
+        """
+        Rebuild and atomically install the taxonomy mapper and matcher index.
+
+        Raises:
+            TaxonomyReloadError: If the new taxonomy fails validation; the
+                current snapshot stays in place.
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            signature = self._file_signature()
+            mapper, matcher = await run_in_threadpool(self._build)
+            skill_count = self._validate(mapper, matcher, force)
+
+            previous_matcher = SkillMatcher.install(matcher)
+            previous_mapper = set_taxonomy_mapper(mapper)
+            # Re-read the skill embedding matrix against the new taxonomy, and
+            # rebuild hashing embeddings with IDF weights from its vocabulary
+            reset_taxonomy_embedding_indexes()
+            await get_provider_registry().discard("embedding", "hashing")
+            self._last_signature = signature
+            self._close_when_released(
+                {previous_mapper, previous_matcher.taxonomy_mapper if previous_matcher else None} - {mapper, None}
+            )
+            del previous_matcher, previous_mapper
+
+            result = TaxonomyReloadResult(
+                skill_count=skill_count,
+                lookup_count=len(mapper.get_all_skills()),
+                index_tokens=len(matcher.index),
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+            logger.info(f"Taxonomy reloaded: {result}")
+            return result
+
+    @staticmethod
+    def _close_when_released(mappers: Set[TaxonomyMapper]) -> None:
+        """Close each superseded mapper's store once no request holds the mapper"""
+        for previous in mappers:
+            if previous.store is not None:
+                weakref.finalize(previous, previous.store.close)
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            signature = self._file_signature()
+            if signature is None or signature == self._last_signature:
+                continue
+            try:
+                await self.reload()
+            except TaxonomyReloadError as e:
+                # Don't retry the same broken file on every tick
+                self._last_signature = signature
+                logger.error(f"Rejected taxonomy change on disk: {e}")
+            except Exception as e:
+                logger.error(f"Taxonomy reload from file watch failed: {e}")
+
+    def start_watching(self, interval: float = settings.TAXONOMY_WATCH_INTERVAL) -> None:
+        """Poll the taxonomy file and reload when it changes; 0 disables."""
+        if interval <= 0 or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+
+_reload_service: Optional[TaxonomyReloadService] = None
+
+
+def get_taxonomy_reload_service() -> TaxonomyReloadService:
+    """Get singleton taxonomy reload service"""
+    global _reload_service
+    if _reload_service is None:
+        _reload_service = TaxonomyReloadService()
+    return _reload_service
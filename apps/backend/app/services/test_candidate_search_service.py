@@ -0,0 +1,26 @@
+"""Tests for the candidate index's skill vector pooling"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.candidate_search_service import CandidateIndexService
+
+
+def test_weighted_mean_favours_heavier_skills():
+    vectors = np.array([[2.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    mean = CandidateIndexService._weighted_mean(vectors, [3.0, 1.0])
+    np.testing.assert_allclose(mean, np.array([3.0, 1.0]) / np.sqrt(10.0), rtol=1e-6)
+
+
+def test_weighted_mean_with_zero_weights_is_unweighted():
+    vectors = np.array([[2.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    mean = CandidateIndexService._weighted_mean(vectors, [0.0, 0.0])
+    np.testing.assert_allclose(mean, np.array([1.0, 1.0]) / np.sqrt(2.0), rtol=1e-6)
+
+
+def test_weighted_mean_of_no_skills_is_none():
+    assert CandidateIndexService._weighted_mean(np.zeros((0, 2), dtype=np.float32), []) is None
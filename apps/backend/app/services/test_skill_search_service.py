@@ -0,0 +1,154 @@
+"""Tests for the inverted skill index: indexing, single-skill updates, search and rebuild"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.models import Base, SkillPosting, SkillProfile
+from app.schemas.pydantic.skill_profile import SkillSearchRequest
+from app.services import skill_search_service
+from app.services.skill_search_service import SkillSearchService
+
+
+class FakeTaxonomyMapper:
+    def get_mapping(self, name):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def no_taxonomy(monkeypatch):
+    monkeypatch.setattr(skill_search_service, "get_taxonomy_mapper", FakeTaxonomyMapper)
+
+
+def _skill(name, confidence, esco_id=None, status="suggested"):
+    return {"name": name, "confidence": confidence, "mapped_taxonomy_id": esco_id, "manual_status": status}
+
+
+def _run(test):
+    """Run ``test(session)`` against a fresh in-memory database"""
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                await test(session)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+async def _postings(session, profile_id):
+    result = await session.execute(
+        select(SkillPosting).where(SkillPosting.profile_id == profile_id).order_by(SkillPosting.skill_key)
+    )
+    return [(p.skill_key, p.skill_name, p.confidence, p.status) for p in result.scalars()]
+
+
+async def _add_profile(session, profile_id, skills):
+    session.add(SkillProfile(profile_id=profile_id, resume_id=f"resume-{profile_id}", skills=skills))
+    await SkillSearchService(session).index_profile(profile_id, skills)
+    await session.commit()
+
+
+def _search(*names, **fields):
+    return SkillSearchRequest(skills=[{"name": name} for name in names], **fields)
+
+
+def test_index_keeps_one_posting_per_key_with_the_best_confidence():
+    async def test(session):
+        await _add_profile(
+            session,
+            "p1",
+            [_skill("JS", 0.6, "esco/js"), _skill("JavaScript", 0.9, "esco/js"), _skill("Rust", 0.5)],
+        )
+        assert await _postings(session, "p1") == [
+            ("esco/js", "JavaScript", 0.9, "suggested"),
+            ("rust", "Rust", 0.5, "suggested"),
+        ]
+
+    _run(test)
+
+
+def test_update_skill_recomputes_a_shared_posting():
+    async def test(session):
+        skills = [_skill("JS", 0.6, "esco/js"), _skill("JavaScript", 0.9, "esco/js")]
+        await _add_profile(session, "p1", skills)
+
+        # Editing the weaker duplicate must not overwrite the stronger one
+        skills[0]["manual_status"] = "accepted"
+        await SkillSearchService(session).update_skill("p1", skills, skills[0])
+        await session.commit()
+        assert await _postings(session, "p1") == [("esco/js", "JavaScript", 0.9, "suggested")]
+
+        skills[1]["manual_status"] = "rejected"
+        skills[1]["edited_name"] = "ECMAScript"
+        await SkillSearchService(session).update_skill("p1", skills, skills[1])
+        await session.commit()
+        assert await _postings(session, "p1") == [("esco/js", "ECMAScript", 0.9, "rejected")]
+
+    _run(test)
+
+
+def test_and_search_requires_every_skill_and_ranks_by_score():
+    async def test(session):
+        await _add_profile(session, "p1", [_skill("Python", 0.9), _skill("SQL", 0.7)])
+        await _add_profile(session, "p2", [_skill("Python", 0.95), _skill("SQL", 0.9)])
+        await _add_profile(session, "p3", [_skill("Python", 0.99)])
+        await _add_profile(session, "p4", [_skill("Python", 0.9), _skill("SQL", 0.9, status="rejected")])
+        service = SkillSearchService(session)
+
+        response = await service.search(_search("python", "SQL"))
+        assert response.total == 2
+        assert [hit.profile_id for hit in response.results] == ["p2", "p1"]
+        assert response.results[0].resume_id == "resume-p2"
+        assert {m.name for m in response.results[0].matched_skills} == {"Python", "SQL"}
+
+        response = await service.search(_search("Python", "SQL", min_confidence=0.8))
+        assert [hit.profile_id for hit in response.results] == ["p2"]
+
+        response = await service.search(_search("Python", "SQL", operator="or"))
+        # Profiles matching both skills rank above single matches
+        assert [hit.profile_id for hit in response.results] == ["p2", "p1", "p3", "p4"]
+
+    _run(test)
+
+
+def test_search_pages_through_all_hits():
+    async def test(session):
+        for i in range(5):
+            await _add_profile(session, f"p{i}", [_skill("Go", 0.5 + i / 10)])
+        service = SkillSearchService(session)
+
+        pages = [await service.search(_search("Go", page=page, page_size=2)) for page in (1, 2, 3)]
+        assert all(page.total == 5 for page in pages)
+        assert [[hit.profile_id for hit in page.results] for page in pages] == [
+            ["p4", "p3"],
+            ["p2", "p1"],
+            ["p0"],
+        ]
+
+    _run(test)
+
+
+def test_rebuild_reindexes_from_stored_profiles():
+    async def test(session):
+        await _add_profile(session, "p1", [_skill("Python", 0.9)])
+        session.add(SkillProfile(profile_id="p2", resume_id="resume-p2", skills=[_skill("Python", 0.8)]))
+        session.add(SkillPosting(skill_key="stale", profile_id="p1", skill_name="Stale", confidence=1.0, status="accepted"))
+        await session.commit()
+
+        assert await SkillSearchService(session).rebuild() == 2
+        assert await _postings(session, "p1") == [("python", "Python", 0.9, "suggested")]
+        assert await _postings(session, "p2") == [("python", "Python", 0.8, "suggested")]
+
+    _run(test)
@@ -0,0 +1,103 @@
+"""Tests for taxonomy hot reload: validation guards and the snapshot swap"""
+import asyncio
+import gc
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.exceptions import TaxonomyReloadError
+from app.services.skill_service import SkillMatcher
+from app.services.taxonomy_reload_service import TaxonomyReloadService
+from app.skills import get_taxonomy_mapper, set_taxonomy_mapper
+
+
+@pytest.fixture(autouse=True)
+def restore_shared_taxonomy():
+    matcher, cache = SkillMatcher._shared_instance, SkillMatcher._cache
+    mapper = set_taxonomy_mapper(None)
+    yield
+    SkillMatcher._shared_instance, SkillMatcher._cache = matcher, cache
+    set_taxonomy_mapper(mapper)
+
+
+def _write(path: Path, *names: str) -> None:
+    mappings = [
+        {"skill_name": name, "category": "technical", "aliases": [f"{name.lower()}lang"]}
+        for name in names
+    ]
+    path.write_text(json.dumps({"mappings": mappings}), encoding="utf-8")
+
+
+def _reload(service: TaxonomyReloadService, force: bool = False):
+    return asyncio.run(service.reload(force=force))
+
+
+def test_reload_installs_new_mapper_and_matcher(tmp_path):
+    taxonomy_file = tmp_path / "taxonomy_map.json"
+    _write(taxonomy_file, "Python", "Rust")
+    service = TaxonomyReloadService(taxonomy_file)
+
+    result = _reload(service)
+    assert result.skill_count == 2
+    assert result.lookup_count == 4
+    assert get_taxonomy_mapper().get_mapping("rustlang")["skill_name"] == "Rust"
+    assert SkillMatcher._shared_instance.resolve_phrase("python").canonical_name == "Python"
+
+    _write(taxonomy_file, "Python", "Rust", "Go")
+    _reload(service)
+    assert SkillMatcher._shared_instance.resolve_phrase("golang").canonical_name == "Go"
+
+
+def test_empty_taxonomy_is_rejected_and_current_one_kept(tmp_path):
+    taxonomy_file = tmp_path / "taxonomy_map.json"
+    _write(taxonomy_file, "Python")
+    service = TaxonomyReloadService(taxonomy_file)
+    _reload(service)
+    matcher, mapper = SkillMatcher._shared_instance, get_taxonomy_mapper()
+
+    _write(taxonomy_file)
+    with pytest.raises(TaxonomyReloadError, match="no skill mappings"):
+        _reload(service, force=True)
+    assert SkillMatcher._shared_instance is matcher
+    assert get_taxonomy_mapper() is mapper
+
+
+def test_shrinking_taxonomy_needs_force(tmp_path):
+    taxonomy_file = tmp_path / "taxonomy_map.json"
+    _write(taxonomy_file, "Python", "Rust", "Go", "Java")
+    service = TaxonomyReloadService(taxonomy_file)
+    _reload(service)
+
+    _write(taxonomy_file, "Python")
+    with pytest.raises(TaxonomyReloadError, match="down from 4"):
+        _reload(service)
+    assert len(get_taxonomy_mapper().get_all_mappings()) == 4
+
+    # Keeping at least half of the skills is fine
+    _write(taxonomy_file, "Python", "Rust")
+    assert _reload(service).skill_count == 2
+
+    _write(taxonomy_file, "Python")
+    assert _reload(service, force=True).skill_count == 1
+
+
+def test_previous_store_is_closed_once_released(tmp_path):
+    taxonomy_file = tmp_path / "taxonomy_map.json"
+    _write(taxonomy_file, "Python")
+    service = TaxonomyReloadService(taxonomy_file)
+    _reload(service)
+    previous_store = get_taxonomy_mapper().store
+    assert previous_store.get_meta("format_version")
+
+    _write(taxonomy_file, "Python", "Rust")
+    _reload(service)
+    gc.collect()
+    with pytest.raises(sqlite3.ProgrammingError):
+        previous_store.get_meta("format_version")
+    assert get_taxonomy_mapper().store.get_meta("format_version")
@@ -0,0 +1,91 @@
+"""Tests for the IVF vector index: upserts, removals and search against exact search"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.vector_index import IVFIndex
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _exact(items: dict, query: np.ndarray, k: int) -> list:
+    ids = list(items)
+    scores = _unit(np.stack([items[item_id] for item_id in ids])) @ _unit(query[None])[0]
+    order = np.argsort(-scores)[:k]
+    return [ids[i] for i in order]
+
+
+def _trained_index(rng: np.random.Generator, n: int = 400, dim: int = 16):
+    index = IVFIndex(nprobe=64, min_train_size=100)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    ids = [f"item-{i}" for i in range(n)]
+    index.add(ids, vectors)
+    return index, dict(zip(ids, vectors))
+
+
+def test_search_matches_exact_when_probing_every_list():
+    rng = np.random.default_rng(0)
+    index, items = _trained_index(rng)
+    assert index.nlist > 1
+    for query in rng.normal(size=(5, 16)).astype(np.float32):
+        found = [item_id for item_id, _ in index.search(query, 10, nprobe=index.nlist)]
+        assert found == _exact(items, query, 10)
+
+
+def test_upsert_overwrites_in_place():
+    rng = np.random.default_rng(1)
+    index, items = _trained_index(rng)
+    rows = index._size
+    for _ in range(50):
+        item_id = f"item-{rng.integers(len(items))}"
+        items[item_id] = rng.normal(size=16).astype(np.float32)
+        index.add([item_id], items[item_id][None])
+    # No dead rows accumulate from repeated upserts
+    assert index._size == rows == len(index)
+
+    query = items["item-7"]
+    found = [item_id for item_id, _ in index.search(query, 10, nprobe=index.nlist)]
+    assert found == _exact(items, query, 10)
+    assert found[0] == "item-7"
+
+
+def test_remove_and_compaction_keep_search_exact():
+    rng = np.random.default_rng(2)
+    index, items = _trained_index(rng)
+    removed = [f"item-{i}" for i in range(0, 300, 2)]
+    assert index.remove(removed) == len(removed)
+    assert index.remove(removed) == 0
+    for item_id in removed:
+        del items[item_id]
+    # Dead rows are compacted away instead of growing the storage
+    assert index._size < len(items) * 1.25 + 64
+    assert all(item_id not in index for item_id in removed)
+
+    for query in rng.normal(size=(5, 16)).astype(np.float32):
+        found = [item_id for item_id, _ in index.search(query, 10, nprobe=index.nlist)]
+        assert found == _exact(items, query, 10)
+
+    index.add(["item-0"], items["item-1"][None])
+    items["item-0"] = items["item-1"]
+    found = [item_id for item_id, _ in index.search(items["item-1"], 2, nprobe=index.nlist)]
+    assert sorted(found) == ["item-0", "item-1"]
+
+
+def test_untrained_index_is_exact():
+    rng = np.random.default_rng(3)
+    index = IVFIndex(min_train_size=1000)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    ids = [str(i) for i in range(50)]
+    index.add(ids, vectors)
+    index.add(["3"], vectors[4][None])
+    items = dict(zip(ids, vectors))
+    items["3"] = vectors[4]
+    assert index.centroids is None and index._size == 50
+    query = rng.normal(size=8).astype(np.float32)
+    assert [item_id for item_id, _ in index.search(query, 5)] == _exact(items, query, 5)
@@ -0,0 +1,391 @@
+"""In-memory IVF vector index with SQLite persistence"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.agent.quantization import check_dtype, dequantize, quantize, quantized_dot
+
+
+# Removed rows are compacted away once there are at least this many and
+# they exceed this share of the live rows
+_MIN_COMPACT_ROWS = 64
+_MAX_DEAD_FRACTION = 0.25
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class IVFIndex:
+    """
+    Inverted-file index over unit vectors for cosine top-k search
+
+    Vectors are kept as ``dtype`` (float32, float16 or per-vector scaled
+    int8) and dequantized on the fly while scoring.
+
+    Vectors are clustered with spherical k-means into ``sqrt(n)`` lists; a
+    query only scores the vectors in its ``nprobe`` closest lists. Below
+    ``min_train_size`` vectors, or before training, search is exact. Items
+    can be added, replaced and removed at any time; new vectors go into the
+    list of their nearest centroid, replacements overwrite their row in
+    place, and the index retrains itself once it has grown
+    ``retrain_growth`` times past its last training size.
+    """
+
+    def __init__(
+        self,
+        nprobe: int = 8,
+        min_train_size: int = 256,
+        retrain_growth: float = 4.0,
+        dtype: str = "float32",
+    ):
+        self.nprobe = nprobe
+        self.dtype = check_dtype(dtype)
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.dim: Optional[int] = None
+        self._codes = np.zeros((0, 0), dtype=self.dtype)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._assignments = np.zeros(0, dtype=np.int64)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        self._lists: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._codes)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        codes = np.zeros((capacity, self.dim), dtype=self.dtype)
+        codes[: self._size] = self._codes[: self._size]
+        scales = np.ones(capacity, dtype=np.float32)
+        scales[: self._size] = self._scales[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        assignments = np.full(capacity, -1, dtype=np.int64)
+        assignments[: self._size] = self._assignments[: self._size]
+        self._codes, self._scales = codes, scales
+        self._alive, self._assignments = alive, assignments
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Insert or replace items"""
+        vectors = _normalize(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._codes = np.zeros((0, self.dim), dtype=self.dtype)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+        # Last vector wins for ids repeated within the call
+        latest = {item_id: position for position, item_id in enumerate(ids)}
+        if len(latest) < len(ids):
+            positions = list(latest.values())
+            ids, vectors = list(latest), vectors[positions]
+        codes, scales = quantize(vectors, self.dtype)
+        assignments = (
+            (vectors @ self.centroids.T).argmax(axis=1)
+            if self.centroids is not None
+            else np.full(len(ids), -1, dtype=np.int64)
+        )
+
+        # Known ids are overwritten in place, so upserts don't leave dead rows
+        known = [position for position, item_id in enumerate(ids) if item_id in self._rows]
+        if known:
+            rows = np.array([self._rows[ids[position]] for position in known], dtype=np.int64)
+            self._codes[rows], self._scales[rows] = codes[known], scales[known]
+            moved = self._assignments[rows] != assignments[known]
+            self._unlist(rows[moved])
+            self._assignments[rows] = assignments[known]
+            self._list(rows[moved])
+
+        new = [position for position, item_id in enumerate(ids) if item_id not in self._rows]
+        if new:
+            self._reserve(len(new))
+            start, end = self._size, self._size + len(new)
+            self._codes[start:end], self._scales[start:end] = codes[new], scales[new]
+            self._alive[start:end] = True
+            self._assignments[start:end] = assignments[new]
+            for offset, position in enumerate(new):
+                self._ids.append(ids[position])
+                self._rows[ids[position]] = start + offset
+            self._size = end
+            self._list(np.arange(start, end))
+
+        if len(self) >= self.min_train_size and (
+            self.centroids is None or len(self) >= self._trained_size * self.retrain_growth
+        ):
+            self.train()
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Remove items by id; returns how many were present"""
+        rows = [row for row in (self._rows.pop(item_id, None) for item_id in ids) if row is not None]
+        if not rows:
+            return 0
+        rows = np.array(rows, dtype=np.int64)
+        self._alive[rows] = False
+        for row in rows:
+            self._ids[row] = None
+        self._unlist(rows)
+        # Reclaim dead rows once they are a sizeable share of the storage
+        dead = self._size - len(self)
+        if dead >= _MIN_COMPACT_ROWS and dead > len(self) * _MAX_DEAD_FRACTION:
+            self._compact()
+        return len(rows)
+
+    def _list(self, rows: np.ndarray) -> None:
+        """Add rows to the inverted lists of their centroids, if the lists are built"""
+        if self._lists is None or not len(rows):
+            return
+        for centroid in np.unique(self._assignments[rows]):
+            members = rows[self._assignments[rows] == centroid]
+            self._lists[centroid] = np.concatenate([self._lists[centroid], members])
+
+    def _unlist(self, rows: np.ndarray) -> None:
+        """Drop rows from the inverted lists of their (current) centroids"""
+        if self._lists is None or not len(rows):
+            return
+        for centroid in np.unique(self._assignments[rows]):
+            if centroid < 0:
+                continue
+            members = rows[self._assignments[rows] == centroid]
+            self._lists[centroid] = self._lists[centroid][~np.isin(self._lists[centroid], members)]
+
+    def get(self, ids: Sequence[str]) -> np.ndarray:
+        """Stored (dequantized) unit vectors for ``ids``; unknown ids give zero rows"""
+        out = np.zeros((len(ids), self.dim or 0), dtype=np.float32)
+        found = [(position, self._rows[item_id]) for position, item_id in enumerate(ids) if item_id in self._rows]
+        if found:
+            positions, rows = map(list, zip(*found))
+            out[positions] = dequantize(self._codes[rows], self._scales[rows])
+        return out
+
+    def items(self) -> Tuple[List[str], np.ndarray]:
+        """All live ids and their (dequantized) vectors, in storage order"""
+        rows = np.flatnonzero(self._alive[: self._size])
+        return [self._ids[row] for row in rows], dequantize(self._codes[rows], self._scales[rows])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored vectors"""
+        return self._codes[: self._size].nbytes + self._scales[: self._size].nbytes
+
+    def _compact(self) -> None:
+        """Drop dead rows, keeping centroid assignments"""
+        rows = np.flatnonzero(self._alive[: self._size])
+        ids = [self._ids[row] for row in rows]
+        self._codes = self._codes[rows]
+        self._scales = self._scales[rows]
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._assignments = self._assignments[rows]
+        self._ids = list(ids)
+        self._rows = {item_id: row for row, item_id in enumerate(ids)}
+        self._size = len(ids)
+        self._lists = None
+
+    def train(self, iterations: int = 10, seed: int = 0, centroids: Optional[np.ndarray] = None) -> None:
+        """
+        Cluster the current vectors (or adopt given ``centroids``) and
+        rebuild the inverted lists
+        """
+        self._compact()
+        if self._size == 0:
+            self.centroids = None
+            return
+        vectors = dequantize(self._codes, self._scales)
+
+        if centroids is None:
+            nlist = max(1, int(np.sqrt(self._size)))
+            rng = np.random.default_rng(seed)
+            centroids = vectors[rng.choice(self._size, nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assignments = (vectors @ centroids.T).argmax(axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignments, vectors)
+                empty = ~sums.any(axis=1)
+                # Re-seed empty clusters with random vectors
+                sums[empty] = vectors[rng.choice(self._size, int(empty.sum()))]
+                centroids = _normalize(sums)
+
+        self.centroids = _normalize(centroids)
+        self._assignments[: self._size] = (vectors @ self.centroids.T).argmax(axis=1)
+        self._trained_size = self._size
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        """Row numbers per centroid, rebuilt lazily after changes"""
+        if self._lists is None:
+            rows = np.flatnonzero(self._alive[: self._size])
+            assignments = self._assignments[rows]
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(assignments[order], np.arange(self.nlist + 1))
+            self._lists = [rows[order[bounds[i]:bounds[i + 1]]] for i in range(self.nlist)]
+        return self._lists
+
+    def search(
+        self, query: np.ndarray, k: int, nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Approximate top-k ``(id, cosine similarity)`` for one query vector"""
+        if not len(self) or k <= 0:
+            return []
+        query = _normalize(query)[0]
+
+        if self.centroids is None:
+            rows = np.flatnonzero(self._alive[: self._size])
+        else:
+            lists = self._inverted_lists()
+            probe = min(nprobe or self.nprobe, self.nlist)
+            closest = np.argpartition(-(self.centroids @ query), probe - 1)[:probe]
+            rows = np.concatenate([lists[c] for c in closest])
+
+        if not len(rows):
+            return []
+        scores = quantized_dot(self._codes[rows], self._scales[rows], query)
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+
+class VectorIndexStore:
+    """
+    SQLite persistence for named IVF indexes
+
+    Vectors are written one row per item as they change, so updates stay
+    incremental; centroids are stored per index after training.
+    ``path=None`` keeps everything in memory.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS vectors (
+        index_name TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        vector BLOB NOT NULL,
+        PRIMARY KEY (index_name, item_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS centroids (
+        index_name TEXT PRIMARY KEY,
+        dim INTEGER NOT NULL,
+        data BLOB NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM vectors")
+            self._conn.execute("DELETE FROM centroids")
+            self._conn.commit()
+
+    def upsert(self, index_name: str, ids: Sequence[str], vectors: np.ndarray) -> None:
+        rows = [
+            (index_name, item_id, np.asarray(vector, dtype="<f4").tobytes())
+            for item_id, vector in zip(ids, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (index_name, item_id, vector) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def delete(self, index_name: str, ids: Sequence[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM vectors WHERE index_name = ? AND item_id = ?",
+                [(index_name, item_id) for item_id in ids],
+            )
+            self._conn.commit()
+
+    def get(self, index_name: str, ids: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Stored float32 vectors for the given ids"""
+        ids = list(ids)
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT item_id, vector FROM vectors "
+                    f"WHERE index_name = ? AND item_id IN ({','.join('?' * len(chunk))})",
+                    (index_name, *chunk),
+                ).fetchall()
+                found.update((item_id, np.frombuffer(blob, dtype="<f4")) for item_id, blob in rows)
+        return found
+
+    def save_centroids(self, index_name: str, centroids: Optional[np.ndarray]) -> None:
+        with self._lock:
+            if centroids is None:
+                self._conn.execute("DELETE FROM centroids WHERE index_name = ?", (index_name,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO centroids (index_name, dim, data) VALUES (?, ?, ?)",
+                    (index_name, centroids.shape[1], centroids.astype("<f4").tobytes()),
+                )
+            self._conn.commit()
+
+    def load(self, index_name: str, index: IVFIndex) -> None:
+        """Fill ``index`` with the stored vectors and centroids of ``index_name``"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id, vector FROM vectors WHERE index_name = ?", (index_name,)
+            ).fetchall()
+            centroid_row = self._conn.execute(
+                "SELECT dim, data FROM centroids WHERE index_name = ?", (index_name,)
+            ).fetchone()
+        if not rows:
+            return
+
+        ids = [item_id for item_id, _ in rows]
+        vectors = np.stack([np.frombuffer(blob, dtype="<f4") for _, blob in rows])
+        # Load untrained, then adopt the stored centroids without re-clustering
+        min_train_size, index.min_train_size = index.min_train_size, len(ids) + 1
+        index.add(ids, vectors)
+        index.min_train_size = min_train_size
+        if centroid_row is not None:
+            dim, data = centroid_row
+            index.train(centroids=np.frombuffer(data, dtype="<f4").reshape(-1, dim))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,4 +1,17 @@
 """Skills package initialization"""
-from .taxonomy import get_taxonomy_mapper, TaxonomyMapper
+from .taxonomy import get_taxonomy_mapper, set_taxonomy_mapper, TaxonomyMapper, TAXONOMY_FILE
+from .taxonomy_embeddings import (
+    TaxonomyEmbeddingIndex,
+    get_taxonomy_embedding_index,
+    reset_taxonomy_embedding_indexes,
+)
 
-__all__ = ["get_taxonomy_mapper", "TaxonomyMapper"]
+__all__ = [
+    "get_taxonomy_mapper",
+    "set_taxonomy_mapper",
+    "TaxonomyMapper",
+    "TAXONOMY_FILE",
+    "TaxonomyEmbeddingIndex",
+    "get_taxonomy_embedding_index",
+    "reset_taxonomy_embedding_indexes",
+]
@@ -10,13 +10,24 @@ multilingual classification of Skills, Competences and Occupations.
 Official source: https://esco.ec.europa.eu/en/use-esco/download
 """
 
+import argparse
 import csv
 import json
+import os
+import re
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
 
+try:
+    from .skill_collections import COLLECTION_FILES
+    from .store import STORE_FORMAT_VERSION, build_taxonomy_store, file_digest
+except ImportError:  # executed directly as a script
+    from skill_collections import COLLECTION_FILES
+    from store import STORE_FORMAT_VERSION, build_taxonomy_store, file_digest
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -27,6 +38,46 @@ ESCO_DOWNLOAD_BASE = "https://ec.europa.eu/esco/api/resource/download"
 # We'll use the v1.1.1 CSV files (latest stable version)
 ESCO_SKILLS_CSV_URL = "https://ec.europa.eu/esco/api/resource/download?uri=http://data.europa.eu/esco/skill/en&type=csv&version=v1.1.1"
 
+SKILLS_DIR = Path(__file__).parent
+BUILD_MANIFEST = SKILLS_DIR / "taxonomy_build_manifest.json"
+
+# Local ESCO CSVs that feed the taxonomy, with whether the tech keyword
+# filter applies. The digital collection is tech-related by definition.
+ESCO_SOURCES: List[Tuple[str, bool]] = [
+    ("skills_en.csv", True),
+    ("digitalSkillsCollection_en.csv", False),
+    ("greenSkillsCollection_en.csv", True),
+    ("transversalSkillsCollection_en.csv", True),
+    ("languageSkillsCollection_en.csv", True),
+    ("researchSkillsCollection_en.csv", True),
+]
+
+# Tech-related keywords to filter skills
+TECH_KEYWORDS = [
+    'program', 'software', 'computer', 'code', 'develop', 'web', 'database',
+    'system', 'network', 'cloud', 'data', 'algorithm', 'api', 'framework',
+    'javascript', 'python', 'java', 'react', 'angular', 'node', 'docker',
+    'kubernetes', 'aws', 'azure', 'sql', 'nosql', 'machine learning', 'ai',
+    'artificial intelligence', 'devops', 'git', 'agile', 'scrum', 'testing',
+    'security', 'cyber', 'mobile', 'android', 'ios', 'typescript', 'c++',
+    'linux', 'unix', 'server', 'frontend', 'backend', 'fullstack', 'ml',
+    'deep learning', 'neural network', 'data science', 'analytics', 'ci/cd',
+    'container', 'microservice', 'rest', 'graphql', 'mongodb', 'postgresql',
+    'redis', 'elasticsearch', 'jenkins', 'terraform', 'ansible'
+]
+SOFT_KEYWORDS = ['communication', 'team', 'leadership', 'management']
+
+
+def _compile_keyword_pattern(keywords: Iterable[str]) -> "re.Pattern[str]":
+    """Compile keywords into a single substring alternation, longest first"""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered))
+
+
+TECH_PATTERN = _compile_keyword_pattern(TECH_KEYWORDS)
+SOFT_PATTERN = _compile_keyword_pattern(SOFT_KEYWORDS)
+ALT_LABEL_SEPARATOR = re.compile(r"[\n|]")
+
 
 def download_esco_skills() -> str:
     """Download ESCO skills CSV file"""
@@ -61,7 +112,7 @@ def parse_esco_csv(csv_path: str) -> List[Dict]:
                 skill = {
                     "conceptUri": row.get("conceptUri", ""),
                     "preferredLabel": row.get("preferredLabel", ""),
-                    "altLabels": row.get("altLabels", "").split("\n") if row.get("altLabels") else [],
+                    "altLabels": [a.strip() for a in ALT_LABEL_SEPARATOR.split(row.get("altLabels") or "") if a.strip()],
                     "skillType": row.get("skillType", ""),
                     "reuseLevel": row.get("reuseLevel", ""),
                     "description": row.get("description", "")
@@ -78,9 +129,11 @@ def parse_esco_csv(csv_path: str) -> List[Dict]:
 
 def create_common_tech_skills_mapping() -> List[Dict]:
     """
-    Create manual mapping for common technical skills with proper ESCO IDs
+    Create manual mapping for common technical skills
 
     This is based on actual ESCO taxonomy research for software development skills.
+    The ESCO IDs here are placeholders: merge_with_curated_skills replaces them
+    with the concept of the matching ESCO skill, along with its collections.
     """
     return [
         # Programming Languages
@@ -282,138 +335,257 @@ def create_common_tech_skills_mapping() -> List[Dict]:
     ]
 
 
-def save_taxonomy_mapping(skills: List[Dict], output_path: str):
-    """Save processed skills to JSON file"""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(skills, f, indent=2, ensure_ascii=False)
+def _stream_json_array(skills: Iterable[Dict], output_path: Path) -> Iterator[Dict]:
+    """
+    Write records to a JSON array file as they pass through
 
-    logger.info(f"Saved {len(skills)} skills to {output_path}")
+    Output goes to a temporary file which is renamed into place once the
+    input is exhausted, so readers (including the backend's taxonomy file
+    watch) never see a partial file.
+    """
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for skill in skills:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(skill, ensure_ascii=False))
+            count += 1
+            yield skill
+        f.write("\n]\n")
+    tmp_path.replace(output_path)
+
+    logger.info(f"Saved {count} skills to {output_path}")
+
+
+def save_taxonomy_mapping(skills: Iterable[Dict], output_path: str) -> int:
+    """Stream processed skills to JSON file"""
+    return sum(1 for _ in _stream_json_array(skills, Path(output_path)))
+
+
+def _row_to_skill(row: Dict[str, str], apply_filter: bool) -> Optional[Dict]:
+    """Convert an ESCO CSV row into a taxonomy record, or None if filtered out"""
+    preferred_label = (row.get('preferredLabel') or '').strip()
+    if not preferred_label:
+        return None
 
+    alt_labels = (row.get('altLabels') or '').strip()
+    description = (row.get('description') or '').strip()
+    concept_uri = (row.get('conceptUri') or '').strip()
 
-def parse_local_esco_skills() -> List[Dict]:
-    """Parse local ESCO skills CSV file"""
-    skills_file = Path(__file__).parent / "skills_en.csv"
-    logger.info(f"Parsing local ESCO skills from {skills_file}...")
+    # Check if this is a tech-related skill
+    search_text = f"{preferred_label} {alt_labels} {description}".lower()
+    if apply_filter and not TECH_PATTERN.search(search_text):
+        return None
 
-    all_skills = []
+    # Parse aliases; the full export puts one per line, collection files use " | "
+    aliases = [a.strip() for a in ALT_LABEL_SEPARATOR.split(alt_labels) if a.strip()]
+
+    return {
+        "skill_name": preferred_label,
+        "esco_id": concept_uri.split('/')[-1] if concept_uri else "",
+        "esco_uri": concept_uri,
+        "category": "soft" if SOFT_PATTERN.search(search_text) else "technical",
+        "aliases": aliases[:10],  # Limit to top 10 aliases
+        "skill_type": (row.get('skillType') or '').strip(),
+        "reuse_level": (row.get('reuseLevel') or '').strip(),
+        "description": description[:200] if description else "",  # Truncate long descriptions
+        "proficiency_levels": ["basic", "intermediate", "advanced", "expert"]
+    }
+
+
+def iter_esco_csv(csv_path: Path, apply_filter: bool = True) -> Iterator[Dict]:
+    """Stream taxonomy records from one ESCO CSV file, row by row"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            skill = _row_to_skill(row, apply_filter)
+            if skill is not None:
+                yield skill
+
+
+def _parse_source(source: Tuple[str, bool]) -> List[Dict]:
+    """Worker entry point: parse and filter a single ESCO CSV"""
+    filename, apply_filter = source
+    csv_path = SKILLS_DIR / filename
+    return list(iter_esco_csv(csv_path, apply_filter))
+
+
+def _collection_uris(filename: str) -> Set[str]:
+    """Worker entry point: concept URIs listed in one collection CSV"""
+    with open(SKILLS_DIR / filename, 'r', encoding='utf-8', newline='') as f:
+        return {
+            uri for uri in ((row.get('conceptUri') or '').strip() for row in csv.DictReader(f)) if uri
+        }
+
+
+def parse_local_esco_skills(
+    sources: List[Tuple[str, bool]] = ESCO_SOURCES,
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict]:
+    """
+    Parse local ESCO CSV files in parallel
 
-    # Tech-related keywords to filter skills
-    tech_keywords = [
-        'program', 'software', 'computer', 'code', 'develop', 'web', 'database',
-        'system', 'network', 'cloud', 'data', 'algorithm', 'api', 'framework',
-        'javascript', 'python', 'java', 'react', 'angular', 'node', 'docker',
-        'kubernetes', 'aws', 'azure', 'sql', 'nosql', 'machine learning', 'ai',
-        'artificial intelligence', 'devops', 'git', 'agile', 'scrum', 'testing',
-        'security', 'cyber', 'mobile', 'android', 'ios', 'typescript', 'c++',
-        'linux', 'unix', 'server', 'frontend', 'backend', 'fullstack', 'ml',
-        'deep learning', 'neural network', 'data science', 'analytics', 'ci/cd',
-        'container', 'microservice', 'rest', 'graphql', 'mongodb', 'postgresql',
-        'redis', 'elasticsearch', 'jenkins', 'terraform', 'ansible'
-    ]
+    Each file is parsed and filtered in its own worker process. Results are
+    yielded in source order as soon as each file is done, with skills that
+    appear in several collections de-duplicated by concept URI. Every skill
+    carries the names of all ESCO collections it belongs to, regardless of
+    which file it was first found in.
+    """
+    available = []
+    for source in sources:
+        if (SKILLS_DIR / source[0]).exists():
+            available.append(source)
+        else:
+            logger.warning(f"ESCO source {source[0]} not found, skipping")
+    if not available:
+        return
+
+    logger.info(f"Parsing {len(available)} local ESCO files...")
+    seen_uris: Set[str] = set()
+    workers = max_workers or min(len(available), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        collections = [
+            (name, filename)
+            for name, filename in COLLECTION_FILES.items()
+            if (SKILLS_DIR / filename).exists()
+        ]
+        # Membership is only URIs, so it is cheap to resolve up front
+        membership: Dict[str, List[str]] = {}
+        for (name, _), uris in zip(
+            collections, executor.map(_collection_uris, [filename for _, filename in collections])
+        ):
+            for uri in uris:
+                membership.setdefault(uri, []).append(name)
+
+        for (filename, _), skills in zip(available, executor.map(_parse_source, available)):
+            kept = 0
+            for skill in skills:
+                key = skill["esco_uri"] or skill["skill_name"].lower()
+                if key in seen_uris:
+                    continue
+                seen_uris.add(key)
+                kept += 1
+                skill["collections"] = membership.get(skill["esco_uri"], [])
+                yield skill
+            logger.info(f"Found {kept} new skills in {filename}")
+
+
+def merge_with_curated_skills(esco_skills: Iterable[Dict], curated_skills: List[Dict]) -> Iterator[Dict]:
+    """
+    Merge ESCO skills with curated tech skills, prioritizing curated mappings
 
+    An ESCO skill whose name or an alias matches a curated skill is folded
+    into it: the curated entry takes the ESCO concept URI and ID (preferring
+    the skill named exactly like it) and every collection the duplicates
+    belong to. Other ESCO skills are streamed through; the curated skills
+    follow once all duplicates have been seen.
+    """
+    curated = {
+        skill['skill_name'].lower(): {**skill, "collections": list(skill.get("collections", []))}
+        for skill in curated_skills
+    }
+    # Curated name -> whether its ESCO identity came from an exact name match
+    exact_match: Dict[str, bool] = {}
+
+    added = 0
+    for esco_skill in esco_skills:
+        name = esco_skill['skill_name'].lower()
+        names = dict.fromkeys([name] + [alias.lower() for alias in esco_skill.get('aliases', [])])
+        duplicates = [candidate for candidate in names if candidate in curated]
+        if not duplicates:
+            added += 1
+            yield esco_skill
+            continue
+
+        for duplicate in duplicates:
+            entry = curated[duplicate]
+            for collection in esco_skill.get("collections", []):
+                if collection not in entry["collections"]:
+                    entry["collections"].append(collection)
+            exact = name == duplicate
+            if esco_skill.get("esco_uri") and not exact_match.get(duplicate, False) and (
+                exact or duplicate not in exact_match
+            ):
+                exact_match[duplicate] = exact
+                entry["esco_uri"] = esco_skill["esco_uri"]
+                entry["esco_id"] = esco_skill["esco_id"]
+
+    yield from curated.values()
+
+    logger.info(
+        f"Merged to {len(curated) + added} total skills ({len(curated)} curated + {added} from ESCO, "
+        f"{len(exact_match)} curated skills linked to ESCO concepts)"
+    )
+
+
+def _input_digests(sources: List[Tuple[str, bool]]) -> Dict[str, str]:
+    """Hash every build input; the builder script itself covers the curated list"""
+    paths = [SKILLS_DIR / filename for filename, _ in sources]
+    paths = [path for path in paths if path.exists()] + [Path(__file__)]
+    with ThreadPoolExecutor() as executor:
+        digests = executor.map(file_digest, paths)
+    inputs = {path.name: digest for path, digest in zip(paths, digests)}
+    inputs["store_format_version"] = STORE_FORMAT_VERSION
+    return inputs
+
+
+def _load_manifest() -> Dict[str, str]:
     try:
-        with open(skills_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                preferred_label = row.get('preferredLabel', '').strip()
-                alt_labels = row.get('altLabels', '').strip()
-                description = row.get('description', '').strip()
-                concept_uri = row.get('conceptUri', '').strip()
-                skill_type = row.get('skillType', '').strip()
-                reuse_level = row.get('reuseLevel', '').strip()
-
-                # Check if this is a tech-related skill
-                search_text = f"{preferred_label} {alt_labels} {description}".lower()
-                if any(keyword in search_text for keyword in tech_keywords):
-                    # Extract ESCO ID from URI
-                    esco_id = concept_uri.split('/')[-1] if concept_uri else ""
-
-                    # Parse aliases
-                    aliases = [a.strip() for a in alt_labels.split('\n') if a.strip()]
-
-                    # Determine category
-                    category = "technical"
-                    if any(word in search_text for word in ['communication', 'team', 'leadership', 'management']):
-                        category = "soft"
-
-                    skill = {
-                        "skill_name": preferred_label,
-                        "esco_id": esco_id,
-                        "esco_uri": concept_uri,
-                        "category": category,
-                        "aliases": aliases[:10],  # Limit to top 10 aliases
-                        "skill_type": skill_type,
-                        "reuse_level": reuse_level,
-                        "description": description[:200] if description else "",  # Truncate long descriptions
-                        "proficiency_levels": ["basic", "intermediate", "advanced", "expert"]
-                    }
-                    all_skills.append(skill)
-
-        logger.info(f"Found {len(all_skills)} tech-related skills from ESCO CSV")
-        return all_skills
-
-    except Exception as e:
-        logger.error(f"Failed to parse local ESCO skills: {e}")
-        return []
-
-
-def merge_with_curated_skills(esco_skills: List[Dict], curated_skills: List[Dict]) -> List[Dict]:
-    """Merge ESCO skills with curated tech skills, prioritizing curated mappings"""
+        with open(BUILD_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f).get("inputs", {})
+    except (OSError, ValueError):
+        return {}
 
-    # Create a lookup by skill name (lowercase)
-    curated_lookup = {skill['skill_name'].lower(): skill for skill in curated_skills}
 
-    # Start with curated skills
-    merged = curated_skills.copy()
+def _save_manifest(digests: Dict[str, str]) -> None:
+    with open(BUILD_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump({"inputs": digests}, f, indent=2, sort_keys=True)
 
-    # Add ESCO skills that aren't in curated list
-    for esco_skill in esco_skills:
-        skill_name_lower = esco_skill['skill_name'].lower()
-
-        # Check if skill or any alias matches curated skills
-        if skill_name_lower not in curated_lookup:
-            # Check aliases too
-            alias_match = False
-            for alias in esco_skill.get('aliases', []):
-                if alias.lower() in curated_lookup:
-                    alias_match = True
-                    break
 
-            if not alias_match:
-                merged.append(esco_skill)
+def write_taxonomy_artifacts(skills: Iterable[Dict], json_path: Path, store_path: Path) -> int:
+    """
+    Write the taxonomy JSON and compiled store in a single streaming pass
 
-    logger.info(f"Merged to {len(merged)} total skills ({len(curated_skills)} curated + {len(merged) - len(curated_skills)} from ESCO)")
-    return merged
+    Records reach the store as they are written to JSON, so the full list of
+    skills is never held in memory.
+    """
+    return build_taxonomy_store(
+        _stream_json_array(skills, json_path),
+        store_path,
+        source_digest=lambda: file_digest(json_path),
+    )
 
 
-def main():
+def main(force: bool = False):
     """Main execution"""
     logger.info("Starting ESCO taxonomy processing...")
 
-    # Parse local ESCO CSV files
-    esco_skills = parse_local_esco_skills()
+    output_path = SKILLS_DIR / "taxonomy_map.json"
+    store_path = output_path.with_suffix(".db")
+
+    digests = _input_digests(ESCO_SOURCES)
+    if not force and output_path.exists() and store_path.exists() and _load_manifest() == digests:
+        logger.info("ESCO inputs unchanged since last build, nothing to do")
+        return
 
     # Get curated tech skills mapping
     logger.info("Loading curated tech skills mapping...")
     curated_skills = create_common_tech_skills_mapping()
 
-    # Merge ESCO data with curated mappings
-    if esco_skills:
-        logger.info("Merging ESCO data with curated mappings...")
-        final_skills = merge_with_curated_skills(esco_skills, curated_skills)
-    else:
-        logger.warning("No ESCO skills found, using curated mapping only")
-        final_skills = curated_skills
-
-    # Save to the taxonomy map file
-    output_path = Path(__file__).parent / "taxonomy_map.json"
-    save_taxonomy_mapping(final_skills, str(output_path))
+    # Stream parsed ESCO skills through the merge straight to disk
+    esco_skills = parse_local_esco_skills(ESCO_SOURCES)
+    final_skills = merge_with_curated_skills(esco_skills, curated_skills)
+    total = write_taxonomy_artifacts(final_skills, output_path, store_path)
+    _save_manifest(digests)
 
     logger.info("ESCO taxonomy mapping complete!")
-    logger.info(f"Total skills mapped: {len(final_skills)}")
+    logger.info(f"Total skills mapped: {total}")
     logger.info(f"  - Curated: {len(curated_skills)}")
-    logger.info(f"  - From ESCO CSV: {len(final_skills) - len(curated_skills)}")
+    logger.info(f"  - From ESCO CSV: {total - len(curated_skills)}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no input changed")
+    main(force=parser.parse_args().force)
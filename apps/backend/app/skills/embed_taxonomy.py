@@ -0,0 +1,42 @@
+"""
+Embed canonical taxonomy skills for the semantic resolve_phrase fallback
+
+Run from apps/backend after building taxonomy_map.json:
+
+    python -m app.skills.embed_taxonomy
+"""
+import asyncio
+import logging
+
+import numpy as np
+
+from app.agent import EmbeddingManager
+from app.core import settings
+from app.skills import TaxonomyMapper
+from app.skills.taxonomy_embeddings import EMBEDDINGS_FILE, save_taxonomy_embeddings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def embed_taxonomy() -> int:
+    """Embed every canonical skill name; returns the number of rows written"""
+    names = sorted({mapping["skill_name"] for mapping in TaxonomyMapper().get_all_mappings()})
+    if not names:
+        logger.error("Taxonomy is empty, build it first with app/skills/download_esco.py")
+        return 0
+
+    logger.info(f"Embedding {len(names)} skills with {settings.EMBEDDING_PROVIDER}/{settings.EMBEDDING_MODEL}...")
+    vectors = await EmbeddingManager().embed_many(names)
+    save_taxonomy_embeddings(
+        names,
+        np.asarray(vectors, dtype=np.float32),
+        provider=settings.EMBEDDING_PROVIDER,
+        model=settings.EMBEDDING_MODEL,
+    )
+    logger.info(f"Saved {len(names)} x {len(vectors[0])} embeddings to {EMBEDDINGS_FILE}")
+    return len(names)
+
+
+if __name__ == "__main__":
+    asyncio.run(embed_taxonomy())
@@ -0,0 +1,125 @@
+"""ESCO skill-collection membership as bitsets over dense skill IDs
+
+ESCO publishes the digital, green, transversal, language and research skill
+collections as separate CSVs. The taxonomy build compiles each one into a
+bitset indexed by the store's dense skill ID, so tagging a profile (or
+thousands of them) is an AND plus a popcount.
+"""
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+# Collection name -> source CSV in app/skills/
+COLLECTION_FILES: Dict[str, str] = {
+    "digital": "digitalSkillsCollection_en.csv",
+    "green": "greenSkillsCollection_en.csv",
+    "transversal": "transversalSkillsCollection_en.csv",
+    "language": "languageSkillsCollection_en.csv",
+    "research": "researchSkillsCollection_en.csv",
+}
+
+_WORD_BITS = 64
+
+
+def pack_bitset(skill_ids: Iterable[int], size: int) -> np.ndarray:
+    """Pack dense skill IDs (< size) into a uint64 word array"""
+    bits = np.zeros(size, dtype=bool)
+    ids = np.fromiter(skill_ids, dtype=np.int64)
+    bits[ids[(ids >= 0) & (ids < size)]] = True
+    padded = np.zeros(-(-size // _WORD_BITS) * _WORD_BITS, dtype=bool)
+    padded[:size] = bits
+    return np.packbits(padded, bitorder="little").view("<u8").copy()
+
+
+def bitset_to_bytes(bitset: np.ndarray) -> bytes:
+    return bitset.astype("<u8").tobytes()
+
+
+def bitset_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u8").copy()
+
+
+class CollectionTagger:
+    """
+    Computes per-collection skill shares for one or many profiles
+
+    Args:
+        bitsets: collection name -> uint64 word array over dense skill IDs
+        size: number of dense skill IDs (bit positions)
+    """
+
+    def __init__(self, bitsets: Mapping[str, np.ndarray], size: int):
+        self.size = size
+        self.words = -(-size // _WORD_BITS)
+        self.names: List[str] = sorted(bitsets)
+        masks = np.zeros((len(self.names), self.words), dtype=np.uint64)
+        for row, name in enumerate(self.names):
+            bitset = bitsets[name][: self.words]
+            masks[row, : len(bitset)] = bitset
+        self._masks = masks
+
+    def _profile_matrix(self, profiles: List[Iterable[int]]) -> np.ndarray:
+        matrix = np.zeros((len(profiles), self.words), dtype=np.uint64)
+        id_lists = [np.fromiter(skill_ids, dtype=np.int64) for skill_ids in profiles]
+        if not id_lists:
+            return matrix
+        rows = np.repeat(np.arange(len(id_lists)), [len(ids) for ids in id_lists])
+        ids = np.concatenate(id_lists)
+        valid = (ids >= 0) & (ids < self.size)
+        rows, ids = rows[valid], ids[valid]
+        # OR is idempotent, so duplicate IDs within a profile are harmless
+        np.bitwise_or.at(
+            matrix,
+            (rows, ids // _WORD_BITS),
+            np.left_shift(np.uint64(1), (ids % _WORD_BITS).astype(np.uint64)),
+        )
+        return matrix
+
+    def count(self, profiles: List[Iterable[int]]) -> np.ndarray:
+        """
+        Collection hit counts per profile
+
+        Returns:
+            int array of shape (profiles, collections) ordered like ``names``
+        """
+        matrix = self._profile_matrix(profiles)
+        return self._hits(matrix)
+
+    def _hits(self, matrix: np.ndarray) -> np.ndarray:
+        # (P, 1, W) & (1, C, W) -> popcount -> sum over words
+        hits = np.bitwise_count(matrix[:, None, :] & self._masks[None, :, :])
+        return hits.sum(axis=2, dtype=np.int64)
+
+    def tag(self, skill_ids: Iterable[int], total_skills: Optional[int] = None) -> Dict[str, float]:
+        """
+        Share of a profile's skills in each collection
+
+        ``total_skills`` is the denominator; it defaults to the number of
+        distinct taxonomy skills given, but callers can pass the full profile
+        size so unmapped skills count against the share.
+        """
+        ids = list(skill_ids)
+        counts = self.count([ids])[0]
+        total = total_skills if total_skills is not None else len(set(ids))
+        if not total:
+            return {name: 0.0 for name in self.names}
+        return {name: round(int(hits) / total, 4) for name, hits in zip(self.names, counts)}
+
+    def aggregate(
+        self, profiles: List[Iterable[int]], totals: Optional[List[int]] = None
+    ) -> Dict[str, float]:
+        """
+        Mean per-profile collection share across many profiles
+
+        ``totals`` gives each profile's denominator, as in ``tag``.
+        """
+        if not profiles:
+            return {name: 0.0 for name in self.names}
+        matrix = self._profile_matrix(profiles)
+        if totals is None:
+            totals = np.bitwise_count(matrix).sum(axis=1, dtype=np.int64)
+        else:
+            totals = np.asarray(totals, dtype=np.int64)
+        hits = self._hits(matrix)
+        shares = np.divide(hits, totals[:, None], out=np.zeros(hits.shape), where=totals[:, None] > 0)
+        return {name: round(float(share), 4) for name, share in zip(self.names, shares.mean(axis=0))}
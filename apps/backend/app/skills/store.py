@@ -0,0 +1,263 @@
+"""Compact SQLite-backed storage for the skill taxonomy
+
+The build step compiles ``taxonomy_map.json`` into ``taxonomy_map.db``. At
+runtime only the hot fields needed for lookups (name, ESCO ID, category and
+skill type) are kept in memory; descriptions, proficiency levels and full
+alias lists stay on disk and are read on demand. ESCO collection membership
+is stored as one bitset per collection over the dense skill IDs.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    from .skill_collections import bitset_to_bytes, pack_bitset
+except ImportError:  # executed as a script from app/skills
+    from skill_collections import bitset_to_bytes, pack_bitset
+
+STORE_FORMAT_VERSION = "2"
+
+HOT_FIELDS: Tuple[str, ...] = ("skill_name", "esco_id", "category", "skill_type")
+_HOT_INDEX = {field: position for position, field in enumerate(HOT_FIELDS)}
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE skills (
+    id INTEGER PRIMARY KEY,
+    skill_name TEXT NOT NULL,
+    esco_id TEXT,
+    category TEXT,
+    skill_type TEXT,
+    cold TEXT NOT NULL
+);
+CREATE TABLE aliases (
+    skill_id INTEGER NOT NULL REFERENCES skills(id),
+    position INTEGER NOT NULL,
+    alias TEXT NOT NULL
+);
+CREATE INDEX aliases_skill_id ON aliases(skill_id);
+CREATE TABLE collections (name TEXT PRIMARY KEY, bits BLOB NOT NULL);
+"""
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_taxonomy_store(
+    mappings: Iterable[Dict[str, Any]],
+    output_path: Path,
+    source_digest: Union[str, Callable[[], str]] = "",
+) -> int:
+    """
+    Compile taxonomy mappings into a SQLite store
+
+    The store is written to a temporary file and renamed into place so that
+    readers never observe a half-written database. ``source_digest`` may be a
+    callable when the source file is produced while ``mappings`` is consumed;
+    it is evaluated after the last mapping has been written. A mapping's
+    ``collections`` list is compiled into the per-collection bitsets.
+
+    Returns:
+        Number of skills written
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    count = 0
+    max_id = 0
+    members: Dict[str, Set[int]] = {}
+    try:
+        conn.executescript(_SCHEMA)
+        for skill_id, mapping in enumerate(mappings, start=1):
+            skill_name = mapping.get("skill_name")
+            if not skill_name:
+                continue
+            cold = {
+                key: value
+                for key, value in mapping.items()
+                if key not in HOT_FIELDS and key not in ("aliases", "collections")
+            }
+            for collection in mapping.get("collections") or []:
+                members.setdefault(collection, set()).add(skill_id)
+            max_id = skill_id
+            conn.execute(
+                "INSERT INTO skills (id, skill_name, esco_id, category, skill_type, cold) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    skill_id,
+                    skill_name,
+                    mapping.get("esco_id"),
+                    mapping.get("category"),
+                    mapping.get("skill_type"),
+                    json.dumps(cold, ensure_ascii=False, separators=(",", ":")),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO aliases (skill_id, position, alias) VALUES (?, ?, ?)",
+                [
+                    (skill_id, position, alias)
+                    for position, alias in enumerate(mapping.get("aliases") or [])
+                    if alias
+                ],
+            )
+            count += 1
+        conn.executemany(
+            "INSERT INTO collections (name, bits) VALUES (?, ?)",
+            [
+                (name, bitset_to_bytes(pack_bitset(ids, max_id + 1)))
+                for name, ids in sorted(members.items())
+            ],
+        )
+        if callable(source_digest):
+            source_digest = source_digest()
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("format_version", STORE_FORMAT_VERSION), ("source_digest", source_digest)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    tmp_path.replace(output_path)
+    return count
+
+
+class TaxonomyStore:
+    """Read-only handle on a compiled taxonomy store"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def iter_hot_rows(self) -> Iterator[Tuple[int, Tuple[Optional[str], ...]]]:
+        """Yield ``(skill_id, hot_fields)`` for every skill"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, skill_name, esco_id, category, skill_type FROM skills ORDER BY id"
+            ).fetchall()
+        for row in rows:
+            yield row[0], tuple(row[1:])
+
+    def iter_alias_rows(self) -> Iterator[Tuple[int, str]]:
+        """Yield ``(skill_id, alias)`` pairs in alias order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT skill_id, alias FROM aliases ORDER BY skill_id, position"
+            ).fetchall()
+        yield from rows
+
+    def load_collections(self) -> Dict[str, bytes]:
+        """Return the raw bitset of every collection"""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, bits FROM collections").fetchall()
+        return dict(rows)
+
+    def fetch_cold(self, skill_id: int) -> Dict[str, Any]:
+        """Load the cold fields and alias list of a single skill"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cold FROM skills WHERE id = ?", (skill_id,)
+            ).fetchone()
+            aliases = [
+                alias
+                for (alias,) in self._conn.execute(
+                    "SELECT alias FROM aliases WHERE skill_id = ? ORDER BY position",
+                    (skill_id,),
+                )
+            ]
+        cold: Dict[str, Any] = json.loads(row[0]) if row else {}
+        cold["aliases"] = aliases
+        return cold
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TaxonomyRecord(Mapping):
+    """
+    Read-only mapping for one taxonomy skill
+
+    Behaves like the dict previously loaded from JSON. Hot fields are answered
+    from memory; the first access to anything else loads the cold fields from
+    the backing store, and they are kept on the record from then on.
+    """
+
+    __slots__ = ("_store", "_skill_id", "_hot", "_cold_fields")
+
+    def __init__(self, store: TaxonomyStore, skill_id: int, hot: Tuple[Optional[str], ...]):
+        self._store = store
+        self._skill_id = skill_id
+        self._hot = hot
+        self._cold_fields: Optional[Dict[str, Any]] = None
+
+    @property
+    def skill_id(self) -> int:
+        return self._skill_id
+
+    def _cold(self) -> Dict[str, Any]:
+        if self._cold_fields is None:
+            self._cold_fields = self._store.fetch_cold(self._skill_id)
+        return self._cold_fields
+
+    def __getitem__(self, key: str) -> Any:
+        position = _HOT_INDEX.get(key)
+        if position is not None:
+            value = self._hot[position]
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self._cold()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for field, value in zip(HOT_FIELDS, self._hot):
+            if value is not None:
+                yield field
+        yield from self._cold()
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._hot if value is not None) + len(self._cold())
+
+    def __repr__(self) -> str:
+        return f"TaxonomyRecord({self._hot[0]!r}, esco_id={self._hot[1]!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialise the full record, including cold fields"""
+        return dict(self.items())
+
+
+def load_records(store: TaxonomyStore) -> Tuple[List[TaxonomyRecord], Dict[int, List[str]]]:
+    """
+    Load hot records and the alias index from a store
+
+    Returns:
+        (records ordered by skill id, {skill_id: aliases})
+    """
+    records = [TaxonomyRecord(store, skill_id, hot) for skill_id, hot in store.iter_hot_rows()]
+    aliases: Dict[int, List[str]] = {}
+    for skill_id, alias in store.iter_alias_rows():
+        aliases.setdefault(skill_id, []).append(alias)
+    return records, aliases
@@ -1,38 +1,52 @@
 """Skill taxonomy utilities for mapping skills to ESCO IDs"""
 import json
-import os
-from typing import Optional, Dict, List
+import sqlite3
+from collections.abc import Mapping
+from typing import Any, Optional, Dict, List, Iterator, Tuple
 from pathlib import Path
 
+from .skill_collections import CollectionTagger, bitset_from_bytes, pack_bitset
+from .store import (
+    STORE_FORMAT_VERSION,
+    TaxonomyStore,
+    build_taxonomy_store,
+    file_digest,
+    load_records,
+)
+
+TAXONOMY_FILE = Path(__file__).parent / "taxonomy_map.json"
+
 
 class TaxonomyMapper:
     """Maps skill names to ESCO taxonomy IDs"""
 
-    def __init__(self):
-        self._taxonomy_map: Dict[str, Dict] = {}
+    def __init__(self, taxonomy_file: Optional[Path] = None):
+        self.taxonomy_file = Path(taxonomy_file) if taxonomy_file else TAXONOMY_FILE
+        self._taxonomy_map: Dict[str, Mapping] = {}
+        self._store: Optional[TaxonomyStore] = None
+        # Dense skill IDs keyed by ESCO ID and lower-cased canonical name
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_id_limit = 0
+        self._collection_tagger: Optional[CollectionTagger] = None
         self._load_taxonomy()
 
+    @property
+    def store(self) -> Optional[TaxonomyStore]:
+        """Compiled store backing the records, or None when loaded from JSON"""
+        return self._store
+
     def _load_taxonomy(self):
-        """Load taxonomy mappings from JSON file"""
-        taxonomy_file = Path(__file__).parent / "taxonomy_map.json"
+        """Load taxonomy mappings, preferring the compiled store over raw JSON"""
+        taxonomy_file = self.taxonomy_file
+        store_file = taxonomy_file.with_suffix(".db")
         try:
-            with open(taxonomy_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            self._store = self._open_store(taxonomy_file, store_file)
+            if self._store is not None:
+                self._load_from_store(self._store)
+            else:
+                self._load_from_json(taxonomy_file)
 
-                # Handle both array format and object format
-                mappings = data if isinstance(data, list) else data.get("mappings", [])
-
-                # Create index by skill name (case-insensitive)
-                for mapping in mappings:
-                    skill_name = mapping["skill_name"].lower()
-                    self._taxonomy_map[skill_name] = mapping
-
-                    # Also index by aliases
-                    for alias in mapping.get("aliases", []):
-                        if alias:  # Skip empty aliases
-                            self._taxonomy_map[alias.lower()] = mapping
-
-                print(f"Loaded {len(self._taxonomy_map)} skill mappings from ESCO taxonomy")
+            print(f"Loaded {len(self._taxonomy_map)} skill mappings from ESCO taxonomy")
         except FileNotFoundError:
             print("Warning: Taxonomy file not found, continuing without ESCO mappings")
             pass
@@ -40,20 +54,122 @@ class TaxonomyMapper:
             print(f"Error loading taxonomy: {e}")
             pass
 
-    def get_mapping(self, skill_name: str) -> Optional[Dict]:
+    @staticmethod
+    def _open_store(taxonomy_file: Path, store_file: Path) -> Optional[TaxonomyStore]:
+        """
+        Open the compiled taxonomy store, (re)building it from JSON when it is
+        missing or was compiled from a different JSON file.
+
+        Returns None when the store cannot be used, in which case the caller
+        falls back to loading the JSON directly.
+        """
+        source_digest = file_digest(taxonomy_file) if taxonomy_file.exists() else None
+
+        if store_file.exists():
+            try:
+                store = TaxonomyStore(store_file)
+                if store.get_meta("format_version") == STORE_FORMAT_VERSION and (
+                    source_digest is None or store.get_meta("source_digest") == source_digest
+                ):
+                    return store
+                store.close()
+            except sqlite3.Error as e:
+                print(f"Warning: Ignoring unreadable taxonomy store: {e}")
+
+        if source_digest is None:
+            return None
+
+        try:
+            with open(taxonomy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            mappings = data if isinstance(data, list) else data.get("mappings", [])
+            build_taxonomy_store(mappings, store_file, source_digest=source_digest)
+            return TaxonomyStore(store_file)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not build taxonomy store, using JSON directly: {e}")
+            return None
+
+    def _load_from_store(self, store: TaxonomyStore):
+        """Index hot records by skill name and aliases (case-insensitive)"""
+        records, aliases = load_records(store)
+        for record in records:
+            self._taxonomy_map[record["skill_name"].lower()] = record
+            for alias in aliases.get(record.skill_id, ()):
+                self._taxonomy_map[alias.lower()] = record
+            self._register_skill_id(record, record.skill_id)
+
+        bitsets = {name: bitset_from_bytes(bits) for name, bits in store.load_collections().items()}
+        if bitsets:
+            self._collection_tagger = CollectionTagger(bitsets, self._skill_id_limit)
+
+    def _load_from_json(self, taxonomy_file: Path):
+        """Load taxonomy mappings from JSON file"""
+        with open(taxonomy_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+            # Handle both array format and object format
+            mappings = data if isinstance(data, list) else data.get("mappings", [])
+
+            # Create index by skill name (case-insensitive)
+            members: Dict[str, List[int]] = {}
+            for skill_id, mapping in enumerate(mappings, start=1):
+                skill_name = mapping["skill_name"].lower()
+                self._taxonomy_map[skill_name] = mapping
+
+                # Also index by aliases
+                for alias in mapping.get("aliases", []):
+                    if alias:  # Skip empty aliases
+                        self._taxonomy_map[alias.lower()] = mapping
+
+                self._register_skill_id(mapping, skill_id)
+                for collection in mapping.get("collections") or []:
+                    members.setdefault(collection, []).append(skill_id)
+
+            if members:
+                self._collection_tagger = CollectionTagger(
+                    {name: pack_bitset(ids, self._skill_id_limit) for name, ids in members.items()},
+                    self._skill_id_limit,
+                )
+
+    def _register_skill_id(self, mapping: Mapping, skill_id: int):
+        self._skill_ids[mapping["skill_name"].lower()] = skill_id
+        esco_id = mapping.get("esco_id")
+        if esco_id:
+            self._skill_ids[esco_id] = skill_id
+        self._skill_id_limit = max(self._skill_id_limit, skill_id + 1)
+
+    def get_mapping(self, skill_name: str) -> Optional[Dict[str, Any]]:
         """Get ESCO mapping for a skill name"""
-        return self._taxonomy_map.get(skill_name.lower())
+        mapping = self._taxonomy_map.get(skill_name.lower())
+        return dict(mapping) if mapping is not None else None
 
     def get_esco_id(self, skill_name: str) -> Optional[str]:
         """Get ESCO ID for a skill name"""
-        mapping = self.get_mapping(skill_name)
+        mapping = self._taxonomy_map.get(skill_name.lower())
         return mapping.get("esco_id") if mapping else None
 
     def get_category(self, skill_name: str) -> str:
         """Get category for a skill (technical, soft, domain)"""
-        mapping = self.get_mapping(skill_name)
+        mapping = self._taxonomy_map.get(skill_name.lower())
         return mapping.get("category", "technical") if mapping else "technical"
 
+    def get_skill_id(self, skill: str) -> Optional[int]:
+        """
+        Dense skill ID for an ESCO ID or a skill name/alias
+
+        IDs are positions in the collection bitsets; they are only stable
+        for the lifetime of this mapper.
+        """
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is not None:
+            return skill_id
+        mapping = self._taxonomy_map.get(skill.lower())
+        return self._skill_ids.get(mapping["skill_name"].lower()) if mapping else None
+
+    def get_collection_tagger(self) -> Optional[CollectionTagger]:
+        """Collection bitsets for this taxonomy, or None if it has none"""
+        return self._collection_tagger
+
     def find_similar_skills(self, skill_name: str, limit: int = 5) -> List[str]:
         """Find similar skill names in taxonomy"""
         skill_lower = skill_name.lower()
@@ -71,10 +187,10 @@ class TaxonomyMapper:
         """Get all mapped skill names"""
         return list(self._taxonomy_map.keys())
 
-    def get_all_mappings(self) -> List[Dict]:
+    def get_all_mappings(self) -> List[Mapping]:
         """Return unique taxonomy mapping records"""
         seen: set[int] = set()
-        mappings: List[Dict] = []
+        mappings: List[Mapping] = []
 
         for mapping in self._taxonomy_map.values():
             mapping_id = id(mapping)
@@ -85,6 +201,24 @@ class TaxonomyMapper:
 
         return mappings
 
+    def iter_mappings_with_aliases(self) -> Iterator[Tuple[Mapping, List[str]]]:
+        """
+        Yield ``(mapping, aliases)`` for every unique mapping
+
+        Reads all alias lists in one pass instead of loading them per record,
+        which is what index builders need.
+        """
+        if self._store is None:
+            for mapping in self.get_all_mappings():
+                yield mapping, list(mapping.get("aliases", []))
+            return
+
+        aliases: Dict[int, List[str]] = {}
+        for skill_id, alias in self._store.iter_alias_rows():
+            aliases.setdefault(skill_id, []).append(alias)
+        for mapping in self.get_all_mappings():
+            yield mapping, aliases.get(mapping.skill_id, [])
+
 
 # Global instance
 _taxonomy_mapper = None
@@ -95,3 +229,15 @@ def get_taxonomy_mapper() -> TaxonomyMapper:
     if _taxonomy_mapper is None:
         _taxonomy_mapper = TaxonomyMapper()
     return _taxonomy_mapper
+
+
+def set_taxonomy_mapper(mapper: TaxonomyMapper) -> Optional[TaxonomyMapper]:
+    """
+    Replace the singleton taxonomy mapper and return the previous one
+
+    Callers that already hold the old mapper keep using it until they finish;
+    new callers of get_taxonomy_mapper() see the replacement.
+    """
+    global _taxonomy_mapper
+    previous, _taxonomy_mapper = _taxonomy_mapper, mapper
+    return previous
@@ -0,0 +1,151 @@
+"""Embedding matrix of canonical taxonomy skills
+
+``python -m app.skills.embed_taxonomy`` embeds every canonical skill name
+with the configured embedding model and writes an L2-normalised float32
+matrix to ``taxonomy_embeddings.npy`` plus a sidecar JSON with the row
+names and model. At runtime the matrix is memory-mapped, so resolving a
+batch of phrases is one matrix product against it.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_FILE = Path(__file__).parent / "taxonomy_embeddings.npy"
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row; zero rows stay zero"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def save_taxonomy_embeddings(
+    names: Sequence[str],
+    vectors: np.ndarray,
+    provider: str,
+    model: str,
+    path: Path = EMBEDDINGS_FILE,
+) -> None:
+    """Write the normalised matrix and its metadata, each renamed into place"""
+    matrix = normalize_rows(vectors)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, matrix)
+    tmp_path.replace(path)
+
+    meta_path = path.with_suffix(".json")
+    tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(
+            {"provider": provider, "model": model, "dim": int(matrix.shape[1]), "names": list(names)},
+            f,
+            ensure_ascii=False,
+        )
+    tmp_meta.replace(meta_path)
+
+
+class TaxonomyEmbeddingIndex:
+    """Nearest canonical skill for embedded phrases via one GEMM"""
+
+    def __init__(self, matrix: np.ndarray, names: List[str], provider: str, model: str):
+        self.matrix = matrix
+        self.names = names
+        self.provider = provider
+        self.model = model
+
+    @classmethod
+    def load(
+        cls, provider: str, model: str, path: Path = EMBEDDINGS_FILE
+    ) -> Optional["TaxonomyEmbeddingIndex"]:
+        """
+        Memory-map a saved matrix; None if it is missing, inconsistent or
+        was built with a different embedding model than ``provider``/``model``.
+        """
+        meta_path = path.with_suffix(".json")
+        if not path.exists() or not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            matrix = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable taxonomy embeddings: {e}")
+            return None
+
+        if (meta.get("provider"), meta.get("model")) != (provider, model):
+            logger.warning(
+                f"Taxonomy embeddings were built with {meta.get('provider')}/{meta.get('model')}, "
+                f"not the configured {provider}/{model}; "
+                "rebuild them with `python -m app.skills.embed_taxonomy`"
+            )
+            return None
+        names = meta.get("names") or []
+        if matrix.ndim != 2 or matrix.shape[0] != len(names):
+            logger.warning("Taxonomy embeddings matrix does not match its metadata")
+            return None
+        return cls(matrix, names, provider, model)
+
+    def nearest(self, vectors: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best matching row and its cosine similarity for each query vector
+
+        Returns:
+            (row indices, similarities), both of length ``len(vectors)``
+        """
+        queries = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if queries.shape[1] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match taxonomy embeddings "
+                f"dimension {self.matrix.shape[1]}"
+            )
+        scores = queries @ self.matrix.T
+        best = scores.argmax(axis=1)
+        return best, scores[np.arange(len(best)), best]
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, ...]]:
+    """mtime and size of the matrix and its metadata; None if either is missing"""
+    try:
+        stats = [path.stat(), path.with_suffix(".json").stat()]
+    except FileNotFoundError:
+        return None
+    return tuple(value for stat in stats for value in (stat.st_mtime_ns, stat.st_size))
+
+
+_embedding_indexes: Dict[Tuple[str, str], Tuple[Tuple[int, ...], TaxonomyEmbeddingIndex]] = {}
+
+
+def get_taxonomy_embedding_index(provider: str, model: str) -> Optional[TaxonomyEmbeddingIndex]:
+    """
+    Get the taxonomy embedding index for an embedding model, or None when unavailable
+
+    The loaded index is reused until the files on disk change, so rebuilding
+    them with ``embed_taxonomy`` takes effect without a restart. Misses are
+    not remembered.
+    """
+    key = (provider, model)
+    path = EMBEDDINGS_FILE
+    signature = _file_signature(path)
+    if signature is None:
+        _embedding_indexes.pop(key, None)
+        return None
+    cached = _embedding_indexes.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    index = TaxonomyEmbeddingIndex.load(provider, model, path)
+    if index is None:
+        _embedding_indexes.pop(key, None)
+    else:
+        _embedding_indexes[key] = (signature, index)
+    return index
+
+
+def reset_taxonomy_embedding_indexes() -> None:
+    """Forget loaded indexes, e.g. after the taxonomy they were built from was replaced"""
+    _embedding_indexes.clear()
@@ -0,0 +1,75 @@
+"""Tests for the ESCO taxonomy build: merging curated skills with ESCO data"""
+import csv
+import io
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.skills.download_esco import (
+    SKILLS_DIR,
+    _row_to_skill,
+    create_common_tech_skills_mapping,
+    merge_with_curated_skills,
+    parse_local_esco_skills,
+)
+
+
+def _collection_row(filename: str, label: str) -> dict:
+    with open(SKILLS_DIR / filename, encoding="utf-8", newline="") as f:
+        return next(row for row in csv.DictReader(f) if row["preferredLabel"] == label)
+
+
+def test_collection_alt_labels_are_split_into_aliases():
+    row = _collection_row("greenSkillsCollection_en.csv", "train staff to reduce food waste")
+    skill = _row_to_skill(row, apply_filter=False)
+    assert skill["aliases"] == [
+        "teach students food waste reduction practices",
+        "inform staff on food waste reduction practices",
+        "educate workers on food recycling methods",
+        "educate staff on food waste reduction",
+    ]
+    assert skill["esco_id"] == "001d46db-035e-4b92-83a3-ed8771e0c123"
+
+
+def test_newline_separated_alt_labels_still_parse():
+    header = "conceptUri,preferredLabel,altLabels,description\n"
+    data = header + 'http://data.europa.eu/esco/skill/x,Python (computer programming),"Python 3K\nPython",code\n'
+    row = next(csv.DictReader(io.StringIO(data)))
+    assert _row_to_skill(row, apply_filter=False)["aliases"] == ["Python 3K", "Python"]
+
+
+def _by_name(skills):
+    return {skill["skill_name"]: skill for skill in skills}
+
+
+def test_curated_tech_skill_is_tagged_digital():
+    esco = parse_local_esco_skills([("digitalSkillsCollection_en.csv", False)], max_workers=1)
+    merged = _by_name(merge_with_curated_skills(esco, create_common_tech_skills_mapping()))
+
+    javascript = merged["JavaScript"]
+    assert "digital" in javascript["collections"]
+    assert javascript["esco_uri"].startswith("http://data.europa.eu/esco/skill/")
+    assert javascript["esco_id"] == javascript["esco_uri"].rsplit("/", 1)[-1]
+    assert javascript["esco_id"] != "S2.A.3.1"
+    # Only reachable through a " | "-separated alternative label
+    assert "digital" in merged["Python"]["collections"]
+
+
+def test_merge_prefers_exact_name_and_unions_collections():
+    curated = [{"skill_name": "SQL", "esco_id": "placeholder", "esco_uri": "", "aliases": []}]
+    esco = [
+        {"skill_name": "query languages", "esco_id": "q", "esco_uri": "uri/q", "aliases": ["SQL"],
+         "collections": ["research"]},
+        {"skill_name": "SQL", "esco_id": "s", "esco_uri": "uri/s", "aliases": [], "collections": ["digital"]},
+        {"skill_name": "Haskell", "esco_id": "h", "esco_uri": "uri/h", "aliases": [], "collections": ["digital"]},
+    ]
+    merged = list(merge_with_curated_skills(iter(esco), curated))
+
+    assert [skill["skill_name"] for skill in merged] == ["Haskell", "SQL"]
+    sql = merged[-1]
+    assert (sql["esco_id"], sql["esco_uri"]) == ("s", "uri/s")
+    assert sql["collections"] == ["research", "digital"]
+    # The curated input is left untouched
+    assert "collections" not in curated[0] and curated[0]["esco_id"] == "placeholder"
@@ -0,0 +1,118 @@
+"""Tests for the compiled taxonomy store and the records read from it"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.skills.skill_collections import bitset_from_bytes, pack_bitset
+from app.skills.store import (
+    STORE_FORMAT_VERSION,
+    TaxonomyStore,
+    build_taxonomy_store,
+    file_digest,
+    load_records,
+)
+from app.skills.taxonomy import TaxonomyMapper
+
+MAPPINGS = [
+    {
+        "skill_name": "Python",
+        "esco_id": "esco/python",
+        "category": "technical",
+        "skill_type": "skill/competence",
+        "aliases": ["python3", "py"],
+        "description": "Programming language",
+        "proficiency_levels": ["basic", "advanced"],
+        "collections": ["digital"],
+    },
+    {"skill_name": "", "aliases": ["ignored"]},
+    {
+        "skill_name": "Teamwork",
+        "category": "soft",
+        "aliases": [],
+        "collections": ["transversal", "digital"],
+    },
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "taxonomy_map.db"
+    assert build_taxonomy_store(MAPPINGS, path, source_digest=lambda: "abc") == 2
+    store = TaxonomyStore(path)
+    yield store
+    store.close()
+
+
+def test_build_writes_meta_hot_rows_and_aliases(store):
+    assert store.get_meta("format_version") == STORE_FORMAT_VERSION
+    assert store.get_meta("source_digest") == "abc"
+    assert store.get_meta("missing") is None
+    # Mappings without a name are skipped but keep their position's ID free
+    assert list(store.iter_hot_rows()) == [
+        (1, ("Python", "esco/python", "technical", "skill/competence")),
+        (3, ("Teamwork", None, "soft", None)),
+    ]
+    assert list(store.iter_alias_rows()) == [(1, "python3"), (1, "py")]
+
+
+def test_build_compiles_collection_bitsets(store):
+    collections = {name: bitset_from_bytes(bits) for name, bits in store.load_collections().items()}
+    assert set(collections) == {"digital", "transversal"}
+    np.testing.assert_array_equal(collections["digital"], pack_bitset([1, 3], 4))
+    np.testing.assert_array_equal(collections["transversal"], pack_bitset([3], 4))
+
+
+def test_records_answer_hot_fields_without_touching_the_store(store):
+    records, aliases = load_records(store)
+    python = records[0]
+    assert aliases == {1: ["python3", "py"]}
+    assert python["skill_name"] == "Python" and python.get("esco_id") == "esco/python"
+    assert python.skill_id == 1
+    assert python._cold_fields is None
+
+    with pytest.raises(KeyError):
+        records[1]["esco_id"]
+    assert records[1].get("esco_id") is None
+
+
+def test_records_load_cold_fields_once_on_demand(store):
+    python = load_records(store)[0][0]
+    assert python["description"] == "Programming language"
+    cold = python._cold_fields
+    assert python["proficiency_levels"] == ["basic", "advanced"]
+    assert python._cold_fields is cold
+    assert python.to_dict() == {
+        "skill_name": "Python",
+        "esco_id": "esco/python",
+        "category": "technical",
+        "skill_type": "skill/competence",
+        "description": "Programming language",
+        "proficiency_levels": ["basic", "advanced"],
+        "aliases": ["python3", "py"],
+    }
+    # Collections only live in the bitsets
+    assert "collections" not in python
+
+
+def test_mapper_rebuilds_the_store_when_the_json_changes(tmp_path):
+    taxonomy_file = tmp_path / "taxonomy_map.json"
+    taxonomy_file.write_text(json.dumps({"mappings": MAPPINGS}), encoding="utf-8")
+
+    mapper = TaxonomyMapper(taxonomy_file)
+    assert mapper.store is not None
+    assert mapper.store.get_meta("source_digest") == file_digest(taxonomy_file)
+    assert mapper.get_mapping("PY")["description"] == "Programming language"
+    assert mapper.get_skill_id("esco/python") == mapper.get_skill_id("python3") == 1
+    mapper.store.close()
+
+    taxonomy_file.write_text(json.dumps([{"skill_name": "Rust", "aliases": ["rustlang"]}]), encoding="utf-8")
+    mapper = TaxonomyMapper(taxonomy_file)
+    assert mapper.get_mapping("python") is None
+    assert mapper.get_mapping("rustlang")["skill_name"] == "Rust"
+    mapper.store.close()
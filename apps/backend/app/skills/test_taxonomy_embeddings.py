@@ -0,0 +1,51 @@
+"""Tests for loading the taxonomy embedding matrix"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.skills import taxonomy_embeddings
+from app.skills.taxonomy_embeddings import (
+    get_taxonomy_embedding_index,
+    reset_taxonomy_embedding_indexes,
+    save_taxonomy_embeddings,
+)
+
+
+@pytest.fixture
+def embeddings_file(tmp_path, monkeypatch):
+    path = tmp_path / "taxonomy_embeddings.npy"
+    monkeypatch.setattr(taxonomy_embeddings, "EMBEDDINGS_FILE", path)
+    reset_taxonomy_embedding_indexes()
+    yield path
+    reset_taxonomy_embedding_indexes()
+
+
+def test_missing_file_is_not_remembered(embeddings_file):
+    assert get_taxonomy_embedding_index("ollama", "embed") is None
+
+    save_taxonomy_embeddings(["Python"], np.ones((1, 4)), "ollama", "embed", path=embeddings_file)
+    index = get_taxonomy_embedding_index("ollama", "embed")
+    assert index is not None and index.names == ["Python"]
+
+
+def test_index_is_reused_until_the_file_changes(embeddings_file):
+    save_taxonomy_embeddings(["Python"], np.ones((1, 4)), "ollama", "embed", path=embeddings_file)
+    first = get_taxonomy_embedding_index("ollama", "embed")
+    assert get_taxonomy_embedding_index("ollama", "embed") is first
+
+    save_taxonomy_embeddings(["Python", "Rust"], np.eye(2, 4), "ollama", "embed", path=embeddings_file)
+    second = get_taxonomy_embedding_index("ollama", "embed")
+    assert second is not first and second.names == ["Python", "Rust"]
+
+    reset_taxonomy_embedding_indexes()
+    assert get_taxonomy_embedding_index("ollama", "embed") is not second
+
+
+def test_other_models_do_not_use_the_matrix(embeddings_file):
+    save_taxonomy_embeddings(["Python"], np.ones((1, 4)), "ollama", "embed", path=embeddings_file)
+    assert get_taxonomy_embedding_index("ollama", "other") is None
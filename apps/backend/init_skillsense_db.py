@@ -10,8 +10,9 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.core.database import async_engine
+from app.core.database import async_engine, AsyncSessionLocal
 from app.models import Base
+from app.services.skill_search_service import SkillSearchService
 
 
 async def init_db():
@@ -22,10 +23,16 @@ async def init_db():
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
 
+    # Backfill the skill search index for profiles created before it existed
+    async with AsyncSessionLocal() as session:
+        indexed = await SkillSearchService(session).rebuild()
+
     print("✅ Database tables created successfully!")
     print("\nTables created:")
     print("  - skill_profiles")
     print("  - skill_audit_logs")
+    print("  - skill_postings")
+    print(f"\nIndexed skills for {indexed} existing profiles")
     print("\nYou can now start using SkillSense! 🧠")
 
 
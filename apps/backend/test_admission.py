@@ -0,0 +1,114 @@
+"""Tests for provider admission: priority ordering and bounded queues"""
+import asyncio
+import time
+
+import pytest
+
+from app.agent.admission import AdmissionController, Priority, current_admission, request_priority
+from app.agent.exceptions import ProviderOverloadedError
+
+
+async def _queue(controller: AdmissionController, priority: Priority, admitted: list, label: str) -> None:
+    await controller.acquire(priority, time.monotonic() + 5)
+    admitted.append(label)
+
+
+async def _settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    async def run():
+        controller = AdmissionController("test", limit=1, max_queue=10)
+        await controller.acquire(Priority.NORMAL)
+        admitted: list = []
+        tasks = []
+        for priority, label in [
+            (Priority.BULK, "bulk-1"),
+            (Priority.NORMAL, "normal"),
+            (Priority.BULK, "bulk-2"),
+            (Priority.INTERACTIVE, "interactive"),
+        ]:
+            tasks.append(asyncio.create_task(_queue(controller, priority, admitted, label)))
+            await _settle()
+        assert controller.stats().queued == 4
+
+        for _ in tasks:
+            controller.release()
+            await _settle()
+        await asyncio.gather(*tasks)
+        assert admitted == ["interactive", "normal", "bulk-1", "bulk-2"]
+        # The last holder still owns the single slot
+        assert controller.stats().in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_new_calls():
+    async def run():
+        controller = AdmissionController("test", limit=1, max_queue=1)
+        await controller.acquire(Priority.NORMAL)
+        admitted: list = []
+        waiter = asyncio.create_task(_queue(controller, Priority.NORMAL, admitted, "queued"))
+        await _settle()
+
+        with pytest.raises(ProviderOverloadedError):
+            await controller.acquire(Priority.NORMAL, time.monotonic() + 5)
+        stats = controller.stats()
+        assert stats.rejected == 1 and stats.queued == 1
+
+        controller.release()
+        await waiter
+        assert admitted == ["queued"]
+
+    asyncio.run(run())
+
+
+def test_full_queue_displaces_lower_priority_waiter():
+    async def run():
+        controller = AdmissionController("test", limit=1, max_queue=1)
+        await controller.acquire(Priority.NORMAL)
+        admitted: list = []
+        bulk = asyncio.create_task(_queue(controller, Priority.BULK, admitted, "bulk"))
+        await _settle()
+        interactive = asyncio.create_task(_queue(controller, Priority.INTERACTIVE, admitted, "interactive"))
+        await _settle()
+
+        with pytest.raises(ProviderOverloadedError):
+            await bulk
+        controller.release()
+        await interactive
+        assert admitted == ["interactive"]
+        assert controller.stats().rejected == 1
+
+    asyncio.run(run())
+
+
+def test_deadline_expires_while_queued():
+    async def run():
+        controller = AdmissionController("test", limit=1, max_queue=10)
+        await controller.acquire(Priority.NORMAL)
+        with pytest.raises(ProviderOverloadedError):
+            await controller.acquire(Priority.NORMAL, time.monotonic() + 0.05)
+        stats = controller.stats()
+        assert stats.expired == 1 and stats.queued == 0
+
+        # The expired waiter must not swallow the released slot
+        controller.release()
+        await asyncio.wait_for(controller.acquire(Priority.NORMAL), 1)
+
+    asyncio.run(run())
+
+
+def test_priority_applies_to_tasks_started_inside_the_block():
+    async def priority() -> Priority:
+        return current_admission()[0]
+
+    async def run():
+        with request_priority(Priority.BULK):
+            task = asyncio.create_task(priority())
+        assert current_admission()[0] == Priority.NORMAL
+        return await task
+
+    assert asyncio.run(run()) == Priority.BULK
@@ -0,0 +1,71 @@
+"""Tests for long-document chunking and chunk embedding pooling"""
+import numpy as np
+import pytest
+
+from app.agent.chunking import CHARS_PER_TOKEN, chunk_text, pool_embeddings, split_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+## Experience
+Built data pipelines in Python.
+
+Led a team of four engineers.
+
+## Education
+BSc Computer Science
+"""
+
+
+def test_text_within_budget_is_returned_whole():
+    assert chunk_text(RESUME, max_tokens=1000) == [RESUME]
+
+
+def test_split_sections_keeps_headings_and_preamble():
+    assert split_sections(RESUME) == [
+        "Jane Doe\njane@example.com",
+        "## Experience\nBuilt data pipelines in Python.\n\nLed a team of four engineers.",
+        "## Education\nBSc Computer Science",
+    ]
+    # '#' not at the start of a line is not a heading
+    assert split_sections("C# and F# developer") == ["C# and F# developer"]
+
+
+def test_chunks_follow_sections_then_paragraphs_then_words():
+    chunks = chunk_text(RESUME, max_tokens=12)
+    assert all(len(chunk) <= 12 * CHARS_PER_TOKEN for chunk in chunks)
+    assert chunks == [
+        "Jane Doe\njane@example.com",
+        "## Experience\nBuilt data pipelines in Python.",
+        "Led a team of four engineers.",
+        "## Education\nBSc Computer Science",
+    ]
+
+    words = " ".join(f"word{i}" for i in range(40))
+    chunks = chunk_text(words, max_tokens=5)
+    assert all(len(chunk) <= 5 * CHARS_PER_TOKEN for chunk in chunks)
+    assert " ".join(chunks) == words
+
+
+def test_editing_one_section_leaves_other_chunks_unchanged():
+    edited = RESUME.replace("BSc Computer Science", "MSc Computer Science")
+    before, after = chunk_text(RESUME, max_tokens=12), chunk_text(edited, max_tokens=12)
+    assert before[:-1] == after[:-1] and before[-1] != after[-1]
+
+
+def test_unbreakable_text_is_cut_at_the_budget():
+    assert chunk_text("x" * 50, max_tokens=5) == ["x" * 20, "x" * 20, "x" * 10]
+
+
+def test_pooling_normalises_chunks_and_applies_weights():
+    vectors = [[3.0, 0.0], [0.0, 1.0]]
+    np.testing.assert_allclose(pool_embeddings(vectors, [1, 1], "mean"), [2 ** -0.5, 2 ** -0.5], rtol=1e-6)
+    np.testing.assert_allclose(
+        pool_embeddings(vectors, [3, 1], "weighted"), np.array([3.0, 1.0]) / 10 ** 0.5, rtol=1e-6
+    )
+    assert pool_embeddings([[0.0, 0.0]], [1], "mean") == [0.0, 0.0]
+
+
+def test_unknown_pooling_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported pooling"):
+        pool_embeddings([[1.0]], [1], "max")
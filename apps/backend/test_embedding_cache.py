@@ -0,0 +1,99 @@
+"""Tests for the two-tier embedding cache"""
+import numpy as np
+
+from app.core import settings
+from app.agent.embedding_cache import EmbeddingCache
+
+
+def _vector(seed: int, dim: int = 64) -> list:
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32).tolist()
+
+
+def test_cache_hit_returns_original_vector_at_default_dtype(tmp_path):
+    original = _vector(0)
+    cache = EmbeddingCache(tmp_path / "cache.db", 1 << 20, settings.EMBEDDING_CACHE_DTYPE)
+    model_id = cache.model_id("ollama", "model", "v1")
+    cache.put(model_id, ["python developer"], [original])
+
+    assert cache.get_memory(model_id, ["python developer"])[0].tolist() == original
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path / "cache.db", 1 << 20, settings.EMBEDDING_CACHE_DTYPE)
+    model_id = reopened.model_id("ollama", "model", "v1")
+    assert reopened.get_memory(model_id, ["python developer"]) == [None]
+    assert reopened.get_disk(model_id, ["python developer"])[0].tolist() == original
+    reopened.close()
+
+
+def test_lossy_dtypes_are_close_but_not_exact():
+    original = np.asarray(_vector(1))
+    for dtype in ("float16", "int8"):
+        cache = EmbeddingCache(None, 1 << 20, dtype)
+        model_id = cache.model_id("ollama", "model", "v1")
+        cache.put(model_id, ["text"], [original.tolist()])
+        cached = cache.get_memory(model_id, ["text"])[0]
+        cosine = float(cached @ original / (np.linalg.norm(cached) * np.linalg.norm(original)))
+        assert cosine > 0.999
+        assert not np.array_equal(cached, original)
+
+
+def test_misses_then_hits_are_counted_per_tier(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.db", 1 << 20)
+    model_id = cache.model_id("ollama", "model", "v1")
+    assert cache.get_memory(model_id, ["a"]) == [None]
+    assert cache.get_disk(model_id, ["a"]) == [None]
+
+    cache.put(model_id, ["a"], [_vector(0)])
+    # Keys ignore surrounding and repeated whitespace
+    assert cache.get_memory(model_id, ["  a "])[0] is not None
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path / "cache.db", 1 << 20)
+    model_id = reopened.model_id("ollama", "model", "v1")
+    assert reopened.get_disk(model_id, ["a", "b"])[1] is None
+    assert reopened.get_memory(model_id, ["a"])[0] is not None
+    stats = reopened.stats()
+    assert (stats.memory_hits, stats.disk_hits, stats.misses) == (1, 1, 1)
+    assert stats.hit_ratio == round(2 / 3, 4)
+    reopened.close()
+
+
+def test_models_are_separate_namespaces():
+    cache = EmbeddingCache(None, 1 << 20)
+    first = cache.model_id("ollama", "model-a", "v1")
+    second = cache.model_id("ollama", "model-b", "v1")
+    cache.put(first, ["text"], [_vector(0)])
+    assert first != second
+    assert cache.get_memory(second, ["text"]) == [None]
+    assert cache.known_model_id("ollama", "model-a", "v1") == first
+    assert cache.known_model_id("ollama", "model-a", "v2") is None
+
+
+def test_version_change_drops_cached_vectors(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.db", 1 << 20)
+    model_id = cache.model_id("ollama", "model", "v1")
+    cache.put(model_id, ["text"], [_vector(0)])
+
+    model_id = cache.model_id("ollama", "model", "v2")
+    assert cache.get_memory(model_id, ["text"]) == [None]
+    assert cache.get_disk(model_id, ["text"]) == [None]
+    cache.put(model_id, ["text"], [_vector(1)])
+    cache.close()
+
+    # A restart on the old version drops the new vectors too
+    reopened = EmbeddingCache(tmp_path / "cache.db", 1 << 20)
+    model_id = reopened.model_id("ollama", "model", "v1")
+    assert reopened.get_disk(model_id, ["text"]) == [None]
+    reopened.close()
+
+
+def test_memory_tier_evicts_least_recently_used():
+    vector_bytes = len(_vector(0)) * 4
+    cache = EmbeddingCache(None, 2 * (vector_bytes + 96))
+    model_id = cache.model_id("ollama", "model", "v1")
+    cache.put(model_id, ["a", "b"], [_vector(0), _vector(1)])
+    cache.get_memory(model_id, ["a"])
+    cache.put(model_id, ["c"], [_vector(2)])
+
+    assert [vector is not None for vector in cache.get_memory(model_id, ["a", "b", "c"])] == [True, False, True]
+    assert cache.stats().memory_entries == 2
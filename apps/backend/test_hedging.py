@@ -0,0 +1,130 @@
+"""Tests for hedged LLM calls and the per-provider circuit breaker"""
+import asyncio
+import time
+
+import pytest
+
+from app.core import settings
+from app.agent.exceptions import ProviderError
+from app.agent.hedging import CLOSED, HALF_OPEN, OPEN, ProviderTarget, hedged_call
+
+
+@pytest.fixture(autouse=True)
+def short_slo(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_LATENCY_SLO_SECONDS", {"default": 0.05})
+
+
+def _target(name: str, failures: int = 3, cooldown: float = 60.0) -> ProviderTarget:
+    return ProviderTarget(name, failures, cooldown)
+
+
+class FakeCall:
+    """Provider call that answers after ``delay`` seconds, or raises ``error``"""
+
+    def __init__(self, result: str, delay: float = 0.0, error: Exception = None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_no_hedge_when_primary_answers_in_time(monkeypatch):
+    primary, backup = FakeCall("primary", delay=0.01), FakeCall("backup")
+    targets = [_target("a"), _target("b")]
+    monkeypatch.setattr(settings, "LLM_LATENCY_SLO_SECONDS", {"default": 0.5})
+
+    result = asyncio.run(hedged_call(list(zip(targets, [primary, backup])), "test"))
+    assert result == "primary"
+    assert backup.calls == 0
+    assert targets[0].stats().wins == 1
+
+
+def test_hedge_fires_after_delay_and_cancels_loser():
+    primary, backup = FakeCall("primary", delay=5.0), FakeCall("backup", delay=0.01)
+    targets = [_target("a"), _target("b")]
+
+    started = time.monotonic()
+    result = asyncio.run(hedged_call(list(zip(targets, [primary, backup])), "test"))
+    elapsed = time.monotonic() - started
+
+    assert result == "backup"
+    assert 0.05 <= elapsed < 1.0
+    assert primary.calls == backup.calls == 1
+    assert primary.cancelled == 1
+    # The primary was still running past its hedge delay when it lost
+    assert targets[0].stats().slow == 1
+    assert targets[1].stats().hedged == 1 and targets[1].stats().wins == 1
+
+
+def test_failure_starts_next_provider_immediately(monkeypatch):
+    primary = FakeCall("primary", error=ProviderError("boom"))
+    backup = FakeCall("backup")
+    targets = [_target("a"), _target("b")]
+    monkeypatch.setattr(settings, "LLM_LATENCY_SLO_SECONDS", {"default": 5.0})
+
+    started = time.monotonic()
+    result = asyncio.run(hedged_call(list(zip(targets, [primary, backup])), "test"))
+    assert result == "backup"
+    assert time.monotonic() - started < 1.0
+    assert targets[0].stats().failures == 1
+
+
+def test_all_failures_raise_most_preferred_error():
+    first = FakeCall("a", error=ProviderError("first"))
+    second = FakeCall("b", error=ProviderError("second"))
+    with pytest.raises(ProviderError, match="first"):
+        asyncio.run(hedged_call([(_target("a"), first), (_target("b"), second)], "test"))
+
+
+def test_breaker_opens_then_half_opens_for_one_trial():
+    flaky = _target("a", failures=2, cooldown=0.1)
+    backup = _target("b")
+    failing = FakeCall("a", error=ProviderError("down"))
+
+    for _ in range(2):
+        asyncio.run(hedged_call([(flaky, failing), (backup, FakeCall("backup"))], "test"))
+    assert flaky.state == OPEN
+    assert flaky.stats().opened == 1
+
+    # While open the target is skipped
+    skipped = FakeCall("a")
+    assert asyncio.run(hedged_call([(flaky, skipped), (backup, FakeCall("backup"))], "test")) == "backup"
+    assert skipped.calls == 0
+
+    time.sleep(0.1)
+    assert flaky.state == HALF_OPEN
+    assert flaky.allow() is True
+    # Only one trial call at a time
+    assert flaky.allow() is False
+    flaky.release()
+
+    # A failed trial re-opens the breaker straight away
+    asyncio.run(hedged_call([(flaky, failing), (backup, FakeCall("backup"))], "test"))
+    assert flaky.state == OPEN and flaky.stats().opened == 2
+
+    time.sleep(0.1)
+    recovered = FakeCall("a")
+    assert asyncio.run(hedged_call([(flaky, recovered), (backup, FakeCall("backup"))], "test")) == "a"
+    assert flaky.state == CLOSED
+
+
+def test_open_breakers_are_still_tried_in_order():
+    target = _target("a", failures=1)
+    target.record_strike(slow=False)
+    assert target.state == OPEN
+
+    call = FakeCall("a")
+    assert asyncio.run(hedged_call([(target, call)], "test")) == "a"
+    assert call.calls == 1
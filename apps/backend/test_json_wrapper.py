@@ -0,0 +1,114 @@
+"""Tests for the JSON strategy: parsing, repair, validation and outcome stats"""
+import asyncio
+import json
+from typing import List
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+
+from app.core import settings
+from app.agent import response_cache
+from app.agent.exceptions import StrategyError
+from app.agent.manager import AgentManager
+from app.agent.providers.base import Provider
+from app.agent.registry import get_provider_registry, provider_key
+from app.agent.response_cache import ResponseCache
+from app.agent.strategies.wrapper import JSONWrapper
+from app.agent.structured_output import structured_output_stats
+
+
+class JobSummary(BaseModel):
+    job_title: str = Field(..., alias="jobTitle")
+    skills: List[str]
+
+
+class FixedProvider(Provider):
+    def __init__(self, response: str, supports_json_schema: bool = False) -> None:
+        self.response = response
+        self.supports_json_schema = supports_json_schema
+        self.calls = []
+
+    async def __call__(self, prompt: str, **generation_args) -> str:
+        self.calls.append(generation_args)
+        return self.response
+
+
+VALID = json.dumps({"jobTitle": "Engineer", "skills": ["Python"]})
+
+
+def _run(response: str, prompt_type: str, **kwargs):
+    return asyncio.run(JSONWrapper()("prompt", FixedProvider(response), prompt_type=prompt_type, **kwargs))
+
+
+def _stats(prompt_type: str):
+    return next(stats for stats in structured_output_stats() if stats.prompt_type == prompt_type)
+
+
+def test_bare_json_is_parsed():
+    result = _run(VALID, "test-parsed", response_model=JobSummary)
+    assert result == JobSummary(jobTitle="Engineer", skills=["Python"])
+    assert _run(f"  {VALID}\n", "test-parsed") == json.loads(VALID)
+    stats = _stats("test-parsed")
+    assert (stats.calls, stats.parsed, stats.repaired) == (2, 2, 0)
+
+
+@pytest.mark.parametrize(
+    "wrapping, response",
+    [
+        ("fence", f"Here you go:\n```json\n{VALID}\n```"),
+        ("second-fence", f"```\nnot json\n```\n```\n{VALID}\n```"),
+        ("prose", f"Sure! {VALID} Hope that helps."),
+    ],
+)
+def test_wrapped_json_is_repaired(wrapping, response):
+    prompt_type = f"test-repaired-{wrapping}"
+    assert _run(response, prompt_type, response_model=JobSummary).job_title == "Engineer"
+    assert _stats(prompt_type).repaired == 1
+
+
+def test_unrecoverable_responses_fail_parsing():
+    with pytest.raises(StrategyError, match="no JSON object"):
+        _run("I cannot help with that.", "test-parse-failed")
+    with pytest.raises(StrategyError, match="candidate JSON blocks"):
+        _run("{ not: json }", "test-parse-failed", response_model=JobSummary)
+    assert _stats("test-parse-failed").parse_failed == 2
+
+
+def test_json_that_does_not_match_the_model_is_invalid():
+    with pytest.raises(ValidationError):
+        _run(json.dumps({"jobTitle": "Engineer"}), "test-invalid", response_model=JobSummary)
+    with pytest.raises(ValidationError):
+        _run(f"```json\n{json.dumps({'skills': []})}\n```", "test-invalid", response_model=JobSummary)
+    stats = _stats("test-invalid")
+    assert (stats.invalid, stats.failure_rate) == (2, 1.0)
+
+
+def test_schema_is_sent_only_to_providers_that_support_it(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CONSTRAINED_JSON", True)
+    plain, constrained = FixedProvider(VALID), FixedProvider(VALID, supports_json_schema=True)
+    for provider in (plain, constrained):
+        asyncio.run(JSONWrapper()("prompt", provider, response_model=JobSummary, prompt_type="test-schema"))
+    assert "json_schema" not in plain.calls[0]
+    assert constrained.calls[0]["json_schema"]["properties"]["jobTitle"]["type"] == "string"
+    assert _stats("test-schema").constrained == 1
+
+
+def test_cached_models_with_aliases_round_trip(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "_response_cache", ResponseCache(None, 1 << 20, 100, 0))
+
+    async def run():
+        provider = FixedProvider(VALID)
+        key = provider_key("llm", "ollama", "json-model", settings.LLM_BASE_URL, opts={})
+        await get_provider_registry().get(key, lambda: provider)
+        manager = AgentManager("json", model="json-model", model_provider="ollama", fallbacks=[])
+
+        first = await manager.run("prompt", response_model=JobSummary)
+        second = await manager.run("prompt", response_model=JobSummary)
+        assert len(provider.calls) == 1
+        assert isinstance(second, JobSummary) and second == first
+        # Untyped calls are cached separately from typed ones
+        assert await manager.run("prompt") == json.loads(VALID)
+        assert len(provider.calls) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,127 @@
+"""Tests for agent call metrics: aggregation, call tracking and the SQLite sink"""
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core import settings
+from app.agent import metrics
+from app.agent.chunking import estimate_tokens
+from app.agent.manager import EmbeddingManager
+from app.agent.metrics import (
+    CallRecord,
+    MetricsRegistry,
+    report_retry,
+    report_served_by,
+    report_usage,
+    track_call,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "_metrics_registry", registry)
+    return registry
+
+
+def _record(latency_ms: float, outcome: str = "ok", prompt: str = "resume", **fields) -> CallRecord:
+    values = dict(
+        timestamp=0.0, kind="llm", provider="ollama", model="model", prompt=prompt,
+        input_tokens=10, output_tokens=5, latency_ms=latency_ms, retries=0, outcome=outcome,
+    )
+    values.update(fields)
+    return CallRecord(**values)
+
+
+def _stats(registry: MetricsRegistry, **key):
+    return [s for s in registry.stats() if all(getattr(s, name) == value for name, value in key.items())]
+
+
+def test_records_are_aggregated_per_kind_provider_model_and_prompt():
+    registry = MetricsRegistry()
+    for latency in range(1, 101):
+        registry.record(_record(float(latency)))
+    registry.record(_record(500.0, outcome="error:ProviderError", input_tokens=None, retries=2))
+    registry.record(_record(1.0, outcome="cached", input_tokens=None, output_tokens=None))
+    registry.record(_record(1.0, outcome="coalesced", input_tokens=None, output_tokens=None))
+    registry.record(_record(1.0, prompt="job"))
+
+    (resume,) = _stats(registry, prompt="resume")
+    assert (resume.calls, resume.errors, resume.cached, resume.coalesced) == (103, 1, 1, 1)
+    assert (resume.input_tokens, resume.output_tokens, resume.retries) == (1000, 505, 2)
+    assert resume.latency_ms_max == 500.0
+    # Nearest rank over 1, 1, 1, 2, ..., 100, 500
+    assert resume.latency_ms_p50 == 50.0
+    assert resume.latency_ms_p95 == 96.0
+    assert _stats(registry, prompt="job")[0].calls == 1
+
+
+def test_track_call_records_usage_outcome_and_serving_provider(registry):
+    async def run():
+        async with track_call("llm", "ollama", "primary", "resume"):
+            report_usage(100, 20)
+            report_usage(5)
+            report_retry()
+            report_served_by("openai", "backup")
+        with pytest.raises(ValueError):
+            async with track_call("llm", "ollama", "primary", None):
+                raise ValueError("boom")
+
+    asyncio.run(run())
+    (served,) = _stats(registry, prompt="resume")
+    assert (served.provider, served.model) == ("openai", "backup")
+    assert (served.input_tokens, served.output_tokens, served.retries) == (105, 20, 1)
+    (failed,) = _stats(registry, prompt="-")
+    assert (failed.model, failed.errors) == ("primary", 1)
+
+    # Outside a tracked call, reports are ignored
+    report_usage(1, 1)
+    report_retry()
+
+
+def test_sink_writes_full_batches_and_the_rest_on_flush(tmp_path):
+    path = tmp_path / "metrics.db"
+    registry = MetricsRegistry(path)
+
+    def rows() -> int:
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM agent_calls").fetchone()[0]
+
+    for _ in range(metrics._SINK_BATCH):
+        registry.record(_record(1.0))
+    assert rows() == metrics._SINK_BATCH
+
+    registry.record(_record(1.0))
+    assert rows() == metrics._SINK_BATCH
+    registry.flush()
+    assert rows() == metrics._SINK_BATCH + 1
+
+    async def record_in_loop():
+        for _ in range(metrics._SINK_BATCH):
+            registry.record(_record(2.0))
+        await asyncio.gather(*registry._flushes)
+
+    asyncio.run(record_in_loop())
+    registry.record(_record(3.0))
+    registry.close()
+    assert rows() == 2 * metrics._SINK_BATCH + 2
+
+
+def test_embeddings_are_recorded_under_the_resolved_model_once_per_flight(registry, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 0)
+
+    async def run():
+        manager = EmbeddingManager(model="configured-model", model_provider="hashing")
+        await asyncio.gather(
+            manager.embed_many(["python developer"], prompt_type="coalesce-test"),
+            manager.embed_many(["python developer"], prompt_type="coalesce-test"),
+        )
+
+    asyncio.run(run())
+    (stats,) = _stats(registry, prompt="coalesce-test")
+    assert stats.model == f"hashing-{settings.HASHING_EMBEDDING_DIM}"
+    assert stats.calls == 2
+    assert stats.coalesced == 1
+    assert stats.input_tokens == estimate_tokens("python developer")
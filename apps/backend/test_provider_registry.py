@@ -0,0 +1,108 @@
+"""Tests for the process-wide provider registry"""
+import asyncio
+
+import pytest
+
+from app.core import settings
+from app.agent.manager import AgentManager, EmbeddingManager
+from app.agent.providers.base import Provider
+from app.agent.registry import ProviderRegistry, get_provider_registry, provider_key
+from app.skills import set_taxonomy_mapper
+
+
+class FakeProvider(Provider):
+    def __init__(self) -> None:
+        self.calls = []
+        self.closed = 0
+
+    async def __call__(self, prompt: str, **generation_args) -> str:
+        self.calls.append(generation_args)
+        return "ok"
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+def test_sampling_args_do_not_create_new_providers(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+    async def run():
+        registry = get_provider_registry()
+        fake = FakeProvider()
+        key = provider_key("llm", "ollama", "fake-model", settings.LLM_BASE_URL, opts={})
+        await registry.get(key, lambda: fake)
+        size = len(registry)
+
+        manager = AgentManager("md", model="fake-model", model_provider="ollama", fallbacks=[])
+        for temperature in (0.4, 0.7, 1.0):
+            await manager.run("prompt", use_cache=False, temperature=temperature)
+
+        assert len(registry) == size
+        assert [call["temperature"] for call in fake.calls] == [0.4, 0.7, 1.0]
+
+    asyncio.run(run())
+
+
+class FakeTaxonomyMapper:
+    def __init__(self, names):
+        self.names = names
+
+    def iter_mappings_with_aliases(self):
+        return (({"skill_name": name}, []) for name in self.names)
+
+
+@pytest.fixture
+def taxonomy():
+    previous = set_taxonomy_mapper(FakeTaxonomyMapper(["Python", "Python scripting", "Rust"]))
+    yield
+    set_taxonomy_mapper(previous)
+
+
+def test_hashing_provider_follows_the_taxonomy_after_discard(taxonomy):
+    async def run():
+        registry = get_provider_registry()
+        await registry.discard("embedding", "hashing")
+        manager = EmbeddingManager(model="hashing", model_provider="hashing")
+        first = await manager._get_embedding_provider()
+        assert await manager._get_embedding_provider() is first
+
+        set_taxonomy_mapper(FakeTaxonomyMapper(["Go", "Kotlin"]))
+        assert await registry.discard("embedding", "hashing") == 1
+        second = await manager._get_embedding_provider()
+        assert second is not first
+        assert second.model_version != first.model_version
+
+    asyncio.run(run())
+
+
+
+def test_registry_reuses_instances_per_key_and_closes_them():
+    async def run():
+        registry = ProviderRegistry()
+        built = []
+
+        def factory():
+            built.append(FakeProvider())
+            return built[-1]
+
+        key = provider_key("llm", "fake", "model", "http://localhost", api_key="secret")
+        first, second = await asyncio.gather(registry.get(key, factory), registry.get(key, factory))
+        assert first is second and len(built) == 1
+        assert "secret" not in repr(key)
+
+        other = await registry.get(provider_key("llm", "fake", "model", "http://localhost", api_key="other"), factory)
+        assert other is not first and len(registry) == 2
+
+        await registry.close()
+        assert len(registry) == 0
+        assert [provider.closed for provider in built] == [1, 1]
+        assert await registry.get(key, factory) is not first
+
+    asyncio.run(run())
+
+
+def test_provider_key_separates_options():
+    assert provider_key("llm", "ollama", "m", opts={"a": 1, "b": 2}) == provider_key(
+        "llm", "ollama", "m", opts={"b": 2, "a": 1}
+    )
+    assert provider_key("llm", "ollama", "m", opts={"a": 1}) != provider_key("llm", "ollama", "m")
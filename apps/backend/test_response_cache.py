@@ -0,0 +1,100 @@
+"""Tests for the LLM response cache"""
+import asyncio
+
+from app.core import settings
+from app.agent import response_cache
+from app.agent.manager import AgentManager
+from app.agent.providers.base import Provider
+from app.agent.registry import get_provider_registry, provider_key
+from app.agent.response_cache import ResponseCache, response_key
+
+
+def _key(prompt: str = "prompt", **options) -> bytes:
+    return response_key("ollama", "model", "JSONWrapper", prompt, options)
+
+
+def test_keys_cover_output_options_but_not_credentials():
+    assert _key(temperature=0.2) == _key(temperature=0.2, llm_api_key="secret")
+    assert _key(temperature=0.2) != _key(temperature=0.7)
+    assert _key("prompt") != _key("other prompt")
+
+
+def test_hits_return_fresh_copies_from_either_tier(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.db", 1 << 20, 100, 0)
+    key = _key()
+    assert cache.get_memory(key) is None and cache.get_disk(key) is None
+
+    cache.put(key, {"skills": ["Python"]})
+    hit = cache.get_memory(key)
+    hit["skills"].append("Rust")
+    assert cache.get_memory(key) == {"skills": ["Python"]}
+    cache.close()
+
+    reopened = ResponseCache(tmp_path / "cache.db", 1 << 20, 100, 0)
+    assert reopened.get_memory(key) is None
+    assert reopened.get_disk(key) == {"skills": ["Python"]}
+    assert reopened.get_memory(key) == {"skills": ["Python"]}
+    stats = reopened.stats()
+    assert (stats.memory_hits, stats.disk_hits, stats.misses) == (1, 1, 0)
+    reopened.close()
+
+
+def test_expired_entries_are_misses_and_deleted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(tmp_path / "cache.db", 1 << 20, 100, ttl_seconds=60)
+    key = _key()
+    cache.put(key, "answer")
+
+    now[0] += 30
+    assert cache.get_memory(key) == "answer"
+    now[0] += 60
+    assert cache.get_memory(key) is None
+    assert cache.get_disk(key) is None
+    assert cache.stats().expired == 1
+    assert cache.stats().memory_entries == 0
+    cache.close()
+
+
+def test_disk_keeps_only_the_most_recently_used_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(tmp_path / "cache.db", 0, max_entries=2, ttl_seconds=0)
+    for prompt in ("a", "b"):
+        now[0] += 1
+        cache.put(_key(prompt), prompt)
+    now[0] += 1
+    assert cache.get_disk(_key("a")) == "a"
+    now[0] += 1
+    cache.put(_key("c"), "c")
+
+    assert [cache.get_disk(_key(prompt)) for prompt in "abc"] == ["a", None, "c"]
+    cache.close()
+
+
+class CountingProvider(Provider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, prompt: str, **generation_args) -> str:
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def test_manager_serves_repeated_prompts_from_the_cache(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "_response_cache", ResponseCache(None, 1 << 20, 100, 0))
+
+    async def run():
+        provider = CountingProvider()
+        key = provider_key("llm", "ollama", "cached-model", settings.LLM_BASE_URL, opts={})
+        await get_provider_registry().get(key, lambda: provider)
+        manager = AgentManager("md", model="cached-model", model_provider="ollama", fallbacks=[])
+
+        first = await manager.run("prompt", temperature=0.2)
+        assert await manager.run("prompt", temperature=0.2) == first
+        assert await manager.run("prompt", temperature=0.9) != first
+        assert await manager.run("prompt", use_cache=False, temperature=0.2) != first
+        assert provider.calls == 3
+
+    asyncio.run(run())
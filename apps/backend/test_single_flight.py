@@ -0,0 +1,114 @@
+"""Tests for coalescing concurrent identical calls"""
+import asyncio
+
+import pytest
+
+from app.agent.single_flight import SingleFlight
+
+
+class SlowCall:
+    def __init__(self, result=None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        flights = SingleFlight()
+        call = SlowCall("result")
+        other_call = SlowCall("other")
+        waiters = [asyncio.create_task(flights.do("key", call)) for _ in range(3)]
+        other = asyncio.create_task(flights.do("other", other_call))
+        await asyncio.sleep(0)
+        assert len(flights) == 2
+
+        call.release.set()
+        other_call.release.set()
+        assert await asyncio.gather(*waiters) == ["result"] * 3
+        assert await other == "other"
+        assert call.calls == other_call.calls == 1
+
+        # Finished keys are forgotten, so a later call runs again
+        assert await flights.do("key", call) == "result"
+        assert call.calls == 2
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_waiter():
+    async def run():
+        flights = SingleFlight()
+        call = SlowCall(error=ValueError("boom"))
+        waiters = [asyncio.create_task(flights.do("key", call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        call.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert [str(result) for result in results] == ["boom", "boom"]
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flights) == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    async def run():
+        flights = SingleFlight()
+        call = SlowCall("result")
+        first = asyncio.create_task(flights.do("key", call))
+        second = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        call.release.set()
+        assert await second == "result"
+        assert call.calls == 1
+
+    asyncio.run(run())
+
+
+def test_do_many_joins_keys_in_flight_and_computes_the_rest():
+    async def run():
+        flights = SingleFlight()
+        batches = []
+        release = asyncio.Event()
+
+        async def compute(keys):
+            batches.append(keys)
+            await release.wait()
+            return [key.upper() for key in keys]
+
+        first = asyncio.create_task(flights.do_many(["a", "b"], compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do_many(["b", "c", "a"], compute))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == ["A", "B"]
+        assert await second == ["B", "C", "A"]
+        assert batches == [["a", "b"], ["c"]]
+
+    asyncio.run(run())
+
+
+def test_wrong_result_count_fails_every_key():
+    async def run():
+        flights = SingleFlight()
+
+        async def compute(keys):
+            return keys[:1]
+
+        with pytest.raises(RuntimeError, match="Expected 2 results, got 1"):
+            await flights.do_many(["a", "b"], compute)
+
+    asyncio.run(run())